@@ -0,0 +1,295 @@
+# app/bulk_seed.py
+"""
+부하 테스트용 대용량 시드 데이터 생성기.
+
+--scale 1 기준 매장 1만 / 재고 100만 / 주문 500만 (+ 주문 상품, 결제, 리뷰).
+같은 --seed 면 UUID 까지 항상 같은 데이터가 만들어집니다.
+Postgres + psycopg(3) 드라이버면 COPY, 그 외에는 insert() executemany 배치로 적재합니다.
+
+    python -m app.bulk_seed --scale 0.1 --seed 42 --reset
+"""
+import time
+import uuid
+import random
+import argparse
+from itertools import islice
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app import models, rating_service, sales_service
+from app.database import SessionLocal, engine
+from app.init_db import get_flower_dataset
+
+# --scale 1 기준 행 수
+BASE_STORES = 10_000
+BASE_USERS = 100_000
+STOCKS_PER_STORE = 100       # 매장 1만 x 100 = 재고 100만
+ORDERS_PER_STORE = 500       # 매장 1만 x 500 = 주문 500만
+PRODUCTS_PER_STORE = 3       # CUSTOM 1 + READY_MADE 2
+REVIEW_RATIO = 0.3           # 픽업 완료 주문 중 리뷰 작성 비율
+
+# 주문일은 실행 시각이 아닌 고정 기준일로부터 과거 1년 -> 같은 seed 면 같은 데이터
+BASE_DATE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+ORDER_DAYS = 365
+
+ORDER_STATUS_WEIGHTS = [
+    (models.OrderStatus.PICKED_UP, 70),
+    (models.OrderStatus.PAID, 15),
+    (models.OrderStatus.PREPARING, 5),
+    (models.OrderStatus.CANCELED, 10),
+]
+RATING_WEIGHTS = [(5, 50), (4, 30), (3, 12), (2, 5), (1, 3)]
+
+# 매장 좌표 범위 (서울 일대)
+LAT_RANGE = (37.43, 37.70)
+LNG_RANGE = (126.80, 127.18)
+
+DISTRICTS = ["강남구", "마포구", "서초구", "송파구", "성동구", "용산구", "종로구", "영등포구", "관악구", "노원구"]
+STORE_WORDS = ["플로썸", "꽃길", "어반플라워", "데일리그린", "로즈마리", "보타닉", "블룸", "그린아틀리에", "힐링플라워", "꽃이야기"]
+
+
+class Loader:
+    """테이블별로 행을 적재하고 적재 건수/소요 시간을 모읍니다."""
+
+    def __init__(self, conn, method: str, batch_size: int):
+        self.conn = conn
+        self.method = method
+        self.batch_size = batch_size
+        self.counts = {}
+        self.seconds = {}
+
+    def write(self, model, columns, rows):
+        table = model.__table__
+        started = time.perf_counter()
+        total = 0
+        for chunk in batched(rows, self.batch_size):
+            if self.method == "copy":
+                self._copy(table, columns, chunk)
+            else:
+                self.conn.execute(table.insert(), [dict(zip(columns, row)) for row in chunk])
+            total += len(chunk)
+        self.counts[table.name] = self.counts.get(table.name, 0) + total
+        self.seconds[table.name] = self.seconds.get(table.name, 0.0) + time.perf_counter() - started
+        return total
+
+    def _copy(self, table, columns, rows):
+        # SQLAlchemy 연결과 같은 트랜잭션의 psycopg 커서로 COPY
+        raw = self.conn.connection.driver_connection
+        with raw.cursor() as cur:
+            with cur.copy(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(row)
+
+    def report(self, elapsed: float):
+        for name, count in self.counts.items():
+            seconds = self.seconds[name]
+            print(f"   {name:<24} {count:>12,} rows  {seconds:8.1f}s  {count / seconds if seconds else 0:>12,.0f} rows/s")
+        total = sum(self.counts.values())
+        print(f"   {'total':<24} {total:>12,} rows  {elapsed:8.1f}s  {total / elapsed if elapsed else 0:>12,.0f} rows/s")
+
+
+def batched(rows, size: int):
+    it = iter(rows)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def make_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def weighted(rng: random.Random, choices):
+    return rng.choices([c for c, _ in choices], weights=[w for _, w in choices])[0]
+
+
+def scaled(base: int, scale: float) -> int:
+    return max(1, int(base * scale))
+
+
+# --- 테이블별 행 생성 (값은 COPY/insert 양쪽에서 그대로 쓸 수 있는 기본 타입) ---
+
+MEMBER_COLUMNS = ["member_id", "password", "name", "contact", "type", "location_agree", "money"]
+FLOWER_COLUMNS = ["flower_id", "name", "meaning", "color", "care_guide"]
+STORE_COLUMNS = ["store_id", "owner_id", "name", "address", "business_hours", "has_pickup_box", "latitude", "longitude"]
+PRODUCT_COLUMNS = ["product_id", "store_id", "name", "price", "type"]
+STOCK_COLUMNS = ["stock_id", "store_id", "flower_id", "product_id", "quantity", "stocking_date", "status"]
+ORDER_COLUMNS = ["order_id", "member_id", "store_id", "order_date", "pickup_date", "status", "delivery_request"]
+ORDER_ITEM_COLUMNS = ["item_id", "order_id", "product_id", "quantity", "snapshot_price"]
+PAYMENT_COLUMNS = ["payment_id", "order_id", "amount", "method", "paid_at"]
+REVIEW_COLUMNS = ["review_id", "order_id", "writer_id", "rating", "content", "created_at"]
+
+
+def user_id(n: int) -> str:
+    return f"user{n}@seed.flome.com"
+
+
+def member_rows(users: int, stores: int):
+    for n in range(users):
+        yield (user_id(n), "pw", f"손님{n}", "010-0000-0000", models.MemberType.USER.value, True, 1_000_000)
+    for n in range(stores):
+        yield (f"owner{n}@seed.flome.com", "pw", f"사장님{n}", "010-1111-1111", models.MemberType.OWNER.value, True, 0)
+
+
+def store_location(store_id):
+    # 매장 UUID 로 시드한 별도 난수 -> 기존 데이터(같은 --seed)의 나머지 값은 그대로
+    geo = random.Random(store_id.int)
+    return (round(geo.uniform(*LAT_RANGE), 6), round(geo.uniform(*LNG_RANGE), 6))
+
+
+def seed_catalog(loader: Loader, rng: random.Random, stores: int, users: int):
+    """회원/꽃/매장/상품/재고를 적재하고 주문 생성에 필요한 매장별 상품 목록을 돌려줍니다."""
+    loader.write(models.Member, MEMBER_COLUMNS, member_rows(users, stores))
+
+    flower_ids = []
+    flower_rows = []
+    for d in get_flower_dataset():
+        flower_id = make_uuid(rng)
+        flower_ids.append(flower_id)
+        flower_rows.append((flower_id, d["name"], d["meaning"], d["color"], d["care_guide"]))
+    loader.write(models.Flower, FLOWER_COLUMNS, flower_rows)
+
+    store_ids = [make_uuid(rng) for _ in range(stores)]
+    loader.write(models.Store, STORE_COLUMNS, (
+        (store_id, f"owner{n}@seed.flome.com", f"{rng.choice(DISTRICTS)[:-1]} {rng.choice(STORE_WORDS)} {n}",
+         f"서울 {rng.choice(DISTRICTS)} 꽃길로 {rng.randint(1, 999)}", "09:00-20:00", rng.random() < 0.5)
+        + store_location(store_id)
+        for n, store_id in enumerate(store_ids)
+    ))
+
+    # store_id -> [(product_id, price)]
+    store_products = {}
+    product_rows = []
+    for store_id in store_ids:
+        products = []
+        for i in range(PRODUCTS_PER_STORE):
+            product_id = make_uuid(rng)
+            price = rng.randrange(20_000, 100_001, 1_000)
+            type_ = models.ProductType.CUSTOM if i == 0 else models.ProductType.READY_MADE
+            product_rows.append((product_id, store_id, f"꽃다발 {i + 1}", price, type_.value))
+            products.append((product_id, price))
+        store_products[store_id] = products
+    loader.write(models.Product, PRODUCT_COLUMNS, product_rows)
+
+    def stock_rows():
+        for store_id, products in store_products.items():
+            stocked = BASE_DATE - timedelta(days=rng.randrange(30))
+            for product_id, _ in products:
+                yield (make_uuid(rng), store_id, None, product_id, rng.randint(0, 50), stocked, models.StockStatus.AVAILABLE.value)
+            # 나머지는 꽃 재고 (같은 꽃이 입고일만 다른 여러 행일 수 있음)
+            for _ in range(STOCKS_PER_STORE - len(products)):
+                quantity = rng.randint(0, 30)
+                status = models.StockStatus.AVAILABLE if quantity else models.StockStatus.SOLD_OUT
+                yield (make_uuid(rng), store_id, rng.choice(flower_ids), None, quantity,
+                       stocked - timedelta(days=rng.randrange(14)), status.value)
+    loader.write(models.Stock, STOCK_COLUMNS, stock_rows())
+
+    return store_products
+
+
+def seed_orders(loader: Loader, rng: random.Random, store_products: dict, users: int, orders: int):
+    """주문/주문 상품/결제/리뷰를 batch_size 주문 단위로 생성해 적재합니다. (배치마다 commit)"""
+    store_ids = list(store_products)
+    remaining = orders
+    while remaining:
+        n = min(loader.batch_size, remaining)
+        remaining -= n
+        order_rows, item_rows, payment_rows, review_rows = [], [], [], []
+        for _ in range(n):
+            order_id = make_uuid(rng)
+            member_id = user_id(rng.randrange(users))
+            store_id = rng.choice(store_ids)
+            ordered_at = BASE_DATE - timedelta(seconds=rng.randrange(ORDER_DAYS * 86400))
+            status = weighted(rng, ORDER_STATUS_WEIGHTS)
+            pickup_at = ordered_at + timedelta(hours=rng.randint(1, 48)) if status == models.OrderStatus.PICKED_UP else None
+            order_rows.append((order_id, member_id, store_id, ordered_at, pickup_at, status.value, None))
+
+            amount = 0
+            products = store_products[store_id]
+            for product_id, price in rng.sample(products, rng.randint(1, len(products))):
+                quantity = rng.randint(1, 3)
+                amount += price * quantity
+                item_rows.append((make_uuid(rng), order_id, product_id, quantity, price))
+            payment_rows.append((make_uuid(rng), order_id, amount, "CARD", ordered_at))
+
+            if status == models.OrderStatus.PICKED_UP and rng.random() < REVIEW_RATIO:
+                review_rows.append((make_uuid(rng), order_id, member_id, weighted(rng, RATING_WEIGHTS),
+                                    "예뻐요", pickup_at + timedelta(days=rng.randint(0, 7))))
+
+        loader.write(models.Order, ORDER_COLUMNS, order_rows)
+        loader.write(models.OrderItem, ORDER_ITEM_COLUMNS, item_rows)
+        loader.write(models.Payment, PAYMENT_COLUMNS, payment_rows)
+        loader.write(models.Review, REVIEW_COLUMNS, review_rows)
+        loader.conn.commit()
+        print(f"   ... orders {orders - remaining:,}/{orders:,}")
+
+
+def secondary_indexes():
+    return [index for table in models.Base.metadata.sorted_tables for index in table.indexes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FloMe 부하 테스트용 대용량 시드 데이터 생성")
+    parser.add_argument("--scale", type=float, default=1.0, help="1.0 = 매장 1만 / 재고 100만 / 주문 500만")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--method", choices=["auto", "copy", "insert"], default="auto",
+                        help="auto: psycopg 드라이버면 COPY, 아니면 insert 배치")
+    parser.add_argument("--reset", action="store_true",
+                        help="테이블을 지우고 새로 만든 뒤 적재 (보조 인덱스는 적재 후 생성)")
+    args = parser.parse_args()
+
+    method = args.method
+    if method == "auto":
+        method = "copy" if engine.dialect.driver == "psycopg" else "insert"
+    if method == "copy" and engine.dialect.driver != "psycopg":
+        parser.error(f"--method copy requires the psycopg driver (current: {engine.dialect.driver})")
+
+    stores = scaled(BASE_STORES, args.scale)
+    users = scaled(BASE_USERS, args.scale)
+    orders = scaled(BASE_STORES * ORDERS_PER_STORE, args.scale)
+    print(f"🌱 seed={args.seed} scale={args.scale} method={method}: "
+          f"stores {stores:,} / stocks {stores * STOCKS_PER_STORE:,} / orders {orders:,}")
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+
+    if args.reset:
+        models.Base.metadata.drop_all(bind=engine)
+        models.Base.metadata.create_all(bind=engine)
+        # 인덱스를 유지한 채 적재하면 행마다 인덱스 갱신 비용이 들어서, 적재 후 한 번에 생성
+        with engine.begin() as conn:
+            for index in secondary_indexes():
+                index.drop(conn)
+
+    with engine.connect() as conn:
+        loader = Loader(conn, method, args.batch_size)
+        store_products = seed_catalog(loader, rng, stores, users)
+        conn.commit()
+        seed_orders(loader, rng, store_products, users, orders)
+
+    if args.reset:
+        index_started = time.perf_counter()
+        with engine.begin() as conn:
+            for index in secondary_indexes():
+                index.create(conn)
+        print(f"   indexes rebuilt in {time.perf_counter() - index_started:.1f}s")
+
+    db = SessionLocal()
+    try:
+        rating_service.rebuild_rating_summaries(db)
+        if engine.dialect.name == "postgresql":
+            sales_service.rebuild_daily_sales(db)
+    finally:
+        db.close()
+
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("ANALYZE"))
+
+    print("🎉 시드 완료")
+    loader.report(time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
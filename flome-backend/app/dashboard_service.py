@@ -0,0 +1,108 @@
+# app/dashboard_service.py
+import os
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+
+from sqlalchemy import select, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, rating_service, sales_service
+from app.recommend_cache import TTLCache
+
+# 사장님 대시보드 캐시 (매장별). 주문/재고/리뷰 변경 시 invalidate 로 즉시 무효화
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "30"))
+REVENUE_DAYS = 14
+LOW_STOCK_THRESHOLD = 5
+RECENT_ORDER_COUNT = 5
+
+_cache = TTLCache(maxsize=1024, ttl=DASHBOARD_CACHE_TTL)
+
+
+def invalidate(store_id):
+    _cache.pop(str(store_id))
+
+
+async def get_dashboard(db: AsyncSession, store_id) -> dict:
+    key = str(store_id)
+    cached = _cache.get(key)
+    if cached is None:
+        cached = await build_dashboard(db, store_id)
+        _cache.set(key, cached)
+    return cached
+
+
+async def build_dashboard(db: AsyncSession, store_id) -> dict:
+    """
+    Admin 화면에 필요한 집계를 모두 DB 에서 계산합니다. (객체 그래프 로딩 없음, 매장 확인 + 집계 쿼리 5개)
+    """
+    Order, Payment, Stock, Review = models.Order, models.Payment, models.Stock, models.Review
+
+    if (await db.execute(select(models.Store.store_id).filter(models.Store.store_id == store_id))).first() is None:
+        raise HTTPException(status_code=404, detail="Store not found")
+
+    # 1. 상태별 주문 수
+    status_rows = (await db.execute(
+        select(Order.status, func.count()).filter(Order.store_id == store_id).group_by(Order.status)
+    )).all()
+    orders_by_status = {status.value: 0 for status in models.OrderStatus}
+    orders_by_status.update({status.value: count for status, count in status_rows})
+
+    # 2. 최근 REVENUE_DAYS 일 일별 매출 (store_daily_sales 롤업, 취소 주문 제외)
+    Sales = models.StoreDailySales
+    revenue_rows = (await db.execute(
+        select(Sales.sales_date, Sales.gross_amount, Sales.order_count)
+        .filter(Sales.store_id == store_id, Sales.sales_date > sales_service.today() - timedelta(days=REVENUE_DAYS))
+        .order_by(Sales.sales_date)
+    )).all()
+
+    # 3. 재고 부족 (판매 중이면서 수량 LOW_STOCK_THRESHOLD 이하) / 품절
+    available = Stock.status == models.StockStatus.AVAILABLE
+    low = available & (Stock.quantity <= LOW_STOCK_THRESHOLD) & (Stock.quantity > 0)
+    low_flowers, low_products, sold_out = (await db.execute(
+        select(
+            func.count(case((low & Stock.flower_id.isnot(None), 1))),
+            func.count(case((low & Stock.product_id.isnot(None), 1))),
+            func.count(case(((Stock.quantity <= 0) | (Stock.status == models.StockStatus.SOLD_OUT), 1))),
+        ).filter(Stock.store_id == store_id)
+    )).one()
+
+    # 4. 별점 분포
+    rating_rows = (await db.execute(
+        select(Review.rating, func.count())
+        .join(Order, Order.order_id == Review.order_id)
+        .filter(Order.store_id == store_id).group_by(Review.rating)
+    )).all()
+    rating_distribution = {rating: 0 for rating in range(1, 6)}
+    rating_distribution.update({rating: count for rating, count in rating_rows})
+    review_count = sum(rating_distribution.values())
+    rating_sum = sum(rating * count for rating, count in rating_distribution.items())
+
+    # 5. 최근 주문 (ix_orders_store_id_order_date)
+    recent_rows = (await db.execute(
+        select(Order.order_id, Order.member_id, Order.status, Order.order_date, Payment.amount)
+        .outerjoin(Payment, Payment.order_id == Order.order_id)
+        .filter(Order.store_id == store_id)
+        .order_by(Order.order_date.desc(), Order.order_id.desc()).limit(RECENT_ORDER_COUNT)
+    )).all()
+
+    return {
+        "store_id": store_id,
+        "generated_at": datetime.now(timezone.utc),
+        "orders_by_status": orders_by_status,
+        "revenue_by_day": [
+            {"day": str(d), "revenue": revenue, "orders": count} for d, revenue, count in revenue_rows
+        ],
+        "low_stock": {
+            "threshold": LOW_STOCK_THRESHOLD,
+            "flowers": low_flowers,
+            "products": low_products,
+            "sold_out": sold_out,
+        },
+        "rating_distribution": rating_distribution,
+        "review_count": review_count,
+        "average_rating": rating_service.average_rating(review_count, rating_sum),
+        "recent_orders": [
+            {"order_id": order_id, "member_id": member_id, "status": status.value, "order_date": order_date, "amount": amount}
+            for order_id, member_id, status, order_date, amount in recent_rows
+        ],
+    }
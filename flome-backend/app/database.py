@@ -1,8 +1,15 @@
 import os
+import time
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from dotenv import load_dotenv
 
+from . import metrics
+
 load_dotenv()
 
 # Use DATABASE_URL from environment
@@ -11,14 +18,147 @@ SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 if not SQLALCHEMY_DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is not set")
 
+# --- Connection pool 설정 (환경 변수) ---
+# 워커 수 x 엔진 2개(sync/async) x (POOL_SIZE + MAX_OVERFLOW) 가 Postgres max_connections 를 넘지 않게 잡을 것
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# transaction: PgBouncer transaction pooling (Supabase pooler 등) -> 서버측 prepared statement 끔
+# session: Postgres 직접 연결 또는 PgBouncer session pooling
+POOL_MODE = os.getenv("DB_POOL_MODE", "transaction").lower()
+
+# 특정 드라이버에서만 받는 connect_args (다른 드라이버에 넘기면 연결 시점에 에러)
+DRIVER_ONLY_CONNECT_ARGS = {
+    "prepare_threshold": "psycopg",
+    "statement_cache_size": "asyncpg",
+    "prepared_statement_cache_size": "asyncpg",
+}
+
+
+def build_connect_args(url: str) -> dict:
+    """POOL_MODE 와 URL 의 드라이버에 맞는 connect_args 를 만듭니다."""
+    if POOL_MODE != "transaction":
+        return {}
+    driver = make_url(url).get_driver_name()
+    if driver == "psycopg":
+        return {"prepare_threshold": None}
+    if driver == "asyncpg":
+        return {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    # psycopg2 는 서버측 prepared statement 를 쓰지 않으므로 추가 설정 불필요
+    return {}
+
+
+def validate_engine_config(url: str, connect_args: dict):
+    """시작 시점 검증: 드라이버가 설치되어 있고 connect_args 가 그 드라이버용인지 확인합니다."""
+    if POOL_MODE not in ("session", "transaction"):
+        raise ValueError(f"DB_POOL_MODE must be 'session' or 'transaction', got '{POOL_MODE}'")
+
+    parsed = make_url(url)
+    driver = parsed.get_driver_name()
+    try:
+        parsed.get_dialect().import_dbapi()
+    except ImportError as e:
+        raise ValueError(f"Database driver '{driver}' for {parsed.drivername} is not installed: {e}") from e
+
+    for arg in connect_args:
+        expected = DRIVER_ONLY_CONNECT_ARGS.get(arg)
+        if expected and expected != driver:
+            raise ValueError(f"connect_args '{arg}' is only valid for the {expected} driver, but {parsed.drivername} uses {driver}")
+
+
+# --- Pool 메트릭 ---
+POOL_CHECKOUT_WAIT = metrics.Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", ["engine"]
+)
+POOL_CHECKOUT_TIMEOUTS = metrics.Counter(
+    "db_pool_checkout_timeouts_total", "Pool checkouts that hit DB_POOL_TIMEOUT", ["engine"]
+)
+
+
+def _instrumented(pool_cls, label):
+    class InstrumentedPool(pool_cls):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            except PoolTimeoutError:
+                POOL_CHECKOUT_TIMEOUTS.inc(engine=label)
+                raise
+            finally:
+                POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, engine=label)
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_cls.__name__}"
+    return InstrumentedPool
+
+
+def _pool_kwargs(pool_cls, label):
+    return dict(
+        poolclass=_instrumented(pool_cls, label),
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        pool_recycle=POOL_RECYCLE,
+        pool_pre_ping=POOL_PRE_PING,
+    )
+
+
 # Create the SQLAlchemy engine
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={
-        "prepare_threshold": None  # <--- 이 부분이 핵심입니다!
-    })
+_connect_args = build_connect_args(SQLALCHEMY_DATABASE_URL)
+validate_engine_config(SQLALCHEMY_DATABASE_URL, _connect_args)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=_connect_args, **_pool_kwargs(QueuePool, "sync"))
 
 # Create a SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# --- Async engine (API 조회 엔드포인트용) ---
+# ASYNC_DATABASE_URL 이 없으면 DATABASE_URL 의 드라이버만 asyncpg 로 바꿔서 사용
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql":
+        query = dict(parsed.query)
+        # asyncpg 는 libpq 의 sslmode 대신 ssl 파라미터를 받음
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        parsed = parsed.set(drivername="postgresql+asyncpg", query=query)
+    return parsed.render_as_string(hide_password=False)
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(SQLALCHEMY_DATABASE_URL)
+
+_async_connect_args = build_connect_args(ASYNC_DATABASE_URL)
+validate_engine_config(ASYNC_DATABASE_URL, _async_connect_args)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, connect_args=_async_connect_args, **_pool_kwargs(AsyncAdaptedQueuePool, "async")
+)
+
+# 응답 직렬화 시 lazy load 가 일어나지 않도록 commit 후에도 속성을 만료시키지 않음
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+def pool_status() -> dict:
+    """엔진별 pool 점유 상태 (size / checked_out / checked_in / overflow / capacity)."""
+    status = {}
+    for label, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        status[label] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "capacity": POOL_SIZE + MAX_OVERFLOW,
+        }
+    return status
+
+
+POOL_CONNECTIONS = metrics.Gauge(
+    "db_pool_connections", "Pool occupancy by engine and state", ["engine", "state"],
+    callback=lambda: {
+        (label, state): value
+        for label, states in pool_status().items()
+        for state, value in states.items()
+    },
+)
+
 # Base class for models
 Base = declarative_base()
 
@@ -29,3 +169,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
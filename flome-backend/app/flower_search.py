@@ -0,0 +1,295 @@
+# app/flower_search.py
+"""
+꽃 검색/자동완성 인덱스 (워커 프로세스 메모리).
+
+- 한글은 자모 단위로 분해해서 비교 -> 입력 중인 글자("빨가", "장ㅁ")도 접두어로 매칭
+- 초성만 입력("ㅃㄱㅈㅁ")하면 초성 문자열로 매칭
+- 공백/대소문자 무시 ("빨간장미" == "빨간 장미")
+- 이름은 전체 + 단어별 접두어 트라이, 꽃말/색상은 단어별 접두어 트라이
+- 접두어로 안 걸리면 앞부분만 맞는 이름("장미꽃" -> "장미"), 오타는 자모 3-gram 유사도(Dice)로 순위
+- 꽃 생성 시 apply_flower 로 즉시 반영, REFRESH_INTERVAL 마다 DB 에서 전체 재로딩
+"""
+import os
+import time
+import asyncio
+import threading
+from collections import Counter, namedtuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+
+REFRESH_INTERVAL = float(os.getenv("FLOWER_SEARCH_REFRESH", "300"))
+NGRAM = 3
+MIN_FUZZY_SCORE = 0.35
+# 접두어 부분 일치("장미꽃" -> "장미")로 인정할 최소 자모 수 (~2글자)
+MIN_PARTIAL_JAMO = 4
+
+# 매칭 종류별 점수 (높을수록 위)
+SCORE_EXACT = 1.0
+SCORE_NAME_PREFIX = 0.9
+SCORE_WORD_PREFIX = 0.8
+SCORE_CHOSEONG = 0.75
+SCORE_MEANING = 0.6
+SCORE_COLOR = 0.55
+FUZZY_WEIGHT = 0.5  # 이름 오타 매칭은 최대 0.5
+
+FlowerEntry = namedtuple("FlowerEntry", ["flower_id", "name", "meaning", "color"])
+
+# --- 한글 자모 분해 ---
+
+HANGUL_BASE, HANGUL_LAST = 0xAC00, 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+# 겹모음/겹받침은 입력 순서대로 풀어둠 ("고" 다음 "과", "달" 다음 "닭" 도 접두어가 되도록)
+COMPOUND = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+CHOSEONG_SET = frozenset(CHOSEONG)
+
+
+def normalize(text: str) -> str:
+    """
+    공백(' ') 제거 + 소문자 (이름 중복 판단 기준).
+    DB 쪽 models.flower_name_key (lower(replace(name, ' ', ''))) 와 같은 문자만 지워야 두 판단이 어긋나지 않음
+    -> 탭/줄바꿈 등은 저장 전에 clean_name 으로 ' ' 하나로 바꿔 둠
+    """
+    return text.replace(" ", "").lower()
+
+
+def clean_name(text: str) -> str:
+    """저장할 꽃 이름: 앞뒤 공백 제거, 안쪽 공백류(탭/줄바꿈/NBSP 등)는 ' ' 하나로."""
+    return " ".join(text.split())
+
+
+def to_jamo(text: str) -> str:
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            offset = code - HANGUL_BASE
+            lead, vowel, tail = offset // 588, (offset % 588) // 28, offset % 28
+            out.append(CHOSEONG[lead])
+            out.append(COMPOUND.get(JUNGSEONG[vowel], JUNGSEONG[vowel]))
+            if tail:
+                out.append(COMPOUND.get(JONGSEONG[tail], JONGSEONG[tail]))
+        else:
+            out.append(COMPOUND.get(ch, ch))
+    return "".join(out)
+
+
+def to_choseong(text: str) -> str:
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            out.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def is_choseong_query(text: str) -> bool:
+    return bool(text) and all(ch in CHOSEONG_SET for ch in text)
+
+
+def ngrams(text: str) -> Counter:
+    padded = f"^{text}$"
+    return Counter(padded[i:i + NGRAM] for i in range(max(1, len(padded) - NGRAM + 1)))
+
+
+class PrefixTrie:
+    """키 접두어 -> id 집합. 노드마다 하위 id 를 모두 들고 있어 조회는 O(접두어 길이)."""
+
+    __slots__ = ("root",)
+
+    def __init__(self):
+        self.root = ({}, set())  # (children, ids)
+
+    def insert(self, key: str, item_id):
+        children, ids = self.root
+        ids.add(item_id)
+        for ch in key:
+            node = children.get(ch)
+            if node is None:
+                node = children[ch] = ({}, set())
+            children, ids = node
+            ids.add(item_id)
+
+    def remove(self, key: str, item_id):
+        children, ids = self.root
+        ids.discard(item_id)
+        for ch in key:
+            node = children.get(ch)
+            if node is None:
+                return
+            children, ids = node
+            ids.discard(item_id)
+
+    def prefix(self, key: str) -> set:
+        children, ids = self.root
+        for ch in key:
+            node = children.get(ch)
+            if node is None:
+                return set()
+            children, ids = node
+        return ids
+
+
+class FlowerSearchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._refresh_lock = asyncio.Lock()
+        self.loaded_at = None
+        self._reset()
+
+    def _reset(self):
+        self._flowers = {}      # flower_id -> FlowerEntry
+        self._names = {}        # normalize(name) -> flower_id
+        self._name_trie = PrefixTrie()      # 이름 전체 (자모)
+        self._word_trie = PrefixTrie()      # 이름의 단어 (자모)
+        self._choseong_trie = PrefixTrie()  # 이름 전체 / 단어 (초성)
+        self._meaning_trie = PrefixTrie()   # 꽃말 단어 (자모)
+        self._color_trie = PrefixTrie()     # 색상 단어 (소문자)
+        self._grams = {}        # 이름 자모 n-gram -> {flower_id}
+        self._gram_counts = {}  # flower_id -> 이름 n-gram 개수
+
+    def __len__(self):
+        return len(self._flowers)
+
+    # --- 전체 로딩 ---
+
+    async def ensure_fresh(self, db: AsyncSession):
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < REFRESH_INTERVAL:
+            return self
+        async with self._refresh_lock:
+            if self.loaded_at is None or time.monotonic() - self.loaded_at >= REFRESH_INTERVAL:
+                await self.refresh(db)
+        return self
+
+    async def refresh(self, db: AsyncSession):
+        Flower = models.Flower
+        rows = (await db.execute(select(Flower.flower_id, Flower.name, Flower.meaning, Flower.color))).all()
+        self.load(FlowerEntry(*row) for row in rows)
+
+    def load(self, entries):
+        with self._lock:
+            self._reset()
+            for entry in entries:
+                self._add(entry)
+            self.loaded_at = time.monotonic()
+
+    # --- 증분 반영 ---
+
+    def apply(self, entry: FlowerEntry):
+        with self._lock:
+            before = self._flowers.get(entry.flower_id)
+            if before == entry:
+                return
+            if before is not None:
+                self._remove(before)
+            self._add(entry)
+
+    def _keys(self, entry: FlowerEntry):
+        name_words = entry.name.lower().split()
+        return {
+            "name": [to_jamo(normalize(entry.name))],
+            "word": [to_jamo(word) for word in name_words[1:]],
+            "choseong": [to_choseong(normalize(entry.name))] + [to_choseong(word) for word in name_words[1:]],
+            "meaning": [to_jamo(word) for word in (entry.meaning or "").lower().replace(",", " ").split()],
+            "color": [word for word in (entry.color or "").lower().split()],
+        }
+
+    def _tries(self):
+        return {
+            "name": self._name_trie, "word": self._word_trie, "choseong": self._choseong_trie,
+            "meaning": self._meaning_trie, "color": self._color_trie,
+        }
+
+    def _add(self, entry: FlowerEntry):
+        self._flowers[entry.flower_id] = entry
+        self._names.setdefault(normalize(entry.name), entry.flower_id)
+        tries = self._tries()
+        for kind, keys in self._keys(entry).items():
+            for key in keys:
+                tries[kind].insert(key, entry.flower_id)
+        grams = ngrams(to_jamo(normalize(entry.name)))
+        self._gram_counts[entry.flower_id] = sum(grams.values())
+        for gram in grams:
+            self._grams.setdefault(gram, set()).add(entry.flower_id)
+
+    def _remove(self, entry: FlowerEntry):
+        del self._flowers[entry.flower_id]
+        if self._names.get(normalize(entry.name)) == entry.flower_id:
+            del self._names[normalize(entry.name)]
+        tries = self._tries()
+        for kind, keys in self._keys(entry).items():
+            for key in keys:
+                tries[kind].remove(key, entry.flower_id)
+        for gram in ngrams(to_jamo(normalize(entry.name))):
+            self._grams.get(gram, set()).discard(entry.flower_id)
+        self._gram_counts.pop(entry.flower_id, None)
+
+    # --- 검색 ---
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """[(score, FlowerEntry)] 점수 높은 순."""
+        q = normalize(query)
+        if not q:
+            return []
+        scores = {}
+
+        def hit(ids, score):
+            for flower_id in ids:
+                if scores.get(flower_id, 0) < score:
+                    scores[flower_id] = score
+
+        with self._lock:
+            if is_choseong_query(q):
+                hit(self._choseong_trie.prefix(q), SCORE_CHOSEONG)
+            else:
+                jamo = to_jamo(q)
+                exact = self._names.get(q)
+                if exact is not None:
+                    hit((exact,), SCORE_EXACT)
+                hit(self._name_trie.prefix(jamo), SCORE_NAME_PREFIX)
+                hit(self._word_trie.prefix(jamo), SCORE_WORD_PREFIX)
+                hit(self._meaning_trie.prefix(jamo), SCORE_MEANING)
+                hit(self._color_trie.prefix(q), SCORE_COLOR)
+                # 접두어로 limit 개를 못 채우면 앞부분만 맞는 이름 + 오타 허용 매칭
+                if len(scores) < limit:
+                    for cut in range(len(jamo) - 1, MIN_PARTIAL_JAMO - 1, -1):
+                        ids = self._name_trie.prefix(jamo[:cut]) | self._word_trie.prefix(jamo[:cut])
+                        if ids:
+                            hit(ids, SCORE_WORD_PREFIX * cut / len(jamo))
+                            break
+                    for flower_id, score in self._fuzzy(jamo):
+                        hit((flower_id,), score * FUZZY_WEIGHT)
+
+            ranked = sorted(
+                scores.items(), key=lambda item: (-item[1], len(self._flowers[item[0]].name), self._flowers[item[0]].name)
+            )
+            return [(score, self._flowers[flower_id]) for flower_id, score in ranked[:limit]]
+
+    def _fuzzy(self, jamo: str):
+        query_grams = ngrams(jamo)
+        query_count = sum(query_grams.values())
+        common = Counter()
+        for gram in query_grams:
+            for flower_id in self._grams.get(gram, ()):
+                common[flower_id] += 1
+        for flower_id, shared in common.items():
+            dice = 2 * shared / (query_count + self._gram_counts[flower_id])
+            if dice >= MIN_FUZZY_SCORE:
+                yield flower_id, dice
+
+
+index = FlowerSearchIndex()
+
+
+def apply_flower(flower: models.Flower):
+    index.apply(FlowerEntry(flower.flower_id, flower.name, flower.meaning, flower.color))
@@ -0,0 +1,170 @@
+# app/geo_index.py
+"""
+근처 매장 검색용 격자(grid) 공간 인덱스 (워커 프로세스 메모리).
+
+- 위경도를 CELL_DEGREES 크기의 칸으로 나누고 칸 -> 매장 목록을 들고 있음
+- 검색은 가운데 칸부터 바깥으로 칸을 넓혀가며 하버사인 거리로 거르고, 가까운 limit 개가
+  확정되면 중단 (매장 수만 개여도 주변 칸 몇 개만 보므로 ms 단위)
+- 매장 생성/수정 시 apply_store 로 즉시 반영, REFRESH_INTERVAL 마다 DB 에서 전체 재로딩
+  (inventory_snapshot 과 같은 방식: 다른 워커에서 바뀐 매장도 주기적으로 따라감)
+
+서비스 지역(국내) 기준이라 날짜변경선(경도 ±180) 을 넘는 반경은 고려하지 않습니다.
+"""
+import os
+import math
+import time
+import heapq
+import asyncio
+import threading
+from collections import namedtuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+
+REFRESH_INTERVAL = float(os.getenv("GEO_INDEX_REFRESH", "60"))
+# 칸 크기 (위도 0.005도 ~ 550m). 서울에 매장 5만 개여도 칸당 수십 개 수준
+# (bench/geo_nearby.py 기준 0.02 는 밀집 지역에서 후보가 많고, 0.0025 는 외곽에서 빈 칸 조회가 많음)
+CELL_DEGREES = float(os.getenv("GEO_INDEX_CELL_DEGREES", "0.005"))
+
+EARTH_RADIUS_M = 6_371_000
+KM_PER_DEGREE_LAT = 111.32
+
+StoreLocation = namedtuple(
+    "StoreLocation", ["store_id", "name", "address", "business_hours", "has_pickup_box", "latitude", "longitude"]
+)
+
+
+def haversine_m(lat1, lng1, lat2, lng2) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def cell_of(lat, lng):
+    return (math.floor(lat / CELL_DEGREES), math.floor(lng / CELL_DEGREES))
+
+
+class GeoIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._refresh_lock = asyncio.Lock()
+        self.loaded_at = None
+        self._stores = {}  # store_id -> StoreLocation (좌표가 있는 매장만)
+        self._cells = {}   # (lat 칸, lng 칸) -> {store_id}
+
+    def __len__(self):
+        return len(self._stores)
+
+    # --- 전체 로딩 ---
+
+    async def ensure_fresh(self, db: AsyncSession):
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < REFRESH_INTERVAL:
+            return self
+        async with self._refresh_lock:
+            if self.loaded_at is None or time.monotonic() - self.loaded_at >= REFRESH_INTERVAL:
+                await self.refresh(db)
+        return self
+
+    async def refresh(self, db: AsyncSession):
+        Store = models.Store
+        rows = (await db.execute(
+            select(Store.store_id, Store.name, Store.address, Store.business_hours, Store.has_pickup_box,
+                   Store.latitude, Store.longitude)
+            .filter(Store.latitude.isnot(None), Store.longitude.isnot(None))
+        )).all()
+        self.load(StoreLocation(*row) for row in rows)
+
+    def load(self, locations):
+        stores, cells = {}, {}
+        for location in locations:
+            stores[location.store_id] = location
+            cells.setdefault(cell_of(location.latitude, location.longitude), set()).add(location.store_id)
+        with self._lock:
+            self._stores, self._cells = stores, cells
+            self.loaded_at = time.monotonic()
+
+    # --- 증분 반영 ---
+
+    def apply(self, location: StoreLocation):
+        with self._lock:
+            self._remove(location.store_id)
+            if location.latitude is None or location.longitude is None:
+                return
+            self._stores[location.store_id] = location
+            self._cells.setdefault(cell_of(location.latitude, location.longitude), set()).add(location.store_id)
+
+    def _remove(self, store_id):
+        before = self._stores.pop(store_id, None)
+        if before is None:
+            return
+        cell = cell_of(before.latitude, before.longitude)
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(store_id)
+            if not members:
+                del self._cells[cell]
+
+    # --- 검색 ---
+
+    def nearby(self, lat: float, lng: float, radius_m: float, limit: int) -> list:
+        """
+        반경 radius_m 안의 매장을 가까운 순으로 [(distance_m, StoreLocation)].
+        가운데 칸부터 바깥 고리(ring) 순서로 보고, limit 개를 채운 뒤 다음 고리가
+        지금까지의 limit 번째 거리보다 멀면 중단 (매장이 밀집한 곳도 주변 몇 칸만 봄).
+        """
+        d_lat = radius_m / 1000 / KM_PER_DEGREE_LAT
+        # 고위도에서 경도 1도가 짧아지는 만큼 넓힘 (극점 근처는 0 나누기 방지)
+        cos_lat = max(math.cos(math.radians(min(abs(lat) + d_lat, 90))), 0.01)
+        d_lng = d_lat / max(math.cos(math.radians(lat)), 0.01)
+        lat_lo, lng_lo = cell_of(lat - d_lat, lng - d_lng)
+        lat_hi, lng_hi = cell_of(lat + d_lat, lng + d_lng)
+        center_lat, center_lng = cell_of(lat, lng)
+        max_ring = max(center_lat - lat_lo, lat_hi - center_lat, center_lng - lng_lo, lng_hi - center_lng)
+        # 한 칸의 최소 폭 (m). 고리 r 의 칸은 검색 지점에서 최소 (r - 1) 칸 떨어져 있음
+        cell_m = CELL_DEGREES * KM_PER_DEGREE_LAT * 1000 * cos_lat
+
+        nearest = []  # (-거리, 순번, 매장) 최대 힙, 크기 limit
+        seq = 0
+        with self._lock:
+            for ring in range(max_ring + 1):
+                if len(nearest) >= limit and -nearest[0][0] <= (ring - 1) * cell_m:
+                    break
+                for cell in _ring_cells(center_lat, center_lng, ring):
+                    for store_id in self._cells.get(cell, ()):
+                        location = self._stores[store_id]
+                        distance = haversine_m(lat, lng, location.latitude, location.longitude)
+                        if distance > radius_m:
+                            continue
+                        seq += 1
+                        if len(nearest) < limit:
+                            heapq.heappush(nearest, (-distance, seq, location))
+                        elif distance < -nearest[0][0]:
+                            heapq.heapreplace(nearest, (-distance, seq, location))
+        return [(-neg_distance, location) for neg_distance, _, location in sorted(nearest, reverse=True)]
+
+
+def _ring_cells(center_lat: int, center_lng: int, ring: int):
+    """가운데 칸에서 체비셰프 거리가 정확히 ring 인 칸들."""
+    if ring == 0:
+        yield (center_lat, center_lng)
+        return
+    for d in range(-ring, ring + 1):
+        yield (center_lat - ring, center_lng + d)
+        yield (center_lat + ring, center_lng + d)
+    for d in range(-ring + 1, ring):
+        yield (center_lat + d, center_lng - ring)
+        yield (center_lat + d, center_lng + ring)
+
+
+index = GeoIndex()
+
+
+def apply_store(store: models.Store):
+    index.apply(StoreLocation(
+        store.store_id, store.name, store.address, store.business_hours, bool(store.has_pickup_box),
+        store.latitude, store.longitude,
+    ))
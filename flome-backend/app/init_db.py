@@ -4,13 +4,14 @@ from datetime import datetime, timedelta
 import random
 from app.database import SessionLocal, engine
 from app import models
-from sqlalchemy.exc import IntegrityError
 
-# 1. 테이블 생성
-models.Base.metadata.create_all(bind=engine)
-print("🗑️ 기존 데이터를 모두 삭제하고 초기화합니다...")
-models.Base.metadata.drop_all(bind=engine)   # <--- 1. 기존 테이블 삭제 (초기화)
-models.Base.metadata.create_all(bind=engine) # <--- 2. 테이블 새로 생성
+# 데이터셋(get_flower_dataset 등)은 app.bulk_seed 에서도 import 하므로
+# 테이블 초기화는 import 시점이 아니라 reset_schema() 호출 시에만 수행
+def reset_schema():
+    models.Base.metadata.create_all(bind=engine)
+    print("🗑️ 기존 데이터를 모두 삭제하고 초기화합니다...")
+    models.Base.metadata.drop_all(bind=engine)   # <--- 1. 기존 테이블 삭제 (초기화)
+    models.Base.metadata.create_all(bind=engine) # <--- 2. 테이블 새로 생성
 
 # ==========================================
 # [데이터셋] 꽃 데이터 리스트 (약 60~70개)
@@ -108,20 +109,20 @@ def get_flower_dataset():
     return flowers
 
 # ==========================================
-# [데이터셋] 가맹점 리스트 (10개)
+# [데이터셋] 가맹점 리스트 (10개, 이름/주소/사장님/위도/경도)
 # ==========================================
 def get_store_dataset():
     stores = [
-        ("강남 플로썸", "서울 강남구 테헤란로 123", "owner1"),
-        ("홍대 꽃길만걷자", "서울 마포구 와우산로 45", "owner2"),
-        ("서초 어반플라워", "서울 서초구 서초대로 77", "owner3"),
-        ("송파 데일리그린", "서울 송파구 올림픽로 300", "owner4"),
-        ("성수 로즈마리", "서울 성동구 아차산로 99", "owner5"),
-        ("이태원 보타닉가든", "서울 용산구 이태원로 200", "owner6"),
-        ("종로 꽃이야기", "서울 종로구 종로 55", "owner7"),
-        ("여의도 블룸", "서울 영등포구 여의대로 60", "owner8"),
-        ("판교 그린아틀리에", "경기 성남시 분당구 판교역로 10", "owner9"),
-        ("분당 힐링플라워", "경기 성남시 분당구 정자일로 25", "owner10")
+        ("강남 플로썸", "서울 강남구 테헤란로 123", "owner1", 37.5006, 127.0364),
+        ("홍대 꽃길만걷자", "서울 마포구 와우산로 45", "owner2", 37.5509, 126.9227),
+        ("서초 어반플라워", "서울 서초구 서초대로 77", "owner3", 37.492, 126.99),
+        ("송파 데일리그린", "서울 송파구 올림픽로 300", "owner4", 37.513, 127.1025),
+        ("성수 로즈마리", "서울 성동구 아차산로 99", "owner5", 37.5446, 127.056),
+        ("이태원 보타닉가든", "서울 용산구 이태원로 200", "owner6", 37.5345, 126.9946),
+        ("종로 꽃이야기", "서울 종로구 종로 55", "owner7", 37.5704, 126.992),
+        ("여의도 블룸", "서울 영등포구 여의대로 60", "owner8", 37.5251, 126.9254),
+        ("판교 그린아틀리에", "경기 성남시 분당구 판교역로 10", "owner9", 37.3948, 127.1111),
+        ("분당 힐링플라워", "경기 성남시 분당구 정자일로 25", "owner10", 37.367, 127.108)
     ]
     return stores
 
@@ -129,30 +130,28 @@ def init_data():
     db = SessionLocal()
     try:
         print("🔄 FloMe 데이터 재구축 (가게별 재고 차별화) 시작...")
+        # PK 를 미리 만들어 두고 전체를 한 번에 add -> commit 1회 (중간 commit/refresh 없음)
+        rows = []
 
         # 1. 꽃 등록
-        flower_list = get_flower_dataset()
-        for d in flower_list:
-            db.add(models.Flower(name=d['name'], meaning=d['meaning'], color=d['color'], care_guide=d['care_guide']))
-        db.commit()
-        flower_objs = db.query(models.Flower).all()
+        flower_objs = [
+            models.Flower(flower_id=uuid.uuid4(), name=d['name'], meaning=d['meaning'], color=d['color'], care_guide=d['care_guide'])
+            for d in get_flower_dataset()
+        ]
+        rows.extend(flower_objs)
 
         # 2. 유저 등록
-        db.add(models.Member(member_id="user@flome.com", password="pw", name="이손님", contact="010-0000-0000", type=models.MemberType.USER, location_agree=True, money=200000))
+        rows.append(models.Member(member_id="user@flome.com", password="pw", name="이손님", contact="010-0000-0000", type=models.MemberType.USER, location_agree=True, money=200000))
 
         # 3. 매장 및 재고 등록
         store_list = get_store_dataset()
-        for idx, (s_name, addr, o_id) in enumerate(store_list):
+        for idx, (s_name, addr, o_id, lat, lng) in enumerate(store_list):
             # 사장님
             owner = models.Member(member_id=f"{o_id}@flome.com", password="pw", name=f"사장님{idx+1}", contact="010-1111-1111", type=models.MemberType.OWNER, location_agree=True)
-            db.add(owner)
-            db.commit()
-            
+
             # 매장
-            store = models.Store(owner_id=owner.member_id, name=s_name, address=addr, business_hours="09:00-20:00", has_pickup_box=True)
-            db.add(store)
-            db.commit()
-            db.refresh(store)
+            store = models.Store(store_id=uuid.uuid4(), owner_id=owner.member_id, name=s_name, address=addr, business_hours="09:00-20:00", has_pickup_box=True, latitude=lat, longitude=lng)
+            rows.extend([owner, store])
 
             # [핵심 수정 부분] 재고 랜덤 등록 (보유 종류를 줄임)
             # 전체 꽃의 20% ~ 30% 정도만 보유하도록 설정 (약 15~20종)
@@ -167,7 +166,7 @@ def init_data():
 
             for fl in my_flowers:
                 # 수량은 18~22개로 넉넉하게
-                db.add(models.Stock(
+                rows.append(models.Stock(
                     store_id=store.store_id,
                     flower_id=fl.flower_id,
                     quantity=random.randint(18, 22), 
@@ -176,14 +175,14 @@ def init_data():
                 ))
             
             # 완제품 1개 등록
-            prod = models.Product(store_id=store.store_id, name=f"{store.name} 랜덤박스", price=30000, type=models.ProductType.READY_MADE)
-            db.add(prod)
-            db.commit()
-            db.refresh(prod)
-            db.add(models.Stock(store_id=store.store_id, product_id=prod.product_id, quantity=10, stocking_date=datetime.now(), status=models.StockStatus.AVAILABLE))
+            prod = models.Product(product_id=uuid.uuid4(), store_id=store.store_id, name=f"{store.name} 랜덤박스", price=30000, type=models.ProductType.READY_MADE)
+            rows.append(prod)
+            rows.append(models.Stock(store_id=store.store_id, product_id=prod.product_id, quantity=10, stocking_date=datetime.now(), status=models.StockStatus.AVAILABLE))
             
+        db.add_all(rows)
         db.commit()
         print("🎉 초기화 완료! 이제 검색하면 일부 매장만 나옵니다.")
+        print("   (부하 테스트용 대용량 데이터는 python -m app.bulk_seed 사용)")
 
     except Exception as e:
         print(f"Error: {e}")
@@ -192,4 +191,5 @@ def init_data():
         db.close()
 
 if __name__ == "__main__":
-    init_data()
\ No newline at end of file
+    reset_schema()
+    init_data()
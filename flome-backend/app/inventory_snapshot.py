@@ -0,0 +1,290 @@
+# app/inventory_snapshot.py
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import Counter, namedtuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+
+logger = logging.getLogger("flome.inventory_snapshot")
+
+# 다른 워커에서 바뀐 재고까지 반영하기 위한 전체 재로딩 주기 (초)
+REFRESH_INTERVAL = float(os.getenv("INVENTORY_SNAPSHOT_REFRESH", "60"))
+
+# 추천 후보 매장 수 / 후보가 되기 위한 최소 꽃 종류 수
+TOP_STORE_COUNT = 5
+MIN_FLOWER_VARIETY = 3
+
+FlowerInfo = namedtuple("FlowerInfo", ["flower_id", "name", "meaning"])
+
+
+class InventorySnapshot:
+    """
+    추천 프롬프트용 재고 스냅샷 (워커 프로세스 메모리).
+    - 매장별 판매 가능한 꽃 재고, 매장 정보, 주문용 대표 상품을 들고 있고
+    - 재고 쓰기 엔드포인트가 apply_* 로 즉시 반영, REFRESH_INTERVAL 마다 DB 에서 전체 재로딩
+      (재로딩은 lifespan 의 백그라운드 Task(run_refresher) 가 맡고, 끝날 때까지 요청은 이전 스냅샷을 씀)
+    - 재로딩 조회 중에 들어온 apply_* 는 기록해 두었다가 새 데이터로 바꾼 직후 다시 반영
+      (조회 결과가 그 쓰기보다 오래된 것이어도 덮어쓰이지 않음)
+    - 추천 결과에 영향을 주는 변경이 있을 때만 version 이 올라감 (추천 캐시 키로 사용)
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._refresh_lock = asyncio.Lock()
+        self.version = 0
+        self.loaded_at = None
+        self._stores = {}    # store_id -> (name, address)
+        self._products = {}  # store_id -> (is_custom, product_id, price)
+        self._flowers = {}   # flower_id -> FlowerInfo
+        self._stocks = {}    # stock_id -> (store_id, flower_id)  판매 가능한 꽃 재고만
+        self._flower_rows = {}  # store_id -> Counter(flower_id -> 재고 행 수)
+        self._ranking = None
+        self._prompt = None
+        self._journal = None  # 재로딩 중이면 [(메서드 이름, 인자)], 아니면 None
+
+    # --- 전체 로딩 ---
+
+    async def ensure_fresh(self, db: AsyncSession):
+        """
+        아직 한 번도 로딩하지 않았을 때만 요청 안에서 로딩 (첫 요청들은 같이 기다림).
+        그 뒤로는 오래됐어도 바로 반환 -> 대용량 재고(수십만~백만 행) 재로딩이 추천 요청을 막지 않음
+        """
+        if self.loaded_at is not None:
+            return self
+        async with self._refresh_lock:
+            if self.loaded_at is None:
+                await self.refresh(db)
+        return self
+
+    async def run_refresher(self, session_factory, stop: asyncio.Event):
+        """
+        REFRESH_INTERVAL 마다 전체 재로딩 (lifespan 에서 Task 로 시작).
+        종료 시 stop 을 set -> 진행 중인 재로딩은 끝까지 하고 빠짐 (쿼리/연결 도중 취소하지 않도록)
+        """
+        while not stop.is_set():
+            try:
+                async with session_factory() as db:
+                    async with self._refresh_lock:
+                        await self.refresh(db)
+            except Exception:
+                # DB 장애 등 -> 이전 스냅샷을 계속 쓰고 다음 주기에 다시 시도
+                logger.exception("inventory snapshot refresh failed")
+            try:
+                await asyncio.wait_for(stop.wait(), REFRESH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def refresh(self, db: AsyncSession):
+        # 조회 시작 전부터 apply_* 기록 (조회가 그 쓰기 이전 상태를 읽었을 수 있음)
+        with self._lock:
+            self._journal = []
+        try:
+            rows = await self._query(db)
+        except BaseException:
+            with self._lock:
+                self._journal = None
+            raise
+        # 행 수만큼 dict 를 만들고 비교하는 CPU 작업은 이벤트 루프 밖에서
+        await asyncio.to_thread(self._load, *rows)
+
+    async def _query(self, db: AsyncSession):
+        stores = (await db.execute(
+            select(models.Store.store_id, models.Store.name, models.Store.address)
+        )).all()
+        products = (await db.execute(
+            select(models.Product.store_id, models.Product.product_id, models.Product.price, models.Product.type)
+        )).all()
+        flowers = (await db.execute(
+            select(models.Flower.flower_id, models.Flower.name, models.Flower.meaning)
+        )).all()
+        stocks = (await db.execute(
+            select(models.Stock.stock_id, models.Stock.store_id, models.Stock.flower_id).filter(
+                models.Stock.flower_id.isnot(None),
+                models.Stock.quantity > 0,
+                models.Stock.status == models.StockStatus.AVAILABLE
+            )
+        )).all()
+        return stores, products, flowers, stocks
+
+    def _load(self, store_rows, product_rows, flower_rows, stock_rows):
+        stores = {store_id: (name, address) for store_id, name, address in store_rows}
+        products = {}
+        for store_id, product_id, price, type_ in product_rows:
+            _pick_product(products, store_id, type_ == models.ProductType.CUSTOM, product_id, price)
+        flowers = {
+            flower_id: FlowerInfo(flower_id, name, meaning)
+            for flower_id, name, meaning in flower_rows
+        }
+        stocks = {stock_id: (store_id, flower_id) for stock_id, store_id, flower_id in stock_rows}
+
+        with self._lock:
+            journal, self._journal = self._journal or [], None
+            changed = journal or (stores, products, flowers, stocks) != (
+                self._stores, self._products, self._flowers, self._stocks
+            )
+            if changed:
+                self._stores, self._products, self._flowers, self._stocks = stores, products, flowers, stocks
+                self._flower_rows = {}
+                for store_id, flower_id in stocks.values():
+                    self._flower_rows.setdefault(store_id, Counter())[flower_id] += 1
+                # 조회 도중 들어온 쓰기를 순서대로 다시 반영
+                for name, args in journal:
+                    getattr(self, name)(*args)
+                self._changed()
+            self.loaded_at = time.monotonic()
+
+    # --- 증분 반영 (쓰기 엔드포인트에서 commit 후 호출) ---
+
+    def apply_stock(self, stock_id, store_id, flower_id, quantity, status):
+        available = (
+            flower_id is not None
+            and (quantity or 0) > 0
+            and status in (None, models.StockStatus.AVAILABLE)
+        )
+        with self._lock:
+            self._record("apply_stock", stock_id, store_id, flower_id, quantity, status)
+            before = self._stocks.get(stock_id)
+            after = (store_id, flower_id) if available else None
+            if before == after:
+                return
+            if before is not None:
+                self._remove_row(stock_id, *before)
+            if after is not None:
+                self._stocks[stock_id] = after
+                self._flower_rows.setdefault(store_id, Counter())[flower_id] += 1
+            self._changed()
+
+    def remove_stock(self, stock_id):
+        with self._lock:
+            self._record("remove_stock", stock_id)
+            before = self._stocks.get(stock_id)
+            if before is not None:
+                self._remove_row(stock_id, *before)
+                self._changed()
+
+    def apply_product(self, store_id, product_id, price, type_):
+        with self._lock:
+            self._record("apply_product", store_id, product_id, price, type_)
+            before = self._products.get(store_id)
+            _pick_product(self._products, store_id, type_ == models.ProductType.CUSTOM, product_id, price)
+            if self._products.get(store_id) != before:
+                self._changed()
+
+    def apply_flower(self, flower_id, name, meaning):
+        with self._lock:
+            self._record("apply_flower", flower_id, name, meaning)
+            info = FlowerInfo(flower_id, name, meaning)
+            if self._flowers.get(flower_id) != info:
+                self._flowers[flower_id] = info
+                self._changed()
+
+    def apply_store(self, store_id, name, address):
+        with self._lock:
+            self._record("apply_store", store_id, name, address)
+            if self._stores.get(store_id) != (name, address):
+                self._stores[store_id] = (name, address)
+                self._changed()
+
+    def _record(self, name, *args):
+        if self._journal is not None:
+            self._journal.append((name, args))
+
+    def _remove_row(self, stock_id, store_id, flower_id):
+        del self._stocks[stock_id]
+        rows = self._flower_rows[store_id]
+        rows[flower_id] -= 1
+        if rows[flower_id] <= 0:
+            del rows[flower_id]
+        if not rows:
+            del self._flower_rows[store_id]
+
+    def _changed(self):
+        self.version += 1
+        self._ranking = None
+        self._prompt = None
+
+    # --- 조회 (DB 접근 없음) ---
+
+    def top_store_ids(self, limit: int = TOP_STORE_COUNT) -> list:
+        """판매 가능한 꽃 재고 행 수 기준 상위 매장 (기존 GROUP BY count(flower_id) 와 같은 기준)."""
+        with self._lock:
+            if self._ranking is None:
+                self._ranking = sorted(
+                    self._flower_rows, key=lambda s: sum(self._flower_rows[s].values()), reverse=True
+                )
+            return self._ranking[:limit]
+
+    def store_flower_ids(self) -> dict:
+        """store_id -> [판매 가능한 flower_id] (local_recommender 의 매장 x 꽃 가용성 행렬용)."""
+        with self._lock:
+            return {store_id: list(rows) for store_id, rows in self._flower_rows.items()}
+
+    def store_flowers(self, store_id) -> list:
+        with self._lock:
+            return [self._flowers[f] for f in self._flower_rows.get(store_id, ()) if f in self._flowers]
+
+    def inventory_text(self) -> str:
+        """프롬프트에 넣을 후보 매장 인벤토리 (최소 MIN_FLOWER_VARIETY 종류 이상인 상위 매장)."""
+        with self._lock:
+            if self._prompt is None:
+                lines = []
+                for store_id in self.top_store_ids():
+                    # 같은 이름/꽃말 중복 제거 (순서 유지)
+                    flowers = list(dict.fromkeys(
+                        f"{f.name}(꽃말:{f.meaning or '없음'})" for f in self.store_flowers(store_id)
+                    ))
+                    if len(flowers) >= MIN_FLOWER_VARIETY and store_id in self._stores:
+                        lines.append(f"- 매장ID [{store_id}] ({self._stores[store_id][0]}): {', '.join(flowers)}\n")
+                self._prompt = "".join(lines)
+            return self._prompt
+
+    def store_data(self, store_id):
+        """추천 결과의 available_stores 항목. 스냅샷에 없는 매장이면 None."""
+        with self._lock:
+            info = self._stores.get(store_id)
+            if info is None:
+                return None
+            store_data = {"store_id": str(store_id), "name": info[0], "address": info[1]}
+            product = self._products.get(store_id)
+            if product:
+                store_data["product_id"] = str(product[1])
+                store_data["product_price"] = product[2]
+            return store_data
+
+
+def _pick_product(products: dict, store_id, is_custom: bool, product_id, price):
+    # 주문용 대표 상품: CUSTOM 상품 우선, 없으면 처음 본 상품
+    current = products.get(store_id)
+    if current is None or (is_custom and not current[0]):
+        products[store_id] = (is_custom, product_id, price)
+
+
+snapshot = InventorySnapshot()
+
+
+# --- 엔드포인트용 헬퍼 (commit/refresh 이후의 ORM 객체를 받음) ---
+
+def apply_stock(stock: models.Stock):
+    snapshot.apply_stock(stock.stock_id, stock.store_id, stock.flower_id, stock.quantity, stock.status)
+
+
+def remove_stock(stock_id):
+    snapshot.remove_stock(stock_id)
+
+
+def apply_product(product: models.Product):
+    snapshot.apply_product(product.store_id, product.product_id, product.price, product.type)
+
+
+def apply_flower(flower: models.Flower):
+    snapshot.apply_flower(flower.flower_id, flower.name, flower.meaning)
+
+
+def apply_store(store: models.Store):
+    snapshot.apply_store(store.store_id, store.name, store.address)
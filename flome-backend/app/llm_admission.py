@@ -0,0 +1,251 @@
+# app/llm_admission.py
+"""
+추천 LLM 호출 입장 제어 (워커 프로세스 메모리).
+
+호출 전에 순서대로 확인하고, 하나라도 막히면 LLM 을 부르지 않고 Rejected 를 던짐
+-> ai_service 가 바로 로컬 추천(local_recommender)으로 대체 (장애 중에도 ms 단위 응답)
+
+1. 서킷 브레이커: 연속 실패 LLM_BREAKER_FAILURES 회(또는 429 한 번)면 open ->
+   LLM_BREAKER_COOLDOWN 초 동안 호출 없이 대체. 쿨다운 후 half_open 에서 1건만 시험 호출해
+   성공하면 closed, 실패하면 다시 open
+2. 동시 호출 제한: 세마포어 LLM_MAX_CONCURRENCY 개, 자리가 LLM_QUEUE_TIMEOUT 초 안에 안 나면 대체
+3. 토큰 버킷: 분당 LLM_RATE_PER_MINUTE 건 (버스트 LLM_RATE_BURST 건), 쿼터에 맞춰 설정.
+   토큰이 없으면 기다리지 않고 대체 (0 이면 제한 없음)
+
+워커마다 따로 세므로 토큰 버킷 / 동시 호출 수는 "전체 쿼터 / 워커 수" 로 잡습니다.
+LLM_ADMISSION=0 이면 확인 없이 모두 통과 (부하 테스트 비교용).
+"""
+import os
+import time
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+
+from app import metrics
+
+ENABLED = os.getenv("LLM_ADMISSION", "1") != "0"
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "1.0"))
+RATE_PER_MINUTE = float(os.getenv("LLM_RATE_PER_MINUTE", "60"))
+RATE_BURST = int(os.getenv("LLM_RATE_BURST", "10"))
+BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+ADMISSIONS = metrics.Counter(
+    "llm_admission_total", "LLM call admission decisions", ["decision"]
+)
+CALLS = metrics.Counter(
+    "llm_calls_total", "Admitted LLM calls by outcome", ["outcome"]
+)
+BREAKER_TRANSITIONS = metrics.Counter(
+    "llm_breaker_transitions_total", "Circuit breaker state changes", ["state"]
+)
+QUEUE_WAIT = metrics.Histogram(
+    "llm_admission_wait_seconds", "Time waiting for an LLM concurrency slot",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+class Rejected(Exception):
+    """LLM 호출 불가 (reason: circuit_open / busy / rate_limited)."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def is_quota_error(error: Exception) -> bool:
+    # Gemini: google.api_core.exceptions.ResourceExhausted (429), faulty: llm_provider.RateLimitError
+    text = f"{type(error).__name__} {error}"
+    return "ResourceExhausted" in text or "RateLimit" in text or "429" in text
+
+
+class TokenBucket:
+    def __init__(self, rate_per_second: float, capacity: int):
+        self.rate = rate_per_second
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            return min(self.capacity, self._tokens + (time.monotonic() - self._updated) * self.rate)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    return False
+                self._set(HALF_OPEN)
+            # half_open: 시험 호출 1건만
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self.state != CLOSED:
+                self._set(CLOSED)
+
+    def record_failure(self, quota: bool = False):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN or quota or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                if self.state != OPEN:
+                    self._set(OPEN)
+
+    def record_abandoned(self):
+        """결과 없이 끝난 호출 (클라이언트 끊김) -> 상태는 그대로, 시험 호출 자리만 반납."""
+        with self._lock:
+            self._probing = False
+
+    def _set(self, state: str):
+        self.state = state
+        BREAKER_TRANSITIONS.inc(state=state)
+
+
+class LLMCall:
+    """
+    admit() 안에서 응답을 받아 파싱/검증까지 통과하면 succeeded(),
+    응답은 왔지만 쓸 수 없으면(잘못된 매장 ID 등) failed() 호출. 둘 다 없으면 중단으로 봄.
+    """
+
+    __slots__ = ("ok",)
+
+    def __init__(self):
+        self.ok = None
+
+    def succeeded(self):
+        self.ok = True
+
+    def failed(self):
+        self.ok = False
+
+
+class AdmissionController:
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, queue_timeout: float = QUEUE_TIMEOUT,
+                 rate_per_minute: float = RATE_PER_MINUTE, burst: int = RATE_BURST,
+                 breaker_failures: int = BREAKER_FAILURES, breaker_cooldown: float = BREAKER_COOLDOWN,
+                 enabled: bool = ENABLED):
+        self.enabled = enabled
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.bucket = TokenBucket(rate_per_minute / 60, burst)
+        self.breaker = CircuitBreaker(breaker_failures, breaker_cooldown)
+
+    @asynccontextmanager
+    async def admit(self):
+        """
+        async with controller.admit() as call: ... call.succeeded()
+        블록에서 예외가 나거나 failed() 면 실패로 기록 (429 면 바로 open),
+        succeeded() / failed() 없이 끝나면 중단으로 봄.
+        """
+        if not self.enabled:
+            yield LLMCall()
+            return
+
+        if not self.breaker.allow():
+            ADMISSIONS.inc(decision="circuit_open")
+            raise Rejected("circuit_open")
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.breaker.record_abandoned()
+            ADMISSIONS.inc(decision="busy")
+            raise Rejected("busy")
+        QUEUE_WAIT.observe(time.perf_counter() - started)
+
+        try:
+            if not self.bucket.try_acquire():
+                self.breaker.record_abandoned()
+                ADMISSIONS.inc(decision="rate_limited")
+                raise Rejected("rate_limited")
+
+            ADMISSIONS.inc(decision="admitted")
+            self.in_flight += 1
+            call = LLMCall()
+            try:
+                yield call
+            except Exception as e:
+                self.breaker.record_failure(quota=is_quota_error(e))
+                CALLS.inc(outcome="failure")
+                raise
+            except BaseException:
+                # 취소 (요청 Task 종료 등)
+                self.breaker.record_abandoned()
+                CALLS.inc(outcome="abandoned")
+                raise
+            else:
+                if call.ok:
+                    self.breaker.record_success()
+                    CALLS.inc(outcome="success")
+                elif call.ok is False:
+                    self.breaker.record_failure()
+                    CALLS.inc(outcome="failure")
+                else:
+                    self.breaker.record_abandoned()
+                    CALLS.inc(outcome="abandoned")
+            finally:
+                self.in_flight -= 1
+        finally:
+            self._semaphore.release()
+
+
+controller = AdmissionController()
+
+
+def _state_samples():
+    state = controller.breaker.state
+    return {(s,): int(s == state) for s in (CLOSED, OPEN, HALF_OPEN)}
+
+
+BREAKER_STATE = metrics.Gauge(
+    "llm_breaker_state", "Circuit breaker state (1 = current)", ["state"], callback=_state_samples
+)
+IN_FLIGHT = metrics.Gauge(
+    "llm_inflight", "LLM calls in progress", callback=lambda: {(): controller.in_flight}
+)
+MAX_IN_FLIGHT = metrics.Gauge(
+    "llm_max_concurrency", "LLM concurrency limit per worker", callback=lambda: {(): controller.max_concurrency}
+)
+RATE_TOKENS = metrics.Gauge(
+    "llm_rate_tokens", "Tokens left in the LLM rate-limit bucket", callback=lambda: {(): controller.bucket.tokens}
+)
@@ -0,0 +1,155 @@
+# app/llm_provider.py
+"""
+추천용 LLM 선택 (환경 변수 LLM_PROVIDER).
+
+- gemini : ChatGoogleGenerativeAI (기본값, GOOGLE_API_KEY 필요)
+- fake   : 네트워크 없이 프롬프트의 후보 매장/꽃으로 올바른 레시피 JSON 을 만드는 가짜 LLM
+- faulty : fake + 장애 주입 (지연 분포, 429, 깨진 JSON) -> fallback 경로 부하 측정용
+
+ai_service 는 `prompt | llm | StrOutputParser()` 로 astream 만 사용하므로
+fake/faulty 는 문자열 청크를 흘려보내는 Runnable 로 구현합니다.
+LangChain 은 import 비용이 커서 create_* 안에서만 import 합니다. (API 워커 시작 시간)
+"""
+import os
+import re
+import json
+import random
+import asyncio
+import hashlib
+
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini").lower()
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite")
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "0"))
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "20"))
+
+# fake: 청크 크기(글자 수)와 청크 사이 지연 (토큰 스트리밍 흉내)
+FAKE_CHUNK_SIZE = int(os.getenv("LLM_FAKE_CHUNK_SIZE", "16"))
+FAKE_CHUNK_DELAY = float(os.getenv("LLM_FAKE_CHUNK_DELAY", "0"))
+
+# faulty: 첫 청크 전 지연 분포 / 429 비율 / 깨진 JSON 비율 / 난수 seed
+FAULT_LATENCY = os.getenv("LLM_FAULT_LATENCY", "fixed:0")
+FAULT_RATE_LIMIT = float(os.getenv("LLM_FAULT_429_RATE", "0"))
+FAULT_MALFORMED = float(os.getenv("LLM_FAULT_MALFORMED_RATE", "0"))
+FAULT_SEED = os.getenv("LLM_FAULT_SEED")
+
+STORE_LINE = re.compile(r"- 매장ID \[([0-9a-fA-F-]{36})\] \((.*?)\): (.*)")
+FLOWER_ITEM = re.compile(r"(.+?)\(꽃말:(.*?)\)")
+SITUATION_LINE = re.compile(r'\[고객의 상황\]\s*"(.*?)"', re.S)
+
+
+class RateLimitError(Exception):
+    """faulty 가 내는 가짜 429. (Gemini 의 ResourceExhausted 처럼 ai_service 에서 fallback 처리됨)"""
+
+
+def parse_latency(spec: str):
+    """
+    지연 분포 문자열 -> rng 를 받아 초 단위 지연을 돌려주는 함수.
+    fixed:0.5 / uniform:0.2,1.5 / lognormal:mu,sigma (초 단위 정규분포 파라미터의 exp)
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v]
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(*values)
+    if kind == "lognormal" and len(values) == 2:
+        return lambda rng: rng.lognormvariate(*values)
+    raise ValueError(f"Invalid LLM_FAULT_LATENCY '{spec}' (use fixed:s, uniform:lo,hi or lognormal:mu,sigma)")
+
+
+def fake_recipe(prompt_text: str) -> str:
+    """
+    프롬프트의 후보 매장 목록에서 상황 문구 해시로 매장 하나를 고르고
+    그 매장 보유 꽃으로 레시피 JSON 을 만듭니다. (같은 프롬프트 -> 같은 결과)
+    """
+    stores = []
+    for store_id, name, flowers in STORE_LINE.findall(prompt_text):
+        stores.append((store_id, name, FLOWER_ITEM.findall(flowers)))
+    match = SITUATION_LINE.search(prompt_text)
+    situation = match.group(1) if match else ""
+
+    if not stores:
+        return json.dumps({"selected_store_id": "", "title": "", "flowers": []}, ensure_ascii=False)
+
+    digest = int(hashlib.md5(situation.encode()).hexdigest(), 16)
+    store_id, name, flowers = stores[digest % len(stores)]
+    roles = ["메인", "서브", "소재"]
+    return json.dumps({
+        "selected_store_id": store_id,
+        "title": f"{situation}을 위한 {name} 꽃다발",
+        "color_theme": "따뜻하고 화사한 파스텔 톤",
+        "flowers": [
+            {"role": role, "name": flower.strip(" ,"), "reason": f"꽃말 '{meaning}'"}
+            for role, (flower, meaning) in zip(roles, flowers)
+        ],
+        "letter": "언제나 곁에서 응원하고 있어요.",
+        "care_guide": ["줄기 끝을 사선으로 잘라주세요.", "매일 물을 갈아주세요.", "직사광선을 피해주세요."],
+    }, ensure_ascii=False)
+
+
+async def _prompt_text(inputs) -> str:
+    parts = []
+    async for value in inputs:
+        parts.append(value.to_string() if hasattr(value, "to_string") else str(value))
+    return "".join(parts)
+
+
+def create_fake_llm(chunk_size: int = FAKE_CHUNK_SIZE, chunk_delay: float = FAKE_CHUNK_DELAY):
+    from langchain_core.runnables import RunnableGenerator
+
+    async def stream(inputs):
+        text = fake_recipe(await _prompt_text(inputs))
+        for i in range(0, len(text), chunk_size):
+            if chunk_delay:
+                await asyncio.sleep(chunk_delay)
+            yield text[i:i + chunk_size]
+
+    return RunnableGenerator(stream, name="FakeRecipeLLM")
+
+
+def create_faulty_llm(inner=None, latency: str = FAULT_LATENCY, rate_limit: float = FAULT_RATE_LIMIT,
+                      malformed: float = FAULT_MALFORMED, seed=FAULT_SEED):
+    """inner(기본 fake) 앞뒤로 지연 / 429 / 깨진 JSON 을 주입합니다. seed 를 주면 장애 순서가 재현됨."""
+    from langchain_core.runnables import RunnableGenerator
+
+    inner = inner or create_fake_llm()
+    delay_of = parse_latency(latency)
+    rng = random.Random(seed)
+
+    async def stream(inputs):
+        prompt = [value async for value in inputs]
+        await asyncio.sleep(delay_of(rng))
+        if rng.random() < rate_limit:
+            raise RateLimitError("429 Resource has been exhausted (simulated)")
+        corrupt = rng.random() < malformed
+
+        sent = 0
+        async for chunk in inner.astream(prompt[0]):
+            chunk = chunk.content if hasattr(chunk, "content") else chunk
+            if corrupt and sent + len(chunk) > 40:
+                # 앞부분만 보내고 끊어서 JSON 파싱이 실패하도록
+                yield chunk[:max(0, 40 - sent)] + "...<truncated"
+                return
+            sent += len(chunk)
+            yield chunk
+
+    return RunnableGenerator(stream, name="FaultyLLM")
+
+
+def create_gemini_llm():
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    # 모델 설정 (Gemini 2.5 Flash 사용). 재시도 대신 실패하면 바로 대체 결과 + 서킷 브레이커 (llm_admission)
+    return ChatGoogleGenerativeAI(
+        model=GEMINI_MODEL, temperature=0.7, max_retries=GEMINI_MAX_RETRIES, timeout=GEMINI_TIMEOUT
+    )
+
+
+def create_llm(provider: str = LLM_PROVIDER):
+    if provider == "gemini":
+        return create_gemini_llm()
+    if provider == "fake":
+        return create_fake_llm()
+    if provider == "faulty":
+        return create_faulty_llm()
+    raise ValueError(f"Unknown LLM_PROVIDER '{provider}' (use gemini, fake or faulty)")
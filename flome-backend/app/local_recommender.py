@@ -0,0 +1,351 @@
+# app/local_recommender.py
+"""
+LLM 없이 동작하는 결정적(deterministic) 꽃다발 추천 엔진.
+
+- 꽃마다 꽃말 / 이름 / 색상 / 관리법 텍스트를 TF-IDF 벡터로 만들어 두고 (단어 + 음절 bigram)
+- 고객 상황 문장을 상황 사전(생일 -> 축하/행복/기쁨 ...)과 색상 단어로 확장해 같은 공간의 벡터로 만든 뒤
+- 전체 꽃과의 코사인 유사도를 NumPy 행렬곱 한 번으로 계산
+- 재고 스냅샷의 매장 x 꽃 가용성 행렬에서 "상위 3종 점수 합"이 가장 높은 매장을 고르고
+  그 매장 재고로 메인/서브/소재를 구성
+
+네트워크 호출이 없어 수 ms 안에 답하므로, LLM 응답 전 초안(draft)과 LLM 실패 시 대체 결과로 사용합니다.
+같은 상황 문장 + 같은 재고면 항상 같은 결과를 돌려줍니다.
+LLM 프롬프트에 넣을 후보 매장/꽃 선별(recommend_prompt)에도 같은 점수를 씁니다.
+"""
+import os
+import math
+import time
+import zlib
+import asyncio
+import threading
+from collections import Counter, namedtuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, inventory_snapshot
+
+REFRESH_INTERVAL = float(os.getenv("LOCAL_RECOMMENDER_REFRESH", "300"))
+BOUQUET_SIZE = 3
+MIN_FLOWER_VARIETY = inventory_snapshot.MIN_FLOWER_VARIETY
+
+# 필드별 가중치 (꽃말이 가장 중요, 관리법은 보조)
+FIELD_WEIGHTS = {"meaning": 3.0, "name": 1.0, "color": 1.5, "care_guide": 0.3}
+# 상황에 없는 부정적 꽃말은 점수를 깎음 (축하 꽃다발에 "배신", "이별의 슬픔" 이 섞이지 않도록)
+NEGATIVE_WORDS = ("배신", "슬픔", "슬픈", "실연", "헛된", "밀회", "속절없는", "독성")
+NEGATIVE_PENALTY = 0.2
+# 소재(필러)로 쓰기 좋은 꽃
+FILLER_NAMES = ("안개꽃", "유칼립투스", "스토크", "라벤더", "클로버", "목화")
+
+FlowerDoc = namedtuple("FlowerDoc", ["flower_id", "name", "meaning", "color", "care_guide"])
+
+# 상황 키워드 -> (라벨, 확장 검색어). 키워드는 상황 문장에 부분 문자열로 들어 있으면 매칭
+CONCEPTS = [
+    ("사랑", ("연인", "여자친구", "남자친구", "애인", "고백", "프로포즈", "청혼", "기념일", "사랑", "데이트", "발렌타인"),
+     "사랑의 마음을 전하는", "사랑 고백 열정적인 영원한 변치 않는 사랑의 기쁨"),
+    ("축하", ("생일", "축하", "졸업", "합격", "승진", "취업", "입학", "개업", "결혼", "출산", "성공"),
+     "축하의 마음을 담은", "행복 성취 희망 시작 응원 좋은 소식 행운 기쁨"),
+    ("감사", ("감사", "고마", "부모", "어버이", "엄마", "아빠", "어머니", "아버지", "스승", "선생님"),
+     "감사의 마음을 전하는", "감사 존경 어머니의 사랑 모정 고결"),
+    ("위로", ("위로", "힘내", "힘든", "아픈", "병문안", "우울", "지친", "회복", "응원"),
+     "힘이 되어 줄", "위로 희망 응원 평화 행복 시작"),
+    ("사과", ("사과", "미안", "화해", "용서"),
+     "진심을 담은", "용서 진심 나를 생각해주세요"),
+    ("추모", ("이별", "작별", "추모", "조문", "장례", "그리운", "그리움"),
+     "그리움을 담은", "추억 평화 고결 순결 슬픈 추억"),
+    ("우정", ("친구", "우정", "동료", "동기"),
+     "우정을 나누는", "우정 행복 좋은 소식 즐거움"),
+]
+DEFAULT_LABEL = "마음을 담은"
+
+COLOR_WORDS = {
+    "red": ("빨간", "빨강", "레드", "붉은"),
+    "pink": ("분홍", "핑크"),
+    "yellow": ("노란", "노랑", "옐로"),
+    "white": ("하얀", "흰", "화이트", "하양"),
+    "purple": ("보라", "퍼플", "라벤더색"),
+    "blue": ("파란", "파랑", "블루"),
+    "orange": ("주황", "오렌지"),
+    "green": ("초록", "그린", "녹색"),
+}
+COLOR_NAMES_KO = {
+    "red": "레드", "pink": "핑크", "yellow": "옐로", "white": "화이트", "purple": "퍼플",
+    "blue": "블루", "orange": "오렌지", "green": "그린", "black": "블랙",
+}
+
+LETTERS = {
+    "사랑": [
+        "처음 마음 그대로, 앞으로도 당신 곁에서 같은 계절을 함께 걷고 싶어요. 오늘도 사랑합니다.",
+        "당신을 떠올리면 하루가 환해져요. 말로 다 못한 마음을 오늘 이렇게 전합니다.",
+    ],
+    "축하": [
+        "오늘의 기쁨이 오래오래 이어지길 바라요. 지금까지 애쓴 당신, 정말 축하합니다.",
+        "새로운 시작 앞에 선 당신을 진심으로 응원해요. 앞으로의 날들도 활짝 피어나길!",
+    ],
+    "감사": [
+        "늘 받기만 한 것 같아 오늘은 제 마음을 전하고 싶었어요. 언제나 고맙고 존경합니다.",
+        "묵묵히 곁을 지켜 주셔서 감사합니다. 덕분에 저도 따뜻한 사람이 되어 갑니다.",
+    ],
+    "위로": [
+        "힘든 시간도 결국 지나가요. 천천히, 당신의 속도로 괜찮아지길 곁에서 기다릴게요.",
+        "오늘 하루 많이 애썼어요. 작은 위로가 되어 당신의 마음이 조금은 가벼워지길 바라요.",
+    ],
+    "사과": [
+        "서툴렀던 제 말과 행동을 진심으로 미안하게 생각해요. 다시 웃으며 마주하고 싶어요.",
+    ],
+    "추모": [
+        "함께한 날들을 오래 기억하겠습니다. 따뜻했던 마음이 오래 남아 위로가 되길 바랍니다.",
+    ],
+    "우정": [
+        "오랜 시간 곁에 있어 줘서 고마워. 앞으로도 지금처럼 서로의 좋은 친구가 되어 주자.",
+    ],
+    None: [
+        "꽃이 피어나는 것처럼 당신의 하루도 활짝 피어나길 바랍니다. 언제나 응원하고 있어요.",
+        "말로는 다 전하지 못하는 마음을 이 꽃들에 담아 보냅니다. 오늘도 행복하길 바라요.",
+    ],
+}
+GENERAL_CARE_GUIDE = [
+    "줄기 끝을 사선으로 잘라 물 흡수 면적을 넓혀주세요.",
+    "매일 시원한 물로 갈아주면 더 오래 볼 수 있습니다.",
+    "직사광선을 피하고 서늘한 곳에 보관하세요.",
+]
+
+
+def tokens(text: str) -> Counter:
+    """단어 + 단어 안의 음절 bigram (한국어 조사/어미 변화에 덜 민감하도록)."""
+    counts = Counter()
+    for word in text.lower().replace(",", " ").replace("(", " ").replace(")", " ").split():
+        counts[word] += 1
+        for i in range(len(word) - 1):
+            counts[word[i:i + 2]] += 1
+    return counts
+
+
+def detect_concept(situation: str):
+    for concept, keywords, label, expansion in CONCEPTS:
+        if any(keyword in situation for keyword in keywords):
+            return concept, label, expansion
+    return None, DEFAULT_LABEL, ""
+
+
+def detect_colors(situation: str) -> list:
+    return [color for color, words in COLOR_WORDS.items() if any(word in situation for word in words)]
+
+
+class LocalRecommender:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._refresh_lock = asyncio.Lock()
+        self.loaded_at = None
+        self.version = 0
+        self._docs = []          # 행 순서 = 행렬 행 순서
+        self._row_of = {}        # flower_id -> 행 번호
+        self._vocab = {}         # 단어 -> 열 번호
+        self._idf = np.zeros(0, dtype=np.float32)
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._negative = np.zeros(0, dtype=bool)
+        self._availability = None  # (키, store_ids, 매장 x 꽃 bool 행렬)
+
+    def __len__(self):
+        return len(self._docs)
+
+    # --- 전체 로딩 / 증분 반영 ---
+
+    async def ensure_fresh(self, db: AsyncSession):
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < REFRESH_INTERVAL:
+            return self
+        async with self._refresh_lock:
+            if self.loaded_at is None or time.monotonic() - self.loaded_at >= REFRESH_INTERVAL:
+                await self.refresh(db)
+        return self
+
+    async def refresh(self, db: AsyncSession):
+        Flower = models.Flower
+        rows = (await db.execute(
+            select(Flower.flower_id, Flower.name, Flower.meaning, Flower.color, Flower.care_guide)
+        )).all()
+        self.load(FlowerDoc(*row) for row in rows)
+
+    def load(self, docs):
+        # 이름순으로 고정 -> 같은 데이터면 동점 처리까지 항상 같은 결과
+        docs = sorted(docs, key=lambda d: (d.name, str(d.flower_id)))
+        with self._lock:
+            if docs != self._docs:
+                self._build(docs)
+            self.loaded_at = time.monotonic()
+
+    def apply(self, doc: FlowerDoc):
+        with self._lock:
+            docs = [d for d in self._docs if d.flower_id != doc.flower_id] + [doc]
+            self._build(sorted(docs, key=lambda d: (d.name, str(d.flower_id))))
+
+    def _build(self, docs):
+        # 꽃 수가 수백 개 수준이라 변경 시 전체 재계산 (수 ms)
+        term_counts = []
+        for doc in docs:
+            counts = Counter()
+            for field, weight in FIELD_WEIGHTS.items():
+                for term, n in tokens(getattr(doc, field) or "").items():
+                    counts[term] += weight * n
+            if doc.color:
+                counts[f"color:{doc.color.lower()}"] += FIELD_WEIGHTS["color"]
+            term_counts.append(counts)
+
+        vocab = {}
+        for counts in term_counts:
+            for term in counts:
+                vocab.setdefault(term, len(vocab))
+        tf = np.zeros((len(docs), len(vocab)), dtype=np.float32)
+        for row, counts in enumerate(term_counts):
+            for term, weight in counts.items():
+                tf[row, vocab[term]] = 1 + math.log(weight) if weight >= 1 else weight
+        df = (tf > 0).sum(axis=0)
+        idf = (np.log((1 + len(docs)) / (1 + df)) + 1).astype(np.float32)
+        matrix = tf * idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+
+        self._docs = docs
+        self._row_of = {doc.flower_id: row for row, doc in enumerate(docs)}
+        self._vocab, self._idf, self._matrix = vocab, idf, matrix
+        self._negative = np.array(
+            [any(word in (doc.meaning or "") for word in NEGATIVE_WORDS) for doc in docs], dtype=bool
+        )
+        self._availability = None
+        self.version += 1
+
+    # --- 점수 계산 ---
+
+    def query_vector(self, situation: str):
+        concept, label, expansion = detect_concept(situation)
+        counts = tokens(situation)
+        for term, n in tokens(expansion).items():
+            counts[term] += n
+        for color in detect_colors(situation):
+            counts[f"color:{color}"] += 2
+        vector = np.zeros(len(self._vocab), dtype=np.float32)
+        for term, n in counts.items():
+            column = self._vocab.get(term)
+            if column is not None:
+                vector[column] = (1 + math.log(n)) * self._idf[column]
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector), concept, label
+
+    def score_flowers(self, situation: str):
+        """(꽃별 점수 배열, 행 순서의 FlowerDoc 목록, concept, label)."""
+        with self._lock:
+            vector, concept, label = self.query_vector(situation)
+            scores = self._matrix @ vector
+            if not any(word in situation for word in NEGATIVE_WORDS):
+                scores = np.where(self._negative, scores * NEGATIVE_PENALTY, scores)
+            return scores, self._docs, concept, label
+
+    def availability(self, snapshot: inventory_snapshot.InventorySnapshot):
+        """(store_ids, 매장 x 꽃 bool 행렬). 재고 스냅샷 / 꽃 목록이 바뀔 때만 다시 만듦."""
+        key = (snapshot.version, self.version)
+        with self._lock:
+            if self._availability is None or self._availability[0] != key:
+                store_flowers = snapshot.store_flower_ids()
+                store_ids = sorted(store_flowers, key=str)
+                matrix = np.zeros((len(store_ids), len(self._docs)), dtype=bool)
+                for i, store_id in enumerate(store_ids):
+                    for flower_id in store_flowers[store_id]:
+                        row = self._row_of.get(flower_id)
+                        if row is not None:
+                            matrix[i, row] = True
+                self._availability = (key, store_ids, matrix)
+            return self._availability[1], self._availability[2]
+
+    def rank_stores(self, scores, snapshot, limit: int):
+        """[(store_id, 점수, 가용 꽃 행 번호 배열)] 상위 limit 개 (상위 BOUQUET_SIZE 종 점수 합 기준)."""
+        store_ids, available = self.availability(snapshot)
+        if not store_ids or not len(self._docs):
+            return []
+        variety = available.sum(axis=1)
+        masked = np.where(available, scores[None, :], -np.inf)
+        k = min(BOUQUET_SIZE, masked.shape[1])
+        top = -np.partition(-masked, k - 1, axis=1)[:, :k]
+        store_scores = np.where(np.isfinite(top), top, 0).sum(axis=1)
+        # 동점이면 꽃 종류가 많은 매장
+        store_scores = store_scores + variety * 1e-6
+        store_scores[variety < MIN_FLOWER_VARIETY] = -np.inf
+        order = np.argsort(-store_scores, kind="stable")[:limit]
+        return [
+            (store_ids[i], float(store_scores[i]), np.flatnonzero(available[i]))
+            for i in order if np.isfinite(store_scores[i])
+        ]
+
+    def candidates(self, situation: str, snapshot, store_limit: int, flower_limit: int) -> list:
+        """LLM 프롬프트 후보: 관련도 높은 매장 순 [(store_id, 그 매장 꽃 중 점수 상위 flower_limit 개 FlowerDoc)]."""
+        scores, docs, _, _ = self.score_flowers(situation)
+        return [
+            (store_id, [docs[row] for row in sorted(rows, key=lambda row: (-scores[row], row))[:flower_limit]])
+            for store_id, _, rows in self.rank_stores(scores, snapshot, store_limit)
+        ]
+
+    # --- 추천 결과 ---
+
+    def recommend(self, situation: str, snapshot) -> dict:
+        scores, docs, concept, label = self.score_flowers(situation)
+        ranked = self.rank_stores(scores, snapshot, 1)
+        if not ranked:
+            return None
+        store_id, _, rows = ranked[0]
+        store_data = snapshot.store_data(store_id)
+        if store_data is None:
+            return None
+
+        by_score = sorted(rows, key=lambda row: (-scores[row], row))
+        fillers = [row for row in by_score if docs[row].name in FILLER_NAMES]
+        main = by_score[0]
+        sub = next((row for row in by_score[1:] if row not in fillers), by_score[1])
+        filler = next((row for row in fillers if row not in (main, sub)), None)
+        if filler is None:
+            filler = next(row for row in by_score if row not in (main, sub))
+
+        flowers = [
+            {"role": "메인", "name": docs[main].name,
+             "reason": f"꽃말 '{docs[main].meaning or '아름다움'}' - {label} 꽃다발의 중심이 되어 줍니다."},
+            {"role": "서브", "name": docs[sub].name,
+             "reason": f"꽃말 '{docs[sub].meaning or '아름다움'}' - 메인 꽃의 의미를 한층 더해 줍니다."},
+            {"role": "소재", "name": docs[filler].name,
+             "reason": f"꽃말 '{docs[filler].meaning or '아름다움'}' - 꽃다발에 풍성함을 더해 줍니다."},
+        ]
+        colors = list(dict.fromkeys(
+            COLOR_NAMES_KO.get((docs[row].color or "").lower()) for row in (main, sub, filler)
+        ))
+        care_guide = list(dict.fromkeys(docs[row].care_guide for row in (main, sub, filler) if docs[row].care_guide))
+        care_guide = (care_guide + [tip for tip in GENERAL_CARE_GUIDE if tip not in care_guide])[:3]
+        letters = LETTERS.get(concept, LETTERS[None])
+
+        return {
+            "title": f"{label} {docs[main].name} 꽃다발",
+            "color_theme": " & ".join(c for c in colors if c) + " 톤" if any(colors) else "내추럴 톤",
+            "flowers": flowers,
+            # 같은 상황 문장이면 같은 편지 (crc32 는 실행마다 값이 같음)
+            "letter": letters[zlib.crc32(situation.encode()) % len(letters)],
+            "care_guide": care_guide,
+            "available_stores": [store_data],
+        }
+
+
+engine = LocalRecommender()
+
+
+def apply_flower(flower: models.Flower):
+    if engine.loaded_at is not None:
+        engine.apply(FlowerDoc(flower.flower_id, flower.name, flower.meaning, flower.color, flower.care_guide))
+
+
+async def recommend(db: AsyncSession, situation: str):
+    """로컬 추천 결과 (LLM 결과와 같은 모양). 후보 매장이 없으면 None."""
+    snapshot = await inventory_snapshot.snapshot.ensure_fresh(db)
+    await engine.ensure_fresh(db)
+    return engine.recommend(situation, snapshot)
+
+
+async def candidates(db: AsyncSession, situation: str, store_limit: int, flower_limit: int) -> list:
+    snapshot = await inventory_snapshot.snapshot.ensure_fresh(db)
+    await engine.ensure_fresh(db)
+    return engine.candidates(situation, snapshot, store_limit, flower_limit)
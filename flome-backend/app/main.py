@@ -1,24 +1,87 @@
-import json
-from datetime import datetime
-from fastapi import FastAPI, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+import os
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session, joinedload
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import UUID
+
+from .database import engine, async_engine, Base, SessionLocal, AsyncSessionLocal, get_async_db
+from . import models, schemas, metrics, pagination, ai_service, rating_service, order_service, wallet_service, recommend_cache, inventory_snapshot, request_metrics, dashboard_service, sales_service, serialization, read_models, geo_index, flower_search, local_recommender
+
+# 스키마는 alembic upgrade head 로 관리 (migrations/README). true 면 시작 시 create_all (마이그레이션 없이 띄우는 임시 개발용)
+DB_CREATE_ALL = os.getenv("DB_CREATE_ALL", "false").lower() == "true"
+# 근처 매장 검색 반경 (m)
+NEARBY_DEFAULT_RADIUS = 3_000
+NEARBY_MAX_RADIUS = 20_000
+# 첫 추천 요청이 LangChain import / LLM 클라이언트 생성 비용을 내지 않도록 시작 시 미리 준비
+LLM_WARMUP = os.getenv("LLM_WARMUP", "false").lower() == "true"
+# flome.* 로거 레벨 (slow_query 경고, 추천 프롬프트 크기/LLM 시간 등)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+
+def configure_logging():
+    """
+    flome.* 로거에 핸들러를 붙임. 설정하지 않으면 루트 기본값(WARNING)이라 INFO 진단 로그가 버려짐.
+    uvicorn 로거와는 따로 두어 uvicorn 로그 설정/중복 출력에 영향이 없도록 propagate 는 끔.
+    """
+    logger = logging.getLogger("flome")
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+
+
+def backfill_rating_summaries():
+    db = SessionLocal()
+    try:
+        count = rating_service.backfill_if_empty(db)
+        if count:
+            print(f"Backfilled rating summaries for {count} stores.")
+    finally:
+        db.close()
 
-from .database import engine, Base, SessionLocal
-from . import models, schemas, ai_service
 
-# Create tables on startup
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # import 시점이 아니라 서버 시작 시 1회 (reload/테스트 import 에 비용 없음)
+    configure_logging()
+    if DB_CREATE_ALL:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    # 집계 테이블 도입 전 리뷰 백필 (비어 있을 때만, 평소엔 LIMIT 1 조회 두 번)
+    await asyncio.to_thread(backfill_rating_summaries)
+    if LLM_WARMUP:
+        await asyncio.to_thread(ai_service.warmup)
+    # 추천용 재고 스냅샷 주기적 재로딩 (요청 경로 밖에서)
+    stop_refresher = asyncio.Event()
+    snapshot_refresher = asyncio.create_task(inventory_snapshot.snapshot.run_refresher(AsyncSessionLocal, stop_refresher))
+    yield
+    stop_refresher.set()
+    await snapshot_refresher
 
-app = FastAPI(title="FloMe Backend")
+
+app = FastAPI(title="FloMe Backend", lifespan=lifespan)
 
 # --- CORS 설정 ---
 origins = [
     "*"
 ]
 
+# 요청별 전체/DB/LLM 시간, 쿼리 수 -> /metrics + Server-Timing 헤더
+request_metrics.instrument_engine(engine, "sync")
+request_metrics.instrument_engine(async_engine.sync_engine, "async")
+app.add_middleware(request_metrics.RequestMetricsMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -41,6 +104,11 @@ def get_db():
 def read_root():
     return {"message": "Welcome to FloMe API"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    # Prometheus 텍스트 포맷 (DB pool 점유율/대기 시간, 요청별 DB/LLM 시간과 쿼리 수 등)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # --- Auth & Member ---
 
 @app.post("/signup", response_model=schemas.Member)
@@ -79,170 +147,127 @@ def read_me(member_id: str, db: Session = Depends(get_db)):
 
 # --- Store ---
 
-@app.get("/stores", response_model=List[schemas.Store])
-def read_stores(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    # Store -> Order -> Review 까지 로드
-    stores = db.query(models.Store).options(
-        joinedload(models.Store.products),
-        joinedload(models.Store.orders).joinedload(models.Order.review)
-    ).offset(skip).limit(limit).all()
-    
-    for store in stores:
-        # 해당 가게의 모든 주문 중 리뷰가 있는 것만 수집
-        reviews = [order.review for order in store.orders if order.review]
-        
-        store.review_count = len(reviews)
-        if reviews:
-            total_rating = sum(review.rating for review in reviews)
-            store.average_rating = round(total_rating / len(reviews), 1)
-        else:
-            store.average_rating = 0.0
-            
-    return stores
+@app.get("/stores", response_model=schemas.StorePage)
+async def read_stores(cursor: Optional[str] = None, limit: int = pagination.MAX_PAGE_SIZE, owner_id: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    # 리뷰 수/평점은 집계 테이블에서 읽음 (주문/리뷰 행은 로드하지 않음)
+    # store_id 기준 keyset 페이지네이션 (깊은 페이지도 OFFSET 스캔 없음)
+    limit = pagination.clamp_limit(limit)
+    stmt = select(
+        *serialization.STORE_COLUMNS,
+        models.StoreRatingSummary.review_count,
+        models.StoreRatingSummary.rating_sum
+    ).outerjoin(
+        models.StoreRatingSummary, models.StoreRatingSummary.store_id == models.Store.store_id
+    ).order_by(models.Store.store_id).limit(limit + 1)
+    if cursor:
+        (after_id,) = pagination.decode_cursor(cursor, UUID)
+        stmt = stmt.filter(models.Store.store_id > after_id)
+    if owner_id:
+        stmt = stmt.filter(models.Store.owner_id == owner_id)
+
+    rows, next_cursor = pagination.split_page((await db.execute(stmt)).all(), limit, lambda row: (row.store_id,))
+    # 상품은 페이지의 매장들 것만 한 번에 (joinedload 의 매장 x 상품 행 중복 없음)
+    product_rows = (await db.execute(
+        select(*serialization.PRODUCT_COLUMNS).filter(models.Product.store_id.in_([row.store_id for row in rows]))
+    )).all() if rows else []
+    # 컬럼 행에서 바로 응답 dict -> orjson (response_model 재검증 생략)
+    return serialization.page_response(serialization.store_dicts(rows, product_rows), next_cursor)
+
+@app.get("/stores/nearby", response_model=List[schemas.NearbyStore])
+async def read_nearby_stores(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(NEARBY_DEFAULT_RADIUS, gt=0, le=NEARBY_MAX_RADIUS),
+    limit: int = 20,
+    member_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    # /stores/{store_id} 보다 먼저 등록해야 "nearby" 가 store_id 로 잡히지 않음
+    if member_id is not None:
+        location_agree = (await db.execute(
+            select(models.Member.location_agree).filter(models.Member.member_id == member_id)
+        )).scalar_one_or_none()
+        if location_agree is None:
+            raise HTTPException(status_code=404, detail="Member not found")
+        if not location_agree:
+            raise HTTPException(status_code=403, detail="Location consent required")
+
+    # 메모리 격자 인덱스로 반경 내 후보만 거리 계산 (DB 는 주기적 재로딩 때만)
+    index = await geo_index.index.ensure_fresh(db)
+    return serialization.ORJSONResponse([
+        {**location._asdict(), "distance_m": round(distance)}
+        for distance, location in index.nearby(lat, lng, radius, pagination.clamp_limit(limit))
+    ])
 
 @app.get("/stores/{store_id}", response_model=schemas.StoreDetail)
 def read_store(store_id: str, db: Session = Depends(get_db)):
-    store = db.query(models.Store).options(joinedload(models.Store.products)).filter(models.Store.store_id == store_id).first()
-    if store is None:
+    row = db.query(
+        models.Store,
+        models.StoreRatingSummary.review_count,
+        models.StoreRatingSummary.rating_sum
+    ).outerjoin(
+        models.StoreRatingSummary, models.StoreRatingSummary.store_id == models.Store.store_id
+    ).options(joinedload(models.Store.products)).filter(models.Store.store_id == store_id).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Store not found")
-    return store
+    return rating_service.apply_summary(*row)
 
 @app.post("/stores", response_model=schemas.Store)
 def create_store(store: schemas.StoreCreate, db: Session = Depends(get_db)):
-    db_store = models.Store(**store.dict())
+    db_store = models.Store(**store.model_dump())
     db.add(db_store)
     db.commit()
     db.refresh(db_store)
+    inventory_snapshot.apply_store(db_store)
+    geo_index.apply_store(db_store)
     return db_store
 
 # --- Order ---
 
 @app.post("/orders", response_model=schemas.Order)
 def create_order(order_req: schemas.OrderCreate, db: Session = Depends(get_db)):
-    # 0. 주문 총액 계산 및 재고 확인/차감
-    total_amount = 0
-    items_to_process = []
-    
-    # Store stock information to update
-    stocks_to_update = {}
-
-    for item in order_req.items:
-        product = db.query(models.Product).filter(models.Product.product_id == item.product_id).first()
-        if not product:
-            raise HTTPException(status_code=404, detail=f"Product with ID {item.product_id} not found.") 
-
-        # Find stock for the product in the specified store
-        stock = db.query(models.Stock).filter(
-            models.Stock.store_id == order_req.store_id,
-            models.Stock.product_id == item.product_id
-        ).first()
-
-        # [시연용 치트키] 재고 없으면 자동 생성/충전
-        if not stock:
-            stock = models.Stock(
-                store_id=order_req.store_id,
-                product_id=item.product_id,
-                quantity=1000,
-                status=models.StockStatus.AVAILABLE
-            )
-            db.add(stock)
-            db.commit()
-            db.refresh(stock)
-        elif stock.quantity < item.quantity:
-            stock.quantity += 1000
-            db.add(stock)
-            db.commit()
-            db.refresh(stock)
-        
-        # Deduct stock temporarily and store for later update
-        stock.quantity -= item.quantity
-        stocks_to_update[stock.stock_id] = stock # Keep track of stocks to update
-
-        total_amount += product.price * item.quantity
-        items_to_process.append((product, item.quantity))
-
-    if total_amount == 0:
-        raise HTTPException(status_code=400, detail="No valid items in order.")
-
-    # Apply stock updates
-    for stock_id in stocks_to_update:
-        db.add(stocks_to_update[stock_id])
-    
-    # 1. 멤버 잔액 확인 및 차감
-    member = db.query(models.Member).filter(models.Member.member_id == order_req.member_id).first()
-    if not member:
-        raise HTTPException(status_code=404, detail="Member not found")
-    
-    if member.money < total_amount:
-        raise HTTPException(status_code=400, detail=f"Insufficient balance")
-    
-    member.money -= total_amount
-    db.add(member)
-
-    # 2. Order 생성
-    new_order = models.Order(
-        member_id=order_req.member_id,
-        store_id=order_req.store_id,
-        status=models.OrderStatus.PAID,
-        delivery_request=order_req.delivery_request # 요청사항 저장
-    )
-    db.add(new_order)
-    db.flush() 
-
-    # 3. OrderItem 생성
-    for product, qty in items_to_process:
-        order_item = models.OrderItem(
-            order_id=new_order.order_id,
-            product_id=product.product_id,
-            quantity=qty,
-            snapshot_price=product.price
-        )
-        db.add(order_item)
-
-    # 4. Payment 생성
-    payment = models.Payment(
-        order_id=new_order.order_id,
-        amount=total_amount,
-        method="CARD"
-    )
-    db.add(payment)
-
-    # 5. AIContent 생성 (if provided)
-    if order_req.user_prompt or order_req.letter_content or order_req.recipe or order_req.care_guide:
-        ai_content = models.AIContent(
-            order_id=new_order.order_id,
-            user_prompt=order_req.user_prompt,
-            letter_content=order_req.letter_content,
-            recipe=order_req.recipe,
-            care_guide=json.dumps(order_req.care_guide) if order_req.care_guide else None
-        )
-        db.add(ai_content)
-    
-    db.commit()
-    db.refresh(new_order)
-    
+    # 상품/재고 일괄 조회, 재고 행 잠금, 단일 commit 으로 처리 (order_service 참고)
+    new_order = order_service.place_order(db, order_req)
+    dashboard_service.invalidate(order_req.store_id)
     return new_order
 
-# 주문 내역 조회
-@app.get("/orders", response_model=List[schemas.Order])
-def read_orders(member_id: str, db: Session = Depends(get_db)):
-    orders = db.query(models.Order).options(
-            joinedload(models.Order.store),
-            joinedload(models.Order.items).joinedload(models.OrderItem.product)
-        ).filter(models.Order.member_id == member_id).order_by(models.Order.order_date.desc()).all()
-    return orders
+# 주문 내역 조회 ((order_date, order_id) 최신순 keyset 페이지네이션)
+ORDER_PAGE_SIZE = 20
+
+async def read_order_page(db: AsyncSession, condition, cursor: Optional[str], limit: int):
+    limit = pagination.clamp_limit(limit)
+    # 엔티티 대신 응답에 필요한 컬럼만 (store 는 JOIN, items.product 는 두 번째 쿼리)
+    stmt = select(*serialization.ORDER_COLUMNS).join(
+        models.Store, models.Store.store_id == models.Order.store_id
+    ).filter(condition).order_by(models.Order.order_date.desc(), models.Order.order_id.desc()).limit(limit + 1)
+    if cursor:
+        before_date, before_id = pagination.decode_cursor(cursor, datetime.fromisoformat, UUID)
+        stmt = stmt.filter(tuple_(models.Order.order_date, models.Order.order_id) < (before_date, before_id))
+
+    rows, next_cursor = pagination.split_page(
+        (await db.execute(stmt)).all(), limit, lambda row: (row.order_date, row.order_id)
+    )
+    item_rows = (await db.execute(
+        select(*serialization.ORDER_ITEM_COLUMNS).outerjoin(
+            models.Product, models.Product.product_id == models.OrderItem.product_id
+        ).filter(models.OrderItem.order_id.in_([row.order_id for row in rows]))
+    )).all() if rows else []
+    return serialization.page_response(serialization.order_dicts(rows, item_rows), next_cursor)
+
+@app.get("/orders", response_model=schemas.OrderPage)
+async def read_orders(member_id: str, cursor: Optional[str] = None, limit: int = ORDER_PAGE_SIZE, db: AsyncSession = Depends(get_async_db)):
+    return await read_order_page(db, models.Order.member_id == member_id, cursor, limit)
 
 # --- Owner Management APIs ---
 
-@app.get("/stores/{store_id}/stocks")
-def read_store_stocks(store_id: str, db: Session = Depends(get_db)):
-    stocks = db.query(models.Stock).options(joinedload(models.Stock.flower)).filter(models.Stock.store_id == store_id).all()
-    return stocks
+@app.get("/stores/{store_id}/stocks", response_model=List[schemas.Stock])
+def read_store_stocks(store_id: UUID, db: Session = Depends(get_db)):
+    # 엔티티 대신 필요한 컬럼만 (꽃은 이름/꽃말/색만, care_guide 제외)
+    return serialization.ORJSONResponse(read_models.store_stocks(db, store_id))
 
 @app.get("/stores/{store_id}/products", response_model=List[schemas.Product])
-def read_store_products(store_id: str, db: Session = Depends(get_db)):
-    products = db.query(models.Product).filter(models.Product.store_id == store_id).all()
-    return products
+def read_store_products(store_id: UUID, db: Session = Depends(get_db)):
+    return serialization.ORJSONResponse(read_models.store_products(db, store_id))
 
 @app.put("/stores/{store_id}", response_model=schemas.Store)
 def update_store(store_id: str, store_update: schemas.StoreBase, db: Session = Depends(get_db)):
@@ -251,17 +276,19 @@ def update_store(store_id: str, store_update: schemas.StoreBase, db: Session = D
         raise HTTPException(status_code=404, detail="Store not found")
     
     # StoreBase의 필드들을 업데이트
-    for field, value in store_update.dict(exclude_unset=True).items():
+    for field, value in store_update.model_dump(exclude_unset=True).items():
         setattr(store, field, value)
     
     db.commit()
     db.refresh(store)
+    inventory_snapshot.apply_store(store)
+    geo_index.apply_store(store)
     return store
 
 @app.post("/products", response_model=schemas.Product)
 def create_product(product: schemas.ProductCreate, db: Session = Depends(get_db)):
     # 1. 상품 생성
-    db_product = models.Product(**product.dict())
+    db_product = models.Product(**product.model_dump())
     db.add(db_product)
     db.commit()
     db.refresh(db_product)
@@ -275,22 +302,41 @@ def create_product(product: schemas.ProductCreate, db: Session = Depends(get_db)
     )
     db.add(initial_stock)
     db.commit()
+    inventory_snapshot.apply_product(db_product)
+    dashboard_service.invalidate(product.store_id)
 
     return db_product
 
 @app.get("/flowers", response_model=List[schemas.Flower])
-def read_flowers(db: Session = Depends(get_db)):
-    return db.query(models.Flower).all()
+def read_flowers(include_care_guide: bool = False, db: Session = Depends(get_db)):
+    # care_guide(Text) 는 요청할 때만 (입고 화면 자동완성은 이름만 사용)
+    return serialization.ORJSONResponse(read_models.flowers(db, include_care_guide))
+
+@app.get("/flowers/search", response_model=List[schemas.FlowerSearchResult])
+async def search_flowers(q: str, limit: int = 10, db: AsyncSession = Depends(get_async_db)):
+    # 재고 입력 / 채팅 자동완성: 자모 접두어, 초성, 꽃말/색상, 오타 허용 (메모리 인덱스, DB 는 주기적 재로딩 때만)
+    index = await flower_search.index.ensure_fresh(db)
+    return serialization.ORJSONResponse([
+        {**entry._asdict(), "score": round(score, 3)}
+        for score, entry in index.search(q, pagination.clamp_limit(limit))
+    ])
 
 @app.post("/stocks")
 def create_stock(stock_in: schemas.StockCreate, db: Session = Depends(get_db)):
     # 1. 꽃 찾기 또는 생성
-    flower = db.query(models.Flower).filter(models.Flower.name == stock_in.flower_name).first()
+    # 공백/대소문자만 다른 이름("빨간장미" / "빨간 장미")은 같은 꽃으로 (중복 꽃 생성 방지, 정확히 같은 이름 우선)
+    name = flower_search.clean_name(stock_in.flower_name)
+    flower = db.query(models.Flower).filter(
+        models.flower_name_key(models.Flower.name) == flower_search.normalize(name)
+    ).order_by((models.Flower.name == name).desc()).first()
     if not flower:
-        flower = models.Flower(name=stock_in.flower_name)
+        flower = models.Flower(name=name)
         db.add(flower)
         db.commit()
         db.refresh(flower)
+        inventory_snapshot.apply_flower(flower)
+        flower_search.apply_flower(flower)
+        local_recommender.apply_flower(flower)
     
     # 2. 재고 생성
     new_stock = models.Stock(
@@ -302,6 +348,8 @@ def create_stock(stock_in: schemas.StockCreate, db: Session = Depends(get_db)):
     db.add(new_stock)
     db.commit()
     db.refresh(new_stock)
+    inventory_snapshot.apply_stock(new_stock)
+    dashboard_service.invalidate(new_stock.store_id)
     return new_stock
 
 @app.put("/stocks/{stock_id}")
@@ -312,6 +360,8 @@ def update_stock(stock_id: str, stock_update: schemas.StockUpdate, db: Session =
     
     stock.quantity = stock_update.quantity
     db.commit()
+    inventory_snapshot.apply_stock(stock)
+    dashboard_service.invalidate(stock.store_id)
     return {"message": "Stock updated", "stock_id": stock_id}
 
 @app.delete("/stocks/{stock_id}")
@@ -320,37 +370,50 @@ def delete_stock(stock_id: str, db: Session = Depends(get_db)):
     if not stock:
         raise HTTPException(status_code=404, detail="Stock not found")
     
+    deleted_id, store_id = stock.stock_id, stock.store_id
     db.delete(stock)
     db.commit()
+    inventory_snapshot.remove_stock(deleted_id)
+    dashboard_service.invalidate(store_id)
     return {"message": "Stock deleted"}
 
-@app.get("/owner/orders", response_model=List[schemas.Order])
-def read_owner_orders(store_id: str, db: Session = Depends(get_db)):
-    orders = db.query(models.Order).options(
-        joinedload(models.Order.items).joinedload(models.OrderItem.product),
-        joinedload(models.Order.member)
-    ).filter(models.Order.store_id == store_id).order_by(models.Order.order_date.desc()).all()
-    return orders
+@app.get("/owner/orders", response_model=schemas.OrderPage)
+async def read_owner_orders(store_id: UUID, cursor: Optional[str] = None, limit: int = ORDER_PAGE_SIZE, db: AsyncSession = Depends(get_async_db)):
+    return await read_order_page(db, models.Order.store_id == store_id, cursor, limit)
+
+@app.get("/owner/stores/{store_id}/dashboard", response_model=schemas.OwnerDashboard)
+async def read_owner_dashboard(store_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    # 상태별 주문 수 / 일별 매출 / 재고 부족 / 별점 분포 / 최근 주문을 SQL 집계로 한 번에 (짧은 TTL 캐시)
+    return await dashboard_service.get_dashboard(db, store_id)
+
+@app.get("/owner/stores/{store_id}/sales", response_model=schemas.SalesReport)
+async def read_store_sales(store_id: UUID, start: Optional[date] = None, end: Optional[date] = None, db: AsyncSession = Depends(get_async_db)):
+    # 기간별 일 매출 (store_daily_sales 롤업에서 조회, 기본 최근 30일)
+    return await sales_service.daily_sales(db, store_id, start, end)
+
+@app.get("/owner/stores/{store_id}/sales/products", response_model=List[schemas.ProductSales])
+async def read_store_product_sales(store_id: UUID, start: Optional[date] = None, end: Optional[date] = None, db: AsyncSession = Depends(get_async_db)):
+    # 기간별 상품 판매 수량/금액 (매출 순)
+    return await sales_service.product_sales(db, store_id, start, end)
 
 @app.put("/orders/{order_id}/status")
 def update_order_status(order_id: str, status_update: schemas.OrderStatusUpdate, db: Session = Depends(get_db)):
     order = db.query(models.Order).filter(models.Order.order_id == order_id).first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    
-    order.status = status_update.status
+    store_id = order.store_id
+
+    # 취소 시 환불 + 일 매출 롤업 차감, 취소/픽업 완료된 주문은 되돌릴 수 없음 (409)
+    order_service.update_status(db, order.order_id, status_update.status)
     db.commit()
-    return {"message": "Order status updated", "new_status": order.status}
+    dashboard_service.invalidate(store_id)
+    return {"message": "Order status updated", "new_status": status_update.status}
 
 # --- Review APIs ---
 
 @app.get("/stores/{store_id}/reviews", response_model=List[schemas.Review])
-def read_store_reviews(store_id: str, db: Session = Depends(get_db)):
-    # Review -> Order -> Store 조인
-    reviews = db.query(models.Review).join(models.Order).filter(
-        models.Order.store_id == store_id
-    ).options(joinedload(models.Review.writer)).all()
-    return reviews
+async def read_store_reviews(store_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    return serialization.ORJSONResponse(await read_models.store_reviews(db, store_id))
 
 @app.post("/reviews", response_model=schemas.Review)
 def create_review(review: schemas.ReviewCreate, db: Session = Depends(get_db)):
@@ -364,17 +427,33 @@ def create_review(review: schemas.ReviewCreate, db: Session = Depends(get_db)):
     if existing_review:
         raise HTTPException(status_code=400, detail="Review already exists for this order")
 
-    db_review = models.Review(**review.dict())
+    db_review = models.Review(**review.model_dump())
     db.add(db_review)
+    # 매장 리뷰 집계 갱신 (같은 트랜잭션)
+    rating_service.record_review(db, order.store_id, review.rating)
+    store_id = order.store_id
     db.commit()
+    dashboard_service.invalidate(store_id)
     db.refresh(db_review)
     return db_review
 
 # app/main.py (일부분)
 
 @app.post("/api/recommend")
-def recommend_bouquet(situation: str, db: Session = Depends(get_db)):
+async def recommend_bouquet(situation: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    # 같은 상황(정규화) + 같은 재고 버전이면 캐시된 결과를 바로 스트리밍
+    # LLM 호출/DB 조회 모두 async -> 대기 중에 워커 스레드를 점유하지 않음
+    # 캐시 키에 들어갈 재고 버전이 최신이 되도록 스냅샷을 먼저 확인 (주기가 지났을 때만 DB 재로딩)
+    await inventory_snapshot.snapshot.ensure_fresh(db)
+
+    async def produce(is_abandoned):
+        # 같은 상황의 동시 요청이 생성 하나를 공유(single_flight) -> 요청 세션 대신 자체 세션 사용,
+        # 구독한 클라이언트가 모두 끊기면 is_abandoned() 로 LLM 호출 중단
+        async with AsyncSessionLocal() as session:
+            async for line in ai_service.generate_bouquet_recipe(session, situation, is_abandoned or request.is_disconnected):
+                yield line
+
     return StreamingResponse(
-        ai_service.generate_bouquet_recipe(db, situation), 
+        recommend_cache.stream_with_cache(situation, produce),
         media_type="application/x-ndjson"
     )
\ No newline at end of file
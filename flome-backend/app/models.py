@@ -1,6 +1,6 @@
 import uuid
 import enum
-from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, Text, DateTime, Enum as SAEnum
+from sqlalchemy import Column, String, Boolean, Integer, Float, ForeignKey, Text, Date, DateTime, Index, Enum as SAEnum, text, literal_column
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -49,6 +49,9 @@ class Member(Base):
 
 class Store(Base):
     __tablename__ = "stores"
+    __table_args__ = (
+        Index("ix_stores_owner_id", "owner_id"),
+    )
 
     store_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     owner_id = Column(String, ForeignKey("members.member_id"), nullable=False)
@@ -56,16 +59,71 @@ class Store(Base):
     address = Column(String, nullable=False)
     business_hours = Column(String, nullable=True)
     has_pickup_box = Column(Boolean, default=False)
+    # 위치 (WGS84). /stores/nearby 는 geo_index 의 메모리 격자 인덱스로 검색
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
 
     # Relationships
     owner = relationship("Member", back_populates="stores")
     products = relationship("Product", back_populates="store")
     stocks = relationship("Stock", back_populates="store")
     orders = relationship("Order", back_populates="store")
+    rating_summary = relationship("StoreRatingSummary", back_populates="store", uselist=False)
+
+
+# [추가] 매장별 리뷰 집계 테이블 (리뷰 작성 시 갱신, /stores 목록에서 사용)
+class StoreRatingSummary(Base):
+    __tablename__ = "store_rating_summaries"
+
+    store_id = Column(UUID(as_uuid=True), ForeignKey("stores.store_id"), primary_key=True)
+    review_count = Column(Integer, default=0, nullable=False)
+    rating_sum = Column(Integer, default=0, nullable=False)
+
+    # Relationships
+    store = relationship("Store", back_populates="rating_summary")
+
+
+# [추가] 매장별 일 매출 롤업 (주문 생성/취소 시 증분 갱신, sales_service 참고)
+# 취소된 주문은 order_count / gross_amount 에서 빠지고 canceled_count 로만 집계
+class StoreDailySales(Base):
+    __tablename__ = "store_daily_sales"
+
+    store_id = Column(UUID(as_uuid=True), ForeignKey("stores.store_id"), primary_key=True)
+    sales_date = Column(Date, primary_key=True)
+    order_count = Column(Integer, default=0, nullable=False)
+    gross_amount = Column(Integer, default=0, nullable=False)
+    units = Column(Integer, default=0, nullable=False)
+    canceled_count = Column(Integer, default=0, nullable=False)
+
+
+# [추가] 매장별 일/상품별 판매 수량 롤업
+class StoreDailyProductSales(Base):
+    __tablename__ = "store_daily_product_sales"
+
+    store_id = Column(UUID(as_uuid=True), ForeignKey("stores.store_id"), primary_key=True)
+    sales_date = Column(Date, primary_key=True)
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.product_id"), primary_key=True)
+    units = Column(Integer, default=0, nullable=False)
+    amount = Column(Integer, default=0, nullable=False)
+
+    # Relationships
+    product = relationship("Product")
+
+
+def flower_name_key(name):
+    """
+    lower(replace(name, ' ', '')) - flower_search.normalize 의 DB 쪽 식 (POST /stocks 꽃 이름 조회).
+    ix_flowers_name_key 를 타려면 식이 인덱스 정의와 글자 그대로 같아야 해서 상수는 바인딩하지 않고 SQL 에 그대로 넣음
+    """
+    return func.lower(func.replace(name, literal_column("' '"), literal_column("''")))
 
 
 class Flower(Base):
     __tablename__ = "flowers"
+    __table_args__ = (
+        Index("ix_flowers_name", "name"),
+        Index("ix_flowers_name_key", text("lower(replace(name, ' ', ''))")),
+    )
 
     flower_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
@@ -79,6 +137,9 @@ class Flower(Base):
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_store_id", "store_id"),
+    )
 
     product_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     store_id = Column(UUID(as_uuid=True), ForeignKey("stores.store_id"), nullable=False)
@@ -93,6 +154,21 @@ class Product(Base):
 
 class Stock(Base):
     __tablename__ = "stocks"
+    __table_args__ = (
+        Index("ix_stocks_store_id_product_id", "store_id", "product_id"),
+        # 상품 재고는 매장/상품당 1행 (동시 첫 주문의 자동 재고 생성이 중복 행을 만들지 않도록)
+        Index(
+            "ux_stocks_store_id_product_id", "store_id", "product_id", unique=True,
+            postgresql_where=text("product_id IS NOT NULL")
+        ),
+        Index("ix_stocks_product_id", "product_id"),
+        Index("ix_stocks_flower_id", "flower_id"),
+        # 추천 로직: 판매 가능한 재고만 매장별로 집계
+        Index(
+            "ix_stocks_available_store_id_flower_id", "store_id", "flower_id",
+            postgresql_where=text("quantity > 0 AND status = 'AVAILABLE'")
+        ),
+    )
 
     stock_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     store_id = Column(UUID(as_uuid=True), ForeignKey("stores.store_id"), nullable=False)
@@ -110,6 +186,11 @@ class Stock(Base):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # 주문 내역 keyset 페이지네이션 (order_date, order_id) 최신순
+        Index("ix_orders_member_id_order_date", "member_id", text("order_date DESC"), text("order_id DESC")),
+        Index("ix_orders_store_id_order_date", "store_id", text("order_date DESC"), text("order_id DESC")),
+    )
 
     order_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     member_id = Column(String, ForeignKey("members.member_id"), nullable=False)
@@ -133,6 +214,9 @@ class Order(Base):
 # [추가] 주문 상세 테이블 (어떤 상품을 몇 개 샀는지)
 class OrderItem(Base):
     __tablename__ = "order_items"
+    __table_args__ = (
+        Index("ix_order_items_order_id", "order_id"),
+    )
 
     item_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     order_id = Column(UUID(as_uuid=True), ForeignKey("orders.order_id"), nullable=False)
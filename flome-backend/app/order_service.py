@@ -0,0 +1,170 @@
+# app/order_service.py
+import os
+import json
+import uuid
+from datetime import datetime, timezone
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+
+from app import models, schemas, wallet_service, inventory_snapshot, sales_service
+
+# [시연용 치트키] 재고가 없거나 부족하면 자동 생성/충전 (운영/부하테스트에서는 false 로)
+AUTO_RESTOCK = os.getenv("ORDER_AUTO_RESTOCK", "true").lower() == "true"
+AUTO_RESTOCK_AMOUNT = 1000
+
+# 다른 상태로 되돌릴 수 없는 상태
+# (취소 -> PAID 를 허용하면 재결제 없이 되살아난 주문을 다시 취소해 두 번 환불받을 수 있음)
+FINAL_STATUSES = (models.OrderStatus.CANCELED, models.OrderStatus.PICKED_UP)
+
+
+def place_order(db: Session, order_req: schemas.OrderCreate) -> models.Order:
+    """
+    주문 1건을 단일 트랜잭션으로 처리합니다.
+    - 상품/재고는 요청 전체에 대해 IN (...) 쿼리 1번씩으로 조회
+    - 재고 행은 SELECT ... FOR UPDATE 로 잠근 뒤 차감 (동시 주문 시 초과 판매 방지)
+    - 상품은 주문 매장의 상품만 허용 (다른 매장 상품 -> 400)
+    - Order / OrderItem / Payment / AIContent 를 한 번에 INSERT 후 commit 1회
+    """
+    # 같은 상품이 여러 줄로 들어와도 재고는 합산해서 차감
+    requested = {}
+    for item in order_req.items:
+        requested[item.product_id] = requested.get(item.product_id, 0) + item.quantity
+
+    # 1. 상품 일괄 조회
+    products = {
+        p.product_id: p
+        for p in db.query(models.Product).filter(models.Product.product_id.in_(requested)).all()
+    }
+    for product_id in requested:
+        if product_id not in products:
+            raise HTTPException(status_code=404, detail=f"Product with ID {product_id} not found.")
+        if products[product_id].store_id != order_req.store_id:
+            raise HTTPException(status_code=400, detail=f"Product {product_id} does not belong to store {order_req.store_id}.")
+
+    total_amount = sum(products[item.product_id].price * item.quantity for item in order_req.items)
+    if total_amount == 0:
+        raise HTTPException(status_code=400, detail="No valid items in order.")
+
+    # 2. 재고 일괄 조회 + 행 잠금
+    locked = _lock_stocks(db, order_req.store_id, requested)
+    missing = [product_id for product_id in requested if product_id not in {s.product_id for s in locked}]
+    if missing:
+        if not AUTO_RESTOCK:
+            raise HTTPException(status_code=409, detail=f"Product {missing[0]} is out of stock.")
+        # 재고 행이 없는 상품: 동시에 들어온 첫 주문끼리 중복 행을 만들지 않도록
+        # ux_stocks_store_id_product_id 에 걸리면 건너뛰고 (상대 트랜잭션이 끝날 때까지 대기) 다시 잠가서 조회
+        stock_table = models.Stock.__table__
+        db.execute(insert(stock_table).values([
+            {"stock_id": uuid.uuid4(), "store_id": order_req.store_id, "product_id": product_id,
+             "quantity": AUTO_RESTOCK_AMOUNT, "status": models.StockStatus.AVAILABLE}
+            for product_id in missing
+        ]).on_conflict_do_nothing(
+            index_elements=[stock_table.c.store_id, stock_table.c.product_id],
+            index_where=stock_table.c.product_id.isnot(None),
+        ))
+        locked = _lock_stocks(db, order_req.store_id, requested)
+    stocks = {}
+    for stock in locked:
+        stocks.setdefault(stock.product_id, stock)
+
+    # 3. 재고 차감
+    for product_id, qty in requested.items():
+        stock = stocks[product_id]
+        if stock.quantity < qty:
+            if not AUTO_RESTOCK:
+                raise HTTPException(status_code=409, detail=f"Product {product_id} is out of stock.")
+            stock.quantity += AUTO_RESTOCK_AMOUNT
+        stock.quantity -= qty
+
+    # 4. 멤버 잔액 차감 (조건부 UPDATE 1회, 멤버 행은 세션에 올리지 않음)
+    if wallet_service.debit(db, order_req.member_id, total_amount) is None:
+        exists = db.query(models.Member.member_id).filter(models.Member.member_id == order_req.member_id).first()
+        if not exists:
+            raise HTTPException(status_code=404, detail="Member not found")
+        raise HTTPException(status_code=400, detail=f"Insufficient balance")
+
+    # 5. Order / OrderItem / Payment / AIContent 일괄 생성 (PK를 미리 만들어 중간 flush 없음)
+    order_id = uuid.uuid4()
+    # 일 매출 롤업과 같은 날짜가 되도록 주문 시각을 여기서 정함 (server_default 대신)
+    order_date = datetime.now(timezone.utc)
+    new_order = models.Order(
+        order_id=order_id,
+        order_date=order_date,
+        member_id=order_req.member_id,
+        store_id=order_req.store_id,
+        status=models.OrderStatus.PAID,
+        delivery_request=order_req.delivery_request # 요청사항 저장
+    )
+    rows = [new_order]
+    rows.extend(
+        models.OrderItem(
+            order_id=order_id,
+            product_id=item.product_id,
+            quantity=item.quantity,
+            snapshot_price=products[item.product_id].price
+        )
+        for item in order_req.items
+    )
+    rows.append(models.Payment(order_id=order_id, amount=total_amount, method="CARD"))
+
+    if order_req.user_prompt or order_req.letter_content or order_req.recipe or order_req.care_guide:
+        rows.append(models.AIContent(
+            order_id=order_id,
+            user_prompt=order_req.user_prompt,
+            letter_content=order_req.letter_content,
+            recipe=order_req.recipe,
+            care_guide=json.dumps(order_req.care_guide) if order_req.care_guide else None
+        ))
+
+    # 6. 매장 일 매출 롤업 (같은 트랜잭션)
+    sales_service.record_order(db, order_req.store_id, order_date, total_amount, [
+        (item.product_id, item.quantity, products[item.product_id].price) for item in order_req.items
+    ])
+
+    # 추천 스냅샷 반영용 값은 commit 으로 속성이 만료되기 전에 보관
+    touched = [(s.stock_id, s.store_id, s.flower_id, s.quantity, s.status) for s in locked]
+
+    db.add_all(rows)
+    db.commit()
+    for values in touched:
+        inventory_snapshot.snapshot.apply_stock(*values)
+    db.refresh(new_order)
+    return new_order
+
+
+def _lock_stocks(db: Session, store_id, product_ids) -> list:
+    """주문 매장의 상품 재고 행을 잠가서 조회 (stock_id 순으로 잠가 교착 상태 방지)."""
+    return db.query(models.Stock).filter(
+        models.Stock.store_id == store_id,
+        models.Stock.product_id.in_(product_ids)
+    ).order_by(models.Stock.stock_id).with_for_update().all()
+
+
+def update_status(db: Session, order_id, status: models.OrderStatus) -> bool:
+    """
+    주문 상태를 바꿉니다. 실제로 바뀌었으면 True, 이미 같은 상태면 False. (commit 은 호출하는 쪽에서)
+    - CANCELED: 결제 금액 환불 + 일 매출 롤업 차감 (같은 트랜잭션)
+    - CANCELED / PICKED_UP 에서 다른 상태로 -> 409
+    상태 확인과 변경이 조건부 UPDATE 한 문장이라 동시 요청에서도 환불/롤업 차감은 한 번만 일어납니다.
+    """
+    if status == models.OrderStatus.CANCELED:
+        changed = wallet_service.refund_order(db, order_id) is not None
+        if changed:
+            sales_service.record_cancel(db, order_id)
+    else:
+        stmt = (
+            update(models.Order)
+            .where(models.Order.order_id == order_id, models.Order.status.notin_(FINAL_STATUSES))
+            .values(status=status)
+            .returning(models.Order.order_id)
+            .execution_options(synchronize_session=False)
+        )
+        changed = db.execute(stmt).scalar() is not None
+
+    if not changed:
+        current = db.query(models.Order.status).filter(models.Order.order_id == order_id).scalar()
+        if current != status:
+            raise HTTPException(status_code=409, detail=f"Order is already {current.value}; status cannot be changed")
+    return changed
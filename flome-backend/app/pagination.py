@@ -0,0 +1,40 @@
+# app/pagination.py
+import json
+import base64
+from fastapi import HTTPException
+
+# 한 페이지 최대 크기 (클라이언트가 limit 를 크게 줘도 이 값으로 제한)
+MAX_PAGE_SIZE = 100
+
+
+def clamp_limit(limit: int) -> int:
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def encode_cursor(*values) -> str:
+    """정렬 키 값들을 클라이언트에게는 불투명한 문자열로 인코딩합니다."""
+    raw = json.dumps([str(v) for v in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *converters) -> list:
+    """encode_cursor 의 역변환. converters 로 각 값을 원래 타입(datetime, UUID 등)으로 되돌립니다."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(converters):
+            raise ValueError("cursor size mismatch")
+        # encode_cursor 는 항상 문자열만 담음 ([1, 2] 같은 값은 converter 에서 TypeError -> 500 이 되므로 미리 거름)
+        if not all(isinstance(value, str) for value in values):
+            raise ValueError("cursor value type mismatch")
+        return [convert(value) for convert, value in zip(converters, values)]
+    except (ValueError, TypeError, AttributeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def split_page(rows: list, limit: int, cursor_of):
+    """limit + 1 개를 조회한 결과에서 (현재 페이지, next_cursor) 를 만듭니다."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*cursor_of(rows[-1]))
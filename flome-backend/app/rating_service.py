@@ -0,0 +1,92 @@
+# app/rating_service.py
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+
+from app import models
+
+
+def record_review(db: Session, store_id, rating: int):
+    """
+    리뷰 1건을 매장 집계에 반영합니다. (commit은 호출하는 쪽에서)
+    동시에 첫 리뷰가 들어와도 안전하도록 INSERT ... ON CONFLICT 로 누적합니다.
+    """
+    summary = models.StoreRatingSummary.__table__
+    stmt = insert(summary).values(store_id=store_id, review_count=1, rating_sum=rating)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[summary.c.store_id],
+        set_={
+            "review_count": summary.c.review_count + 1,
+            "rating_sum": summary.c.rating_sum + rating,
+        },
+    )
+    db.execute(stmt)
+
+
+def average_rating(review_count, rating_sum) -> float:
+    if not review_count:
+        return 0.0
+    return round(rating_sum / review_count, 1)
+
+
+def apply_summary(store, review_count, rating_sum):
+    """응답 스키마(review_count, average_rating)에 맞게 Store 객체에 값을 채웁니다."""
+    store.review_count = review_count or 0
+    store.average_rating = average_rating(review_count, rating_sum)
+    return store
+
+
+def rebuild_rating_summaries(db: Session):
+    """
+    reviews 테이블 전체로부터 집계를 다시 계산합니다.
+    (집계 테이블 도입 이전 데이터 백필 / 불일치 복구용)
+    """
+    rows = db.query(
+        models.Order.store_id,
+        func.count(models.Review.review_id),
+        func.coalesce(func.sum(models.Review.rating), 0)
+    ).join(models.Review, models.Review.order_id == models.Order.order_id).group_by(models.Order.store_id).all()
+
+    db.query(models.StoreRatingSummary).delete()
+    db.add_all([
+        models.StoreRatingSummary(store_id=store_id, review_count=count, rating_sum=total)
+        for store_id, count, total in rows
+    ])
+    db.commit()
+    return len(rows)
+
+
+def backfill_if_empty(db: Session) -> int:
+    """
+    집계 테이블이 비어 있고 리뷰가 있으면 reviews 로 채웁니다. (서버 시작 시 lifespan 에서 호출)
+    create_all 로 기존 DB 에 테이블만 새로 생긴 경우에도 0건/0.0점으로 보이지 않도록.
+    여러 워커가 동시에 실행해도 ON CONFLICT DO NOTHING 이라 안전합니다.
+    """
+    if db.query(models.StoreRatingSummary.store_id).first() is not None:
+        return 0
+    if db.query(models.Review.review_id).first() is None:
+        return 0
+
+    summary = models.StoreRatingSummary.__table__
+    stmt = insert(summary).from_select(
+        ["store_id", "review_count", "rating_sum"],
+        select(
+            models.Order.store_id,
+            func.count(models.Review.review_id),
+            func.coalesce(func.sum(models.Review.rating), 0)
+        ).join(models.Review, models.Review.order_id == models.Order.order_id).group_by(models.Order.store_id)
+    ).on_conflict_do_nothing(index_elements=[summary.c.store_id])
+    count = db.execute(stmt).rowcount
+    db.commit()
+    return count
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal, engine
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print(f"Rebuilt rating summaries for {rebuild_rating_summaries(db)} stores.")
+    finally:
+        db.close()
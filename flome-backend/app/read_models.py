@@ -0,0 +1,123 @@
+# app/read_models.py
+"""
+조회 전용 read-model: 응답에 필요한 컬럼만 SELECT 해서 __slots__ dataclass 로 담습니다.
+
+ORM 엔티티 로딩(identity map 등록, 변경 추적 상태, 관계 객체)을 거치지 않으므로
+행당 메모리와 CPU 가 적고, 결과는 serialization.ORJSONResponse 로 바로 직렬화됩니다.
+(orjson 은 dataclass / UUID / datetime / Enum 을 직접 직렬화)
+
+필드 이름은 schemas 의 응답 모델과 같게 유지합니다.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+
+
+@dataclass(slots=True)
+class FlowerRow:
+    flower_id: UUID
+    name: str
+    meaning: Optional[str]
+    color: Optional[str]
+
+
+@dataclass(slots=True)
+class FlowerDetailRow(FlowerRow):
+    care_guide: Optional[str]
+
+
+@dataclass(slots=True)
+class StockRow:
+    stock_id: UUID
+    store_id: UUID
+    flower_id: Optional[UUID]
+    product_id: Optional[UUID]
+    quantity: int
+    stocking_date: Optional[datetime]
+    status: models.StockStatus
+    flower: Optional[FlowerRow]
+
+
+@dataclass(slots=True)
+class ProductRow:
+    product_id: UUID
+    store_id: UUID
+    name: str
+    price: int
+    type: models.ProductType
+
+
+@dataclass(slots=True)
+class ReviewRow:
+    review_id: UUID
+    writer_id: str
+    rating: int
+    content: Optional[str]
+    created_at: datetime
+
+
+# --- 쿼리 (컬럼 순서 = dataclass 필드 순서) ---
+
+FLOWER_COLUMNS = (models.Flower.flower_id, models.Flower.name, models.Flower.meaning, models.Flower.color)
+
+
+def flowers_query(include_care_guide: bool = False):
+    columns = FLOWER_COLUMNS + ((models.Flower.care_guide,) if include_care_guide else ())
+    return select(*columns).order_by(models.Flower.name)
+
+
+def stocks_query(store_id):
+    Stock = models.Stock
+    # 재고 화면은 꽃 이름만 쓰므로 care_guide(Text) 는 가져오지 않음
+    return select(
+        Stock.stock_id, Stock.store_id, Stock.flower_id, Stock.product_id,
+        Stock.quantity, Stock.stocking_date, Stock.status,
+        *FLOWER_COLUMNS[1:],
+    ).outerjoin(models.Flower, models.Flower.flower_id == Stock.flower_id).filter(Stock.store_id == store_id)
+
+
+def products_query(store_id):
+    Product = models.Product
+    return select(Product.product_id, Product.store_id, Product.name, Product.price, Product.type).filter(
+        Product.store_id == store_id
+    )
+
+
+def reviews_query(store_id):
+    Review = models.Review
+    # Review -> Order 조인 (최신순)
+    return select(Review.review_id, Review.writer_id, Review.rating, Review.content, Review.created_at).join(
+        models.Order, models.Order.order_id == Review.order_id
+    ).filter(models.Order.store_id == store_id).order_by(Review.created_at.desc())
+
+
+# --- 행 -> read-model ---
+
+def stock_from_row(row) -> StockRow:
+    stock_id, store_id, flower_id, product_id, quantity, stocking_date, status, name, meaning, color = row
+    flower = FlowerRow(flower_id, name, meaning, color) if flower_id is not None else None
+    return StockRow(stock_id, store_id, flower_id, product_id, quantity, stocking_date, status, flower)
+
+
+def flowers(db: Session, include_care_guide: bool = False) -> list:
+    row_type = FlowerDetailRow if include_care_guide else FlowerRow
+    return [row_type(*row) for row in db.execute(flowers_query(include_care_guide))]
+
+
+def store_stocks(db: Session, store_id) -> list:
+    return [stock_from_row(row) for row in db.execute(stocks_query(store_id))]
+
+
+def store_products(db: Session, store_id) -> list:
+    return [ProductRow(*row) for row in db.execute(products_query(store_id))]
+
+
+async def store_reviews(db: AsyncSession, store_id) -> list:
+    return [ReviewRow(*row) for row in await db.execute(reviews_query(store_id))]
@@ -0,0 +1,115 @@
+# app/recommend_cache.py
+import os
+import json
+import time
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import orjson
+
+from app import metrics, inventory_snapshot, single_flight
+
+# /api/recommend 결과 캐시 설정 (워커 프로세스마다 따로 가짐)
+CACHE_TTL = float(os.getenv("RECOMMEND_CACHE_TTL", "600"))
+CACHE_SIZE = int(os.getenv("RECOMMEND_CACHE_SIZE", "1024"))
+
+CACHE_REQUESTS = metrics.Counter(
+    "recommend_cache_requests_total", "Recommendation cache lookups", ["result"]
+)
+
+
+class TTLCache:
+    """만료 시간이 있는 LRU 캐시. 가득 차면 가장 오래 안 쓴 항목부터 버립니다."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_cache = TTLCache(CACHE_SIZE, CACHE_TTL)
+
+def inventory_version() -> int:
+    """재고 스냅샷 버전. 캐시 키에 포함되어 재고가 바뀌면 이전 결과는 자동으로 무효화됨"""
+    return inventory_snapshot.snapshot.version
+
+
+def normalize_situation(situation: str) -> str:
+    """'생일 ', '생일!!', '생 일' 이 같은 키가 되도록 공백/문장부호를 제거하고 소문자로 맞춥니다."""
+    text = unicodedata.normalize("NFKC", situation).lower()
+    return "".join(ch for ch in text if not ch.isspace() and not unicodedata.category(ch).startswith("P"))
+
+
+def make_key(situation: str):
+    return (normalize_situation(situation), inventory_version())
+
+
+def result_event(line: str):
+    """NDJSON 한 줄이 결과 이벤트면 dict, 아니면 None. (문자열 검사 대신 파싱 -> 직렬화 공백이나 사용자 텍스트에 좌우되지 않음)"""
+    try:
+        event = orjson.loads(line)
+    except orjson.JSONDecodeError:
+        return None
+    if isinstance(event, dict) and event.get("type") == "result":
+        return event
+    return None
+
+
+async def stream_with_cache(situation: str, produce):
+    """
+    캐시에 있으면 결과 한 줄을 바로 내려주고, 없으면 produce(is_abandoned) 의 NDJSON 스트림을 흘려보내며
+    AI 가 만든 결과(source == "ai")만 캐시에 저장합니다. (Fallback 결과는 저장하지 않음)
+    같은 키로 동시에 들어온 요청은 single_flight 로 생성 하나를 함께 받습니다.
+    """
+    key = make_key(situation)
+    cached = _cache.get(key)
+    if cached is not None:
+        CACHE_REQUESTS.inc(result="hit")
+        yield cached
+        return
+
+    CACHE_REQUESTS.inc(result="miss")
+
+    async def produce_and_cache(is_abandoned):
+        # 생성 쪽에서 한 번만 저장 (구독자 수와 상관없이)
+        async for line in produce(is_abandoned):
+            yield line
+            event = result_event(line)
+            if event is not None and event.get("source") == "ai":
+                event["source"] = "cache"
+                _cache.set(key, json.dumps(event) + "\n")
+
+    async for line in single_flight.stream(key, produce_and_cache):
+        yield line
@@ -0,0 +1,96 @@
+# app/recommend_prompt.py
+"""
+추천 LLM 프롬프트의 후보 매장/꽃 선별 (프롬프트 크기 줄이기).
+
+- 기존: 꽃 종류가 많은 상위 5개 매장의 전체 재고(이름 + 꽃말)를 상황과 상관없이 넣음
+- 변경: local_recommender 점수로 상황과 관련 있는 꽃을 가진 매장을 고르고,
+  매장마다 관련도 상위 PROMPT_FLOWERS_PER_STORE 종만 넣음
+- 인벤토리 부분은 PROMPT_INVENTORY_TOKENS 예산 안에서 매장 단위로 채움 (첫 매장은 항상 포함)
+- 요청마다 프롬프트 토큰 수(추정)와 LLM 시간을 모드별로 기록 -> /metrics 에서 전후 비교
+  (히스토그램이 기본 기록, 요청별 INFO 로그는 flome.recommend_prompt 로거 - main.configure_logging)
+
+RECOMMEND_PROMPT_PREFILTER=0 이면 기존 방식(inventory_snapshot.inventory_text) 그대로 보냄.
+"""
+import os
+import time
+import logging
+from contextlib import contextmanager
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import metrics, inventory_snapshot, local_recommender
+
+PREFILTER = os.getenv("RECOMMEND_PROMPT_PREFILTER", "1") != "0"
+PROMPT_STORE_COUNT = int(os.getenv("PROMPT_STORE_COUNT", str(inventory_snapshot.TOP_STORE_COUNT)))
+PROMPT_FLOWERS_PER_STORE = int(os.getenv("PROMPT_FLOWERS_PER_STORE", "8"))
+PROMPT_INVENTORY_TOKENS = int(os.getenv("PROMPT_INVENTORY_TOKENS", "500"))
+
+MODE = "prefilter" if PREFILTER else "full"
+
+logger = logging.getLogger("flome.recommend_prompt")
+
+PROMPT_TOKENS = metrics.Histogram(
+    "recommend_prompt_tokens", "Estimated LLM prompt tokens per recommendation", ["mode"],
+    buckets=(100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000),
+)
+PROMPT_STORES = metrics.Histogram(
+    "recommend_prompt_stores", "Candidate stores in the LLM prompt", ["mode"],
+    buckets=(1, 2, 3, 4, 5, 10),
+)
+LLM_SECONDS = metrics.Histogram(
+    "recommend_llm_seconds", "LLM call time per recommendation", ["mode"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 쓰는 근사치: 한글 등 비 ASCII 문자는 1자 ~ 1토큰, ASCII 는 4자 ~ 1토큰.
+    (절대값보다 같은 기준으로 전후를 비교하는 용도)
+    """
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii + 3) // 4
+
+
+def store_line(store_id, store_name: str, flowers) -> str:
+    # 같은 이름/꽃말 중복 제거 (순서 유지)
+    names = list(dict.fromkeys(f"{f.name}(꽃말:{f.meaning or '없음'})" for f in flowers))
+    return f"- 매장ID [{store_id}] ({store_name}): {', '.join(names)}\n"
+
+
+async def inventory_text(db: AsyncSession, situation: str, snapshot) -> str:
+    """프롬프트의 [후보 매장 및 보유 꽃 목록] 부분. 후보 매장이 없으면 빈 문자열."""
+    if not PREFILTER:
+        return snapshot.inventory_text()
+
+    candidates = await local_recommender.candidates(db, situation, PROMPT_STORE_COUNT, PROMPT_FLOWERS_PER_STORE)
+    lines, used = [], 0
+    for store_id, flowers in candidates:
+        store_data = snapshot.store_data(store_id)
+        if store_data is None:
+            continue
+        line = store_line(store_id, store_data["name"], flowers)
+        if used + estimate_tokens(line) > PROMPT_INVENTORY_TOKENS:
+            if lines:
+                break
+            # 예산이 아주 작아도 첫 매장은 최소 종류 수만큼은 넣음
+            line = store_line(store_id, store_data["name"], flowers[:inventory_snapshot.MIN_FLOWER_VARIETY])
+        lines.append(line)
+        used += estimate_tokens(line)
+    return "".join(lines)
+
+
+@contextmanager
+def measure(prompt: str, inventory: str):
+    """프롬프트 크기 기록 + with 블록(LLM 호출) 시간을 모드별로 기록."""
+    tokens = estimate_tokens(prompt)
+    stores = inventory.count("\n")
+    PROMPT_TOKENS.observe(tokens, mode=MODE)
+    PROMPT_STORES.observe(stores, mode=MODE)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        LLM_SECONDS.observe(elapsed, mode=MODE)
+        logger.info("recommend prompt mode=%s stores=%d tokens~%d llm=%.0fms", MODE, stores, tokens, elapsed * 1000)
@@ -0,0 +1,212 @@
+# app/request_metrics.py
+"""
+요청 단위 계측: 전체 시간 / DB 시간 / 쿼리 수 / 반환 행 수 / LLM 시간.
+
+- SQLAlchemy cursor 이벤트로 쿼리마다 시간과 행 수를 현재 요청(ContextVar)에 누적
+- ASGI 미들웨어가 요청이 끝나면 라우트별 Prometheus 히스토그램에 기록하고
+  응답 헤더에 Server-Timing 을 붙임 (브라우저 개발자 도구 Timing 탭에서 확인 가능)
+- SLOW_QUERY_MS 를 넘는 쿼리는 flome.slow_query 로거로 경고
+
+N+1 이 있는 엔드포인트는 /metrics 의 http_request_queries 분포로 바로 드러납니다.
+
+요청과 분리된 Task(single_flight 의 추천 생성)는 create_task 가 시작한 요청의 컨텍스트를 복사하므로
+그대로 두면 모든 DB/LLM 시간이 시작한 요청 하나에만 쌓임 -> Task 안에서 bind(shared_stats()) 로 따로 모으고,
+기다린 요청마다 charge() 로 자기가 붙어 있던 동안 쌓인 만큼을 가져감 (합쳐진 요청 모두 같은 LLM 시간이 보임).
+"""
+import os
+import time
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from app import metrics
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+logger = logging.getLogger("flome.slow_query")
+
+REQUEST_DURATION = metrics.Histogram(
+    "http_request_duration_seconds", "Request wall time", ["method", "route", "status"]
+)
+REQUEST_DB_TIME = metrics.Histogram(
+    "http_request_db_seconds", "Time spent in SQL per request", ["method", "route"]
+)
+REQUEST_QUERIES = metrics.Histogram(
+    "http_request_queries", "SQL statements per request", ["method", "route"],
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 200),
+)
+REQUEST_ROWS = metrics.Histogram(
+    "http_request_rows", "Rows returned or affected by SQL per request", ["method", "route"],
+    buckets=(1, 10, 100, 1000, 10000, 100000),
+)
+REQUEST_LLM_TIME = metrics.Histogram(
+    "http_request_llm_seconds", "Time spent waiting on the LLM per request", ["method", "route"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+SLOW_QUERIES = metrics.Counter(
+    "db_slow_queries_total", "SQL statements slower than SLOW_QUERY_MS", ["engine"]
+)
+
+
+class RequestStats:
+    __slots__ = ("scope", "started", "db_seconds", "queries", "rows", "llm_seconds")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.started = time.perf_counter()
+        self.db_seconds = 0.0
+        self.queries = 0
+        self.rows = 0
+        self.llm_seconds = 0.0
+
+    def totals(self) -> tuple:
+        return self.db_seconds, self.queries, self.rows, self.llm_seconds
+
+    def server_timing(self) -> str:
+        total = (time.perf_counter() - self.started) * 1000
+        parts = [
+            f"total;dur={total:.1f}",
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries, {self.rows} rows"',
+        ]
+        if self.llm_seconds:
+            parts.append(f"llm;dur={self.llm_seconds * 1000:.1f}")
+        return ", ".join(parts)
+
+
+# sync 엔드포인트는 threadpool 에서 돌지만 컨텍스트가 복사되므로 같은 RequestStats 객체에 누적됨
+_current: ContextVar = ContextVar("request_stats", default=None)
+
+
+def current():
+    return _current.get()
+
+
+def shared_stats():
+    """여러 요청이 함께 기다리는 작업용 RequestStats (느린 쿼리 로그의 route 는 시작한 요청 것)."""
+    parent = _current.get()
+    return RequestStats(parent.scope if parent is not None else {})
+
+
+def bind(stats):
+    """현재 컨텍스트(= 분리된 Task 안)의 계측 대상을 stats 로 바꿈."""
+    _current.set(stats)
+
+
+def charge(shared, since: tuple):
+    """shared 에 since(shared.totals() 값) 이후 쌓인 DB/LLM 시간을 현재 요청에 더함."""
+    stats = _current.get()
+    if stats is None:
+        return
+    db_seconds, queries, rows, llm_seconds = (now - before for now, before in zip(shared.totals(), since))
+    stats.db_seconds += db_seconds
+    stats.queries += queries
+    stats.rows += rows
+    stats.llm_seconds += llm_seconds
+
+
+# --- SQLAlchemy 이벤트 ---
+
+def instrument_engine(engine, label: str):
+    """engine 은 sync Engine (AsyncEngine 이면 .sync_engine 을 넘김)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        rows = row_count(cursor)
+
+        stats = _current.get()
+        if stats is not None:
+            stats.db_seconds += elapsed
+            stats.queries += 1
+            stats.rows += rows
+
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            SLOW_QUERIES.inc(engine=label)
+            route = route_of(stats.scope) if stats is not None else "-"
+            logger.warning(
+                "slow query %.1fms engine=%s route=%s rows=%d: %s",
+                elapsed * 1000, label, route, rows, " ".join(statement.split())[:500]
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        # 실패한 쿼리는 after_cursor_execute 가 불리지 않으므로 시작 시각만 정리
+        if context.connection is not None and context.connection.info.get("query_started"):
+            context.connection.info["query_started"].pop()
+
+
+def row_count(cursor) -> int:
+    """SELECT 는 반환 행 수, DML 은 영향받은 행 수."""
+    rowcount = getattr(cursor, "rowcount", -1)
+    if rowcount is None or rowcount < 0:
+        # async 드라이버 어댑터(asyncpg/aiosqlite)는 SELECT 결과를 미리 받아 _rows 에 담아두고 rowcount 는 -1
+        rows = getattr(cursor, "_rows", None)
+        return len(rows) if rows is not None else 0
+    return rowcount
+
+
+# --- LLM 시간 ---
+
+@contextmanager
+def llm_timer():
+    """with 블록 안의 시간을 현재 요청의 LLM 시간에 더합니다. (async generator 안에서도 사용 가능)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _current.get()
+        if stats is not None:
+            stats.llm_seconds += time.perf_counter() - started
+
+
+# --- ASGI 미들웨어 ---
+
+class RequestMetricsMiddleware:
+    """
+    StreamingResponse(/api/recommend) 도 본문 전송이 끝난 뒤에 기록하기 위해 순수 ASGI 로 구현.
+    Server-Timing 헤더는 응답 시작 시점 값이므로 스트리밍 응답에서는 본문 생성 전까지의 시간만 담김.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats(scope)
+        token = _current.set(stats)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            method, route = scope["method"], route_of(scope)
+            REQUEST_DURATION.observe(time.perf_counter() - stats.started, method=method, route=route, status=status)
+            REQUEST_DB_TIME.observe(stats.db_seconds, method=method, route=route)
+            REQUEST_QUERIES.observe(stats.queries, method=method, route=route)
+            REQUEST_ROWS.observe(stats.rows, method=method, route=route)
+            if stats.llm_seconds:
+                REQUEST_LLM_TIME.observe(stats.llm_seconds, method=method, route=route)
+
+
+def route_of(scope) -> str:
+    # 실제 경로 대신 라우트 템플릿(/stores/{store_id})을 라벨로 사용 -> 라벨 수 폭증 방지
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
@@ -0,0 +1,216 @@
+# app/sales_service.py
+import os
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException
+from sqlalchemy import func, case, delete, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+
+from app import models
+
+# 일 매출을 나누는 기준 시간대 (이 시간대의 자정 기준)
+SALES_TIMEZONE = ZoneInfo(os.getenv("SALES_TIMEZONE", "Asia/Seoul"))
+DEFAULT_RANGE_DAYS = 30
+MAX_RANGE_DAYS = 366
+
+
+def sales_date(order_date: datetime) -> date:
+    if order_date.tzinfo is None:
+        order_date = order_date.replace(tzinfo=timezone.utc)
+    return order_date.astimezone(SALES_TIMEZONE).date()
+
+
+def today() -> date:
+    return datetime.now(SALES_TIMEZONE).date()
+
+
+def _accumulate(db: Session, model, key_columns, rows):
+    """rows 를 PK 기준으로 INSERT ... ON CONFLICT 누적 (key_columns 외의 값은 더해짐)."""
+    if not rows:
+        return
+    table = model.__table__
+    stmt = insert(table).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c[k] for k in key_columns],
+        set_={k: table.c[k] + stmt.excluded[k] for k in rows[0] if k not in key_columns},
+    )
+    db.execute(stmt)
+
+
+def _apply(db: Session, store_id, day: date, amount: int, items, sign: int):
+    """items: [(product_id, quantity, snapshot_price)] / sign: 주문 +1, 취소 -1"""
+    by_product = {}
+    for product_id, quantity, price in items:
+        units, total = by_product.get(product_id, (0, 0))
+        by_product[product_id] = (units + quantity, total + quantity * price)
+
+    _accumulate(db, models.StoreDailySales, ("store_id", "sales_date"), [{
+        "store_id": store_id,
+        "sales_date": day,
+        "order_count": sign,
+        "gross_amount": sign * amount,
+        "units": sign * sum(units for units, _ in by_product.values()),
+        "canceled_count": 1 if sign < 0 else 0,
+    }])
+    # 한 문장 안에서 같은 PK 가 두 번 나오면 ON CONFLICT 가 실패하므로 상품별로 미리 합쳐서 보냄
+    _accumulate(db, models.StoreDailyProductSales, ("store_id", "sales_date", "product_id"), [
+        {"store_id": store_id, "sales_date": day, "product_id": product_id,
+         "units": sign * units, "amount": sign * total}
+        for product_id, (units, total) in by_product.items()
+    ])
+
+
+def record_order(db: Session, store_id, order_date: datetime, amount: int, items):
+    """주문 1건을 롤업에 반영합니다. (commit 은 호출하는 쪽에서, 주문 INSERT 와 같은 트랜잭션)"""
+    _apply(db, store_id, sales_date(order_date), amount, items, 1)
+
+
+def record_cancel(db: Session, order_id):
+    """
+    취소된 주문 1건을 롤업에서 빼고 canceled_count 를 올립니다.
+    wallet_service.refund_order 로 실제로 취소된 경우에만 호출 (중복 취소 시 두 번 빠지지 않도록).
+    취소된 주문은 다시 활성 상태로 돌아갈 수 없으므로 (order_service.update_status) 되돌리는 +1 경로는 없습니다.
+    """
+    store_id, order_date = db.query(models.Order.store_id, models.Order.order_date).filter(
+        models.Order.order_id == order_id
+    ).one()
+    amount = db.query(models.Payment.amount).filter(models.Payment.order_id == order_id).scalar() or 0
+    items = db.query(models.OrderItem.product_id, models.OrderItem.quantity, models.OrderItem.snapshot_price).filter(
+        models.OrderItem.order_id == order_id
+    ).all()
+    _apply(db, store_id, sales_date(order_date), amount, items, -1)
+
+
+def rebuild_daily_sales(db: Session, start: date = None, end: date = None) -> int:
+    """
+    orders / payments / order_items 로부터 롤업을 다시 계산합니다. (도입 이전 데이터 백필 / 불일치 복구용)
+    start / end 를 주면 그 기간(포함)만 다시 계산합니다.
+    """
+    Order, Payment, OrderItem = models.Order, models.Payment, models.OrderItem
+    local_day = func.date(func.timezone(str(SALES_TIMEZONE), Order.order_date))
+    in_range = []
+    if start:
+        in_range.append(local_day >= start)
+    if end:
+        in_range.append(local_day <= end)
+
+    for model in (models.StoreDailySales, models.StoreDailyProductSales):
+        stmt = delete(model)
+        if start:
+            stmt = stmt.where(model.sales_date >= start)
+        if end:
+            stmt = stmt.where(model.sales_date <= end)
+        db.execute(stmt)
+
+    active = Order.status != models.OrderStatus.CANCELED
+    item_units = (
+        select(OrderItem.order_id, func.sum(OrderItem.quantity).label("units"))
+        .group_by(OrderItem.order_id).subquery()
+    )
+    daily = (
+        select(
+            Order.store_id,
+            local_day,
+            func.count(case((active, 1))),
+            func.coalesce(func.sum(case((active, Payment.amount))), 0),
+            func.coalesce(func.sum(case((active, item_units.c.units))), 0),
+            func.count(case((~active, 1))),
+        )
+        .outerjoin(Payment, Payment.order_id == Order.order_id)
+        .outerjoin(item_units, item_units.c.order_id == Order.order_id)
+        .filter(*in_range)
+        .group_by(Order.store_id, local_day)
+    )
+    result = db.execute(models.StoreDailySales.__table__.insert().from_select(
+        ["store_id", "sales_date", "order_count", "gross_amount", "units", "canceled_count"], daily
+    ))
+
+    products = (
+        select(
+            Order.store_id,
+            local_day,
+            OrderItem.product_id,
+            func.sum(OrderItem.quantity),
+            func.sum(OrderItem.quantity * OrderItem.snapshot_price),
+        )
+        .join(OrderItem, OrderItem.order_id == Order.order_id)
+        .filter(active, *in_range)
+        .group_by(Order.store_id, local_day, OrderItem.product_id)
+    )
+    db.execute(models.StoreDailyProductSales.__table__.insert().from_select(
+        ["store_id", "sales_date", "product_id", "units", "amount"], products
+    ))
+    db.commit()
+    return result.rowcount
+
+
+# --- 조회 (롤업 테이블만 사용) ---
+
+def resolve_range(start: date = None, end: date = None):
+    end = end or today()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must be on or before end")
+    if (end - start).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_RANGE_DAYS} days")
+    return start, end
+
+
+async def daily_sales(db: AsyncSession, store_id, start: date = None, end: date = None) -> dict:
+    start, end = resolve_range(start, end)
+    Sales = models.StoreDailySales
+    rows = (await db.execute(
+        select(Sales.sales_date, Sales.order_count, Sales.gross_amount, Sales.units, Sales.canceled_count)
+        .filter(Sales.store_id == store_id, Sales.sales_date >= start, Sales.sales_date <= end)
+        .order_by(Sales.sales_date)
+    )).all()
+    days = [
+        {"sales_date": d, "order_count": count, "gross_amount": amount, "units": units, "canceled_count": canceled}
+        for d, count, amount, units, canceled in rows
+    ]
+    return {
+        "store_id": store_id,
+        "start": start,
+        "end": end,
+        "order_count": sum(d["order_count"] for d in days),
+        "gross_amount": sum(d["gross_amount"] for d in days),
+        "units": sum(d["units"] for d in days),
+        "canceled_count": sum(d["canceled_count"] for d in days),
+        "days": days,
+    }
+
+
+async def product_sales(db: AsyncSession, store_id, start: date = None, end: date = None) -> list:
+    start, end = resolve_range(start, end)
+    Sales = models.StoreDailyProductSales
+    rows = (await db.execute(
+        select(Sales.product_id, models.Product.name, func.sum(Sales.units), func.sum(Sales.amount))
+        .join(models.Product, models.Product.product_id == Sales.product_id)
+        .filter(Sales.store_id == store_id, Sales.sales_date >= start, Sales.sales_date <= end)
+        .group_by(Sales.product_id, models.Product.name)
+        .order_by(func.sum(Sales.amount).desc())
+    )).all()
+    return [
+        {"product_id": product_id, "name": name, "units": units, "amount": amount}
+        for product_id, name, units, amount in rows
+    ]
+
+
+if __name__ == "__main__":
+    import argparse
+    from app.database import SessionLocal, engine
+
+    parser = argparse.ArgumentParser(description="store_daily_sales 롤업 백필")
+    parser.add_argument("--start", type=date.fromisoformat, help="YYYY-MM-DD (포함)")
+    parser.add_argument("--end", type=date.fromisoformat, help="YYYY-MM-DD (포함)")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print(f"Rebuilt {rebuild_daily_sales(db, args.start, args.end)} store-days of sales.")
+    finally:
+        db.close()
@@ -1,8 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from uuid import UUID
-from typing import List, Optional
+from typing import Dict, List, Optional
 from enum import Enum
-from datetime import datetime
+from datetime import date, datetime
 
 class ProductType(str, Enum):
     READY_MADE = "READY_MADE"
@@ -30,8 +30,7 @@ class Member(MemberBase):
     money: int = 0
     location_agree: bool = True
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # --- Flower Schemas ---
 class Flower(BaseModel):
@@ -41,8 +40,14 @@ class Flower(BaseModel):
     color: Optional[str] = None
     care_guide: Optional[str] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class FlowerSearchResult(BaseModel):
+    flower_id: UUID
+    name: str
+    meaning: Optional[str] = None
+    color: Optional[str] = None
+    score: float
 
 # --- Product Schemas ---
 class ProductBase(BaseModel):
@@ -54,8 +59,7 @@ class Product(ProductBase):
     product_id: UUID
     store_id: UUID
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ProductCreate(ProductBase):
     store_id: UUID
@@ -66,6 +70,8 @@ class StoreBase(BaseModel):
     address: str
     business_hours: Optional[str] = None
     has_pickup_box: bool = False
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 class StoreCreate(StoreBase):
     owner_id: str
@@ -77,12 +83,21 @@ class Store(StoreBase):
     review_count: int = 0
     average_rating: float = 0.0
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class StoreDetail(Store):
     pass
 
+class NearbyStore(BaseModel):
+    store_id: UUID
+    name: str
+    address: str
+    business_hours: Optional[str] = None
+    has_pickup_box: bool = False
+    latitude: float
+    longitude: float
+    distance_m: int
+
 # --- Order Schemas ---
 class OrderItemCreate(BaseModel):
     product_id: UUID
@@ -107,8 +122,7 @@ class OrderItem(BaseModel):
     # 상품 정보 포함
     product: Optional[Product] = None 
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Order(BaseModel):
     order_id: UUID
@@ -122,8 +136,70 @@ class Order(BaseModel):
     # 가게 정보 포함
     store: Optional[StoreBase] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+# --- Page Schemas (keyset pagination) ---
+class StorePage(BaseModel):
+    items: List[Store] = []
+    next_cursor: Optional[str] = None
+
+class OrderPage(BaseModel):
+    items: List[Order] = []
+    next_cursor: Optional[str] = None
+
+# --- Owner Dashboard Schemas ---
+class DailyRevenue(BaseModel):
+    day: str
+    revenue: int
+    orders: int
+
+class LowStockSummary(BaseModel):
+    threshold: int
+    flowers: int
+    products: int
+    sold_out: int
+
+class DashboardOrder(BaseModel):
+    order_id: UUID
+    member_id: str
+    status: str
+    order_date: datetime
+    amount: Optional[int] = None
+
+class OwnerDashboard(BaseModel):
+    store_id: UUID
+    generated_at: datetime
+    orders_by_status: Dict[str, int]
+    revenue_by_day: List[DailyRevenue] = []
+    low_stock: LowStockSummary
+    rating_distribution: Dict[int, int]
+    review_count: int = 0
+    average_rating: float = 0.0
+    recent_orders: List[DashboardOrder] = []
+
+# --- Sales Rollup Schemas ---
+class DailySales(BaseModel):
+    sales_date: date
+    order_count: int
+    gross_amount: int
+    units: int
+    canceled_count: int
+
+class SalesReport(BaseModel):
+    store_id: UUID
+    start: date
+    end: date
+    order_count: int = 0
+    gross_amount: int = 0
+    units: int = 0
+    canceled_count: int = 0
+    days: List[DailySales] = []
+
+class ProductSales(BaseModel):
+    product_id: UUID
+    name: str
+    units: int
+    amount: int
 
 # --- Review Schemas ---
 class ReviewBase(BaseModel):
@@ -135,8 +211,7 @@ class Review(ReviewBase):
     review_id: UUID
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ReviewCreate(ReviewBase):
     order_id: UUID
@@ -148,6 +223,16 @@ class StockCreate(BaseModel):
     quantity: int
     input_date: Optional[datetime] = None
 
+class Stock(BaseModel):
+    stock_id: UUID
+    store_id: UUID
+    flower_id: Optional[UUID] = None
+    product_id: Optional[UUID] = None
+    quantity: int
+    stocking_date: Optional[datetime] = None
+    status: str
+    flower: Optional[Flower] = None
+
 class StockUpdate(BaseModel):
     quantity: int
 
@@ -0,0 +1,123 @@
+# app/serialization.py
+"""
+큰 목록 응답(/stores, /orders, /owner/orders)용 빠른 직렬화 경로.
+
+- ORM 엔티티 대신 필요한 컬럼만 SELECT 한 행(tuple)에서 바로 응답 dict 를 만들고
+- orjson 으로 한 번에 bytes 로 직렬화한 Response 를 돌려줌
+  -> FastAPI 의 response_model 재검증(from_attributes 로 ORM 객체 순회) + 기본 JSON 인코딩을 건너뜀
+
+dict 의 키/타입은 schemas.Store / schemas.Order 와 같아야 함 (response_model 은 문서용으로 그대로 둠).
+UUID / datetime / Enum 은 orjson 이 직접 직렬화.
+"""
+import orjson
+from fastapi.responses import Response
+
+from app import models, rating_service
+
+# dashboard 의 rating_distribution 처럼 int 키 dict 도 직렬화
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def page_response(items: list, next_cursor) -> ORJSONResponse:
+    return ORJSONResponse({"items": items, "next_cursor": next_cursor})
+
+
+# --- 매장 목록 ---
+
+STORE_COLUMNS = (
+    models.Store.store_id, models.Store.owner_id, models.Store.name, models.Store.address,
+    models.Store.business_hours, models.Store.has_pickup_box, models.Store.latitude, models.Store.longitude,
+)
+PRODUCT_COLUMNS = (
+    models.Product.product_id, models.Product.store_id, models.Product.name,
+    models.Product.price, models.Product.type,
+)
+
+
+def product_dict(product_id, store_id, name, price, type) -> dict:
+    return {"name": name, "price": price, "type": type, "product_id": product_id, "store_id": store_id}
+
+
+def store_dicts(store_rows, product_rows) -> list:
+    """
+    store_rows: (*STORE_COLUMNS, review_count, rating_sum)
+    product_rows: PRODUCT_COLUMNS (store_rows 의 매장들 것)
+    """
+    products_by_store = {}
+    for row in product_rows:
+        products_by_store.setdefault(row[1], []).append(product_dict(*row))
+    return [
+        {
+            "name": name,
+            "address": address,
+            "business_hours": business_hours,
+            "has_pickup_box": bool(has_pickup_box),
+            "latitude": latitude,
+            "longitude": longitude,
+            "store_id": store_id,
+            "owner_id": owner_id,
+            "products": products_by_store.get(store_id, []),
+            "review_count": review_count or 0,
+            "average_rating": rating_service.average_rating(review_count, rating_sum),
+        }
+        for (store_id, owner_id, name, address, business_hours, has_pickup_box, latitude, longitude,
+             review_count, rating_sum) in store_rows
+    ]
+
+
+# --- 주문 목록 ---
+
+ORDER_COLUMNS = (
+    models.Order.order_id, models.Order.store_id, models.Order.member_id, models.Order.status,
+    models.Order.order_date, models.Order.delivery_request,
+    models.Store.name, models.Store.address, models.Store.business_hours, models.Store.has_pickup_box,
+    models.Store.latitude, models.Store.longitude,
+)
+ORDER_ITEM_COLUMNS = (
+    models.OrderItem.order_id, models.OrderItem.item_id, models.OrderItem.product_id,
+    models.OrderItem.quantity, models.OrderItem.snapshot_price,
+) + PRODUCT_COLUMNS
+
+
+def order_dicts(order_rows, item_rows) -> list:
+    """
+    order_rows: ORDER_COLUMNS (orders JOIN stores)
+    item_rows: ORDER_ITEM_COLUMNS (order_items LEFT JOIN products, order_rows 의 주문들 것)
+    """
+    items_by_order = {}
+    for order_id, item_id, product_id, quantity, snapshot_price, *product in item_rows:
+        items_by_order.setdefault(order_id, []).append({
+            "item_id": item_id,
+            "product_id": product_id,
+            "quantity": quantity,
+            "snapshot_price": snapshot_price,
+            "product": product_dict(*product) if product[0] is not None else None,
+        })
+    return [
+        {
+            "order_id": order_id,
+            "store_id": store_id,
+            "member_id": member_id,
+            "status": status,
+            "order_date": order_date,
+            "delivery_request": delivery_request,
+            "items": items_by_order.get(order_id, []),
+            "store": {
+                "name": store_name,
+                "address": address,
+                "business_hours": business_hours,
+                "has_pickup_box": bool(has_pickup_box),
+                "latitude": latitude,
+                "longitude": longitude,
+            },
+        }
+        for (order_id, store_id, member_id, status, order_date, delivery_request,
+             store_name, address, business_hours, has_pickup_box, latitude, longitude) in order_rows
+    ]
@@ -0,0 +1,133 @@
+# app/single_flight.py
+"""
+/api/recommend 동시 중복 요청 합치기 (single-flight, 워커 프로세스 메모리).
+
+- 같은 키(정규화한 상황 + 재고 버전, recommend_cache.make_key)로 이미 생성 중이면
+  LLM 을 새로 부르지 않고 진행 중인 생성에 구독자로 붙음
+- 생성은 요청과 분리된 Task 하나가 하고, NDJSON 줄을 버퍼에 쌓으며 모든 구독자에게 나눠 줌
+  (늦게 붙은 구독자는 버퍼를 처음부터 받은 뒤 이어서 받음 -> 모든 클라이언트가 같은 전체 스트림을 받음)
+- 구독자가 모두 끊기면 키를 비우고, produce 에 넘긴 is_abandoned() 가 True 가 되어 LLM 스트림 중단
+- 생성이 끝나면 키를 비움 (결과는 recommend_cache 가 이어받음)
+- 생성 Task 의 DB/LLM 시간은 Flight.stats 에 따로 쌓고, 구독자마다 붙어 있던 동안 쌓인 만큼을
+  자기 요청 계측에 더함 (request_metrics.charge, 이미 끝난 생성에 붙은 구독자는 0)
+
+워커 프로세스 사이에서는 합쳐지지 않습니다 (워커 수만큼은 LLM 호출이 날 수 있음).
+RECOMMEND_SINGLE_FLIGHT=0 이면 요청마다 따로 생성 (부하 테스트 비교용).
+"""
+import os
+import asyncio
+
+from app import metrics, request_metrics
+
+ENABLED = os.getenv("RECOMMEND_SINGLE_FLIGHT", "1") != "0"
+
+REQUESTS = metrics.Counter(
+    "recommend_singleflight_requests_total", "Recommendation generations started (leader) or joined (follower)", ["role"]
+)
+IN_FLIGHT = metrics.Gauge("recommend_singleflight_inflight", "Recommendation generations in progress")
+SUBSCRIBERS = metrics.Histogram(
+    "recommend_singleflight_subscribers", "Clients served by one recommendation generation",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+
+
+class Flight:
+    """진행 중인 생성 하나: 지금까지 나온 줄 + 구독자 수."""
+
+    __slots__ = ("lines", "done", "error", "subscribers", "served", "stats", "_changed")
+
+    def __init__(self):
+        self.lines = []
+        self.done = False
+        self.error = None
+        self.subscribers = 0  # 지금 받고 있는 클라이언트 수
+        self.served = 0       # 붙었던 클라이언트 수 (메트릭용)
+        self.stats = request_metrics.shared_stats()  # 생성 Task 의 DB/LLM 시간
+        self._changed = asyncio.Event()
+
+    def notify(self):
+        # 기다리던 구독자를 모두 깨우고 다음 대기용 Event 로 교체
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self):
+        await self._changed.wait()
+
+
+class SingleFlight:
+    def __init__(self):
+        self._flights = {}  # key -> Flight
+        self._tasks = set()  # 생성 Task 참조 유지 (GC 방지)
+
+    def __len__(self):
+        return len(self._flights)
+
+    async def stream(self, key, produce):
+        """
+        produce(is_abandoned) 는 NDJSON 줄을 내는 async generator 를 돌려주는 함수.
+        같은 key 로 진행 중인 생성이 있으면 그 스트림을 처음부터 받고, 없으면 새로 시작합니다.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            REQUESTS.inc(role="leader")
+            flight = self._flights[key] = Flight()
+            task = asyncio.create_task(self._run(key, flight, produce))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            REQUESTS.inc(role="follower")
+
+        flight.subscribers += 1
+        flight.served += 1
+        joined = flight.stats.totals()
+        try:
+            sent = 0
+            while True:
+                while sent < len(flight.lines):
+                    yield flight.lines[sent]
+                    sent += 1
+                if flight.done:
+                    break
+                await flight.wait()
+            if flight.error is not None:
+                raise flight.error
+        finally:
+            request_metrics.charge(flight.stats, joined)
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done and self._flights.get(key) is flight:
+                # 모두 끊김 -> 중단될 생성이므로 이후 요청은 새로 시작
+                del self._flights[key]
+
+    async def _run(self, key, flight: Flight, produce):
+        # create_task 가 복사해 온 시작 요청의 RequestStats 대신 Flight 쪽에 쌓음
+        request_metrics.bind(flight.stats)
+        IN_FLIGHT.inc()
+
+        async def is_abandoned():
+            return flight.subscribers == 0
+
+        try:
+            async for line in produce(is_abandoned):
+                flight.lines.append(line)
+                flight.notify()
+        except Exception as e:
+            flight.error = e
+        finally:
+            flight.done = True
+            flight.notify()
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            IN_FLIGHT.dec()
+            SUBSCRIBERS.observe(flight.served)
+
+
+flights = SingleFlight()
+
+
+async def stream(key, produce):
+    if not ENABLED:
+        async for line in produce(None):
+            yield line
+        return
+    async for line in flights.stream(key, produce):
+        yield line
@@ -0,0 +1,60 @@
+# app/wallet_service.py
+from typing import Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+def debit(db: Session, member_id: str, amount: int) -> Optional[int]:
+    """
+    잔액이 충분할 때만 차감하고 차감 후 잔액을 돌려줍니다. (잔액 부족/회원 없음 -> None)
+    UPDATE members SET money = money - :amt WHERE member_id = :id AND money >= :amt RETURNING money
+    조건과 차감이 한 문장이라 동시 결제에서도 lost update 가 생기지 않습니다. (commit은 호출하는 쪽에서)
+    """
+    stmt = (
+        update(models.Member)
+        .where(models.Member.member_id == member_id, models.Member.money >= amount)
+        .values(money=models.Member.money - amount)
+        .returning(models.Member.money)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).scalar()
+
+
+def credit(db: Session, member_id: str, amount: int) -> Optional[int]:
+    """잔액을 더하고 더한 후 잔액을 돌려줍니다. (회원 없음 -> None)"""
+    stmt = (
+        update(models.Member)
+        .where(models.Member.member_id == member_id)
+        .values(money=models.Member.money + amount)
+        .returning(models.Member.money)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).scalar()
+
+
+def refund_order(db: Session, order_id) -> Optional[int]:
+    """
+    주문을 CANCELED 로 바꾸고 결제 금액을 환불합니다.
+    이미 취소됐거나 픽업 완료된 주문이면 아무것도 하지 않고 None (중복 환불 방지).
+    취소된 주문은 다른 상태로 되돌릴 수 없으므로 (order_service.update_status) 주문당 환불은 한 번뿐입니다.
+    """
+    stmt = (
+        update(models.Order)
+        .where(
+            models.Order.order_id == order_id,
+            models.Order.status.notin_((models.OrderStatus.CANCELED, models.OrderStatus.PICKED_UP))
+        )
+        .values(status=models.OrderStatus.CANCELED)
+        .returning(models.Order.member_id)
+        .execution_options(synchronize_session=False)
+    )
+    member_id = db.execute(stmt).scalar()
+    if member_id is None:
+        return None
+
+    amount = db.query(models.Payment.amount).filter(models.Payment.order_id == order_id).scalar() or 0
+    if amount:
+        credit(db, member_id, amount)
+    return amount
@@ -0,0 +1,93 @@
+# bench/explain_indexes.py
+"""
+주요 조회 쿼리가 마이그레이션 0002 / 0006 / 0007 의 인덱스를 타는지 EXPLAIN 으로 확인합니다.
+
+데이터가 적은 개발 DB 에서는 플래너가 seq scan 을 고르므로 기본적으로 enable_seqscan 을 끄고
+"인덱스를 쓸 수 있는지"를 확인합니다. 부하 테스트용 대용량 DB 에서는 --real-costs 로 실제 비용 기준 확인.
+
+    alembic upgrade head && python -m bench.explain_indexes
+"""
+import sys
+import json
+import uuid
+import argparse
+
+from sqlalchemy import select, func, desc, text
+
+from app import models
+from app.database import engine
+
+
+def queries():
+    member_id = "user@flome.com"
+    store_id = uuid.uuid4()
+    product_ids = [uuid.uuid4(), uuid.uuid4()]
+    Order, Stock = models.Order, models.Stock
+
+    return [
+        # GET /orders (keyset)
+        ("ix_orders_member_id_order_date",
+         select(Order).filter(Order.member_id == member_id)
+         .order_by(Order.order_date.desc(), Order.order_id.desc()).limit(21)),
+        # GET /owner/orders (keyset)
+        ("ix_orders_store_id_order_date",
+         select(Order).filter(Order.store_id == store_id)
+         .order_by(Order.order_date.desc(), Order.order_id.desc()).limit(21)),
+        # 주문 목록의 items joinedload
+        ("ix_order_items_order_id",
+         select(models.OrderItem).filter(models.OrderItem.order_id == uuid.uuid4())),
+        # POST /orders 재고 잠금 조회 (상품 재고는 매장/상품당 1행인 unique 부분 인덱스)
+        ("ux_stocks_store_id_product_id",
+         select(Stock).filter(Stock.store_id == store_id, Stock.product_id.in_(product_ids))),
+        # 추천: 매장별 판매 가능 꽃 종류 집계
+        ("ix_stocks_available_store_id_flower_id",
+         select(Stock.store_id, func.count(Stock.flower_id).label("flower_count"))
+         .filter(Stock.quantity > 0, Stock.status == models.StockStatus.AVAILABLE)
+         .group_by(Stock.store_id).order_by(desc("flower_count")).limit(5)),
+        # GET /stores/{id}/products
+        ("ix_products_store_id",
+         select(models.Product).filter(models.Product.store_id == store_id)),
+        # POST /stocks 꽃 이름 조회 (공백/대소문자 무시, main.create_stock 과 같은 식)
+        ("ix_flowers_name_key",
+         select(models.Flower).filter(models.flower_name_key(models.Flower.name) == "빨간장미")),
+    ]
+
+
+def index_names(plan):
+    """EXPLAIN (FORMAT JSON) 결과 트리에서 사용된 인덱스 이름들을 모읍니다."""
+    found = set()
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if "Index Name" in node:
+            found.add(node["Index Name"])
+        stack.extend(node.get("Plans", []))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--real-costs", action="store_true", help="enable_seqscan 을 끄지 않고 실제 비용으로 확인")
+    args = parser.parse_args()
+
+    failures = 0
+    with engine.connect() as conn:
+        for expected, stmt in queries():
+            sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            with conn.begin():
+                if not args.real_costs:
+                    conn.execute(text("SET LOCAL enable_seqscan = off"))
+                raw = conn.execute(text("EXPLAIN (FORMAT JSON) " + sql)).scalar()
+            plan = (raw if isinstance(raw, list) else json.loads(raw))[0]["Plan"]
+            used = index_names(plan)
+            ok = expected in used
+            failures += not ok
+            print(f"[{'OK' if ok else 'FAIL'}] {expected:<42} used={sorted(used) or ['(seq scan)']}")
+
+    if failures:
+        print(f"{failures} queries did not use the expected index")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
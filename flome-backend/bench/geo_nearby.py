@@ -0,0 +1,110 @@
+# bench/geo_nearby.py
+"""
+/stores/nearby 격자 인덱스 검색 지연 측정 (DB 없이 인덱스만).
+
+서울 일대에 매장 N 개를 무작위로 배치하고, 무작위 위치에서 반경 검색을 반복해
+격자 인덱스와 전체 스캔(모든 매장 거리 계산 후 정렬)의 지연을 비교합니다.
+결과가 전체 스캔과 같은지도 함께 확인합니다.
+
+    python -m bench.geo_nearby --stores 50000 --radius 3000 --queries 500
+"""
+import json
+import time
+import uuid
+import random
+import argparse
+import statistics
+
+from app import geo_index
+from app.bulk_seed import LAT_RANGE, LNG_RANGE
+
+
+def make_locations(count: int, seed: int):
+    rng = random.Random(seed)
+    return [
+        geo_index.StoreLocation(
+            uuid.UUID(int=rng.getrandbits(128), version=4), f"매장 {n}", "서울", "09:00-20:00", False,
+            rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE),
+        )
+        for n in range(count)
+    ]
+
+
+def full_scan(locations, lat, lng, radius_m, limit):
+    found = []
+    for location in locations:
+        distance = geo_index.haversine_m(lat, lng, location.latitude, location.longitude)
+        if distance <= radius_m:
+            found.append((distance, location))
+    found.sort(key=lambda item: item[0])
+    return found[:limit]
+
+
+def summarize(timings) -> dict:
+    timings = sorted(timings)
+    return {
+        "p50_ms": statistics.median(timings),
+        "p95_ms": timings[int(len(timings) * 0.95)],
+        "max_ms": timings[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="근처 매장 검색 (격자 인덱스 vs 전체 스캔)")
+    parser.add_argument("--stores", type=int, default=50_000)
+    parser.add_argument("--radius", type=float, default=3_000, help="m")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--scan-queries", type=int, default=50, help="전체 스캔은 느리므로 일부만")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_out", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    locations = make_locations(args.stores, args.seed)
+    index = geo_index.GeoIndex()
+    started = time.perf_counter()
+    index.load(locations)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    rng = random.Random(args.seed + 1)
+    points = [(rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)) for _ in range(args.queries)]
+
+    index_timings, results = [], 0
+    for lat, lng in points:
+        started = time.perf_counter()
+        found = index.nearby(lat, lng, args.radius, args.limit)
+        index_timings.append((time.perf_counter() - started) * 1000)
+        results += len(found)
+
+    scan_timings = []
+    for lat, lng in points[:args.scan_queries]:
+        started = time.perf_counter()
+        expected = full_scan(locations, lat, lng, args.radius, args.limit)
+        scan_timings.append((time.perf_counter() - started) * 1000)
+        got = index.nearby(lat, lng, args.radius, args.limit)
+        assert [l.store_id for _, l in got] == [l.store_id for _, l in expected], (lat, lng)
+
+    report = {
+        "stores": args.stores,
+        "radius_m": args.radius,
+        "cell_degrees": geo_index.CELL_DEGREES,
+        "cells": len(index._cells),
+        "build_ms": build_ms,
+        "avg_results": results / len(points),
+        "index": summarize(index_timings),
+        "full_scan": summarize(scan_timings),
+    }
+    print(f"{args.stores:,} stores, {report['cells']:,} cells (build {build_ms:.0f}ms), "
+          f"radius {args.radius:.0f}m, avg {report['avg_results']:.1f} results")
+    for name in ("index", "full_scan"):
+        r = report[name]
+        print(f"  {name:<10} p50 {r['p50_ms']:.3f}ms  p95 {r['p95_ms']:.3f}ms  max {r['max_ms']:.3f}ms")
+    print(f"  results identical to full scan for {len(scan_timings)} queries")
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
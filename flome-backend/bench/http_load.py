@@ -0,0 +1,299 @@
+# bench/http_load.py
+"""
+API 핫 패스 HTTP 부하 테스트.
+
+시나리오(엔드포인트 가중치 조합) x 동시성 단계별로 처리량(req/s)과 p50/p95/p99 지연을 측정해
+JSON 으로 저장합니다. 커밋 간 결과를 --compare 로 비교해 ORM 쿼리 패턴 회귀를 배포 전에 확인합니다.
+
+    python -m app.bulk_seed --scale 0.01 --reset          # 데이터 준비
+    python -m bench.http_load --scenario mixed --concurrency 1,8,32 --duration 10 --output before.json
+    python -m bench.http_load ... --output after.json --compare before.json
+
+--base-url 을 주지 않으면 앱을 같은 프로세스에서 ASGI 로 직접 호출하고,
+/api/recommend 의 LLM 은 --llm-latency 만큼 기다린 뒤 응답하는 가짜 LLM(llm_provider)으로 바뀝니다.
+LLM 입장 제어(llm_admission)는 --llm-admission 을 주지 않으면 끕니다.
+(--base-url 로 띄워둔 서버를 칠 때는 서버 쪽 LLM 설정이 그대로 쓰임)
+"""
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import itertools
+import platform
+import statistics
+import subprocess
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import select
+
+from app import models
+from app.database import SessionLocal
+
+# 엔드포인트별 가중치
+SCENARIOS = {
+    "browse": {"stores": 40, "store_detail": 30, "store_reviews": 30},
+    "orders": {"orders": 40, "owner_orders": 20, "create_order": 40},
+    "recommend": {"recommend": 100},
+    "mixed": {
+        "stores": 25, "store_detail": 20, "store_reviews": 10, "orders": 15,
+        "owner_orders": 10, "create_order": 15, "recommend": 5,
+    },
+}
+# 엔드포인트 이름 하나만 줘도 단일 엔드포인트 시나리오로 동작
+ENDPOINTS = sorted({name for weights in SCENARIOS.values() for name in weights})
+
+SITUATIONS = [
+    "여자친구 생일", "부모님 결혼기념일", "친구 개업 축하", "졸업 축하", "병문안",
+    "승진 축하", "스승의 날", "사과하고 싶을 때", "첫 데이트", "집들이",
+]
+
+# 이 비율 이상 나빠지면 --compare 에서 회귀로 판단
+REGRESSION_THRESHOLD = 0.10
+
+
+class Fixture:
+    """요청에 쓸 실제 ID 들 (시드된 DB 에서 샘플링)."""
+
+    def __init__(self, sample: int):
+        db = SessionLocal()
+        try:
+            self.stores = db.execute(
+                select(models.Store.store_id, models.Store.owner_id).limit(sample)
+            ).all()
+            self.members = db.execute(
+                select(models.Member.member_id).filter(models.Member.type == models.MemberType.USER).limit(sample)
+            ).scalars().all()
+            products = db.execute(
+                select(models.Product.store_id, models.Product.product_id)
+                .filter(models.Product.store_id.in_([s for s, _ in self.stores]))
+            ).all()
+        finally:
+            db.close()
+
+        self.products = {}
+        for store_id, product_id in products:
+            self.products.setdefault(store_id, []).append(product_id)
+        if not self.stores or not self.members or not self.products:
+            sys.exit("No stores/members/products found. Seed the database first (python -m app.bulk_seed).")
+
+
+def build_requests(fixture: Fixture, unique_situations: bool):
+    """엔드포인트 이름 -> rng 를 받아 (method, url, kwargs) 를 만드는 함수."""
+    counter = itertools.count()
+
+    def situation(rng):
+        # 추천 캐시를 우회해 LLM 경로를 측정하려면 매 요청 다른 상황 문구 사용
+        text = rng.choice(SITUATIONS)
+        return f"{text} {next(counter)}" if unique_situations else text
+
+    def store(rng):
+        return rng.choice(fixture.stores)
+
+    def order_body(rng):
+        store_id = rng.choice(list(fixture.products))
+        return {
+            "member_id": rng.choice(fixture.members),
+            "store_id": str(store_id),
+            "items": [{"product_id": str(rng.choice(fixture.products[store_id])), "quantity": 1}],
+        }
+
+    return {
+        "stores": lambda rng: ("GET", "/stores", {}),
+        "store_detail": lambda rng: ("GET", f"/stores/{store(rng)[0]}", {}),
+        "store_reviews": lambda rng: ("GET", f"/stores/{store(rng)[0]}/reviews", {}),
+        "orders": lambda rng: ("GET", "/orders", {"params": {"member_id": rng.choice(fixture.members)}}),
+        "owner_orders": lambda rng: ("GET", "/owner/orders", {"params": {"store_id": str(store(rng)[0])}}),
+        "create_order": lambda rng: ("POST", "/orders", {"json": order_body(rng)}),
+        "recommend": lambda rng: ("POST", "/api/recommend", {"params": {"situation": situation(rng)}}),
+    }
+
+
+def stub_llm(latency: float, rate_limit: float, malformed: float, seed: int):
+    """네트워크 없는 가짜 LLM 으로 교체 (ASGI 모드 전용). 429/깨진 JSON 비율을 주면 fallback 경로도 측정됨."""
+    from app import ai_service, llm_provider
+
+    ai_service.llm = llm_provider.create_faulty_llm(
+        latency=f"fixed:{latency}", rate_limit=rate_limit, malformed=malformed, seed=seed
+    )
+
+
+def percentile(sorted_values, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_level(client, requests, weights: dict, concurrency: int, duration: float, seed: int):
+    names = list(weights)
+    latencies = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    deadline = time.perf_counter() + duration
+
+    async def worker(worker_id: int):
+        rng = random.Random(seed * 1000 + worker_id)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights=[weights[n] for n in names])[0]
+            method, url, kwargs = requests[name](rng)
+            started = time.perf_counter()
+            try:
+                # 스트리밍 응답(/api/recommend)은 마지막 줄까지 받아야 완료로 봄
+                async with client.stream(method, url, **kwargs) as response:
+                    await response.aread()
+                    failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[name].append(time.perf_counter() - started)
+            errors[name] += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for name in names:
+        values = sorted(latencies[name])
+        if not values:
+            continue
+        endpoints[name] = {
+            "requests": len(values),
+            "errors": errors[name],
+            "rps": round(len(values) / elapsed, 2),
+            "mean_ms": round(statistics.fmean(values) * 1000, 2),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+        }
+    total = sum(e["requests"] for e in endpoints.values())
+    everything = sorted(v for values in latencies.values() for v in values)
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 2),
+        "requests": total,
+        "errors": sum(e["errors"] for e in endpoints.values()),
+        "rps": round(total / elapsed, 2),
+        "p50_ms": round(percentile(everything, 50) * 1000, 2),
+        "p95_ms": round(percentile(everything, 95) * 1000, 2),
+        "p99_ms": round(percentile(everything, 99) * 1000, 2),
+        "endpoints": endpoints,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict) -> int:
+    """(시나리오, 동시성, 엔드포인트) 별 rps / p95 변화를 출력하고 회귀 건수를 돌려줍니다."""
+    def index(doc):
+        return {
+            (run["scenario"], level["concurrency"], name): stats
+            for run in doc["runs"] for level in run["levels"] for name, stats in level["endpoints"].items()
+        }
+
+    before, after = index(baseline), index(current)
+    regressions = 0
+    print(f"\ncompare with {baseline['meta']['commit']} (threshold {REGRESSION_THRESHOLD:.0%})")
+    for key in sorted(after.keys() & before.keys()):
+        old, new = before[key], after[key]
+        rps_change = (new["rps"] - old["rps"]) / old["rps"] if old["rps"] else 0.0
+        p95_change = (new["p95_ms"] - old["p95_ms"]) / old["p95_ms"] if old["p95_ms"] else 0.0
+        regressed = rps_change < -REGRESSION_THRESHOLD or p95_change > REGRESSION_THRESHOLD
+        regressions += regressed
+        scenario, concurrency, name = key
+        print(f"  {'REGRESSION' if regressed else 'ok':<10} {scenario:<10} c={concurrency:<4} {name:<14} "
+              f"rps {old['rps']:>9.1f} -> {new['rps']:>9.1f} ({rps_change:+.0%})  "
+              f"p95 {old['p95_ms']:>8.1f} -> {new['p95_ms']:>8.1f}ms ({p95_change:+.0%})")
+    return regressions
+
+
+async def main_async(args):
+    fixture = Fixture(args.sample)
+    requests = build_requests(fixture, args.unique_situations)
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+        target = args.base_url
+    else:
+        from app.main import app
+        from app import llm_admission
+        stub_llm(args.llm_latency, args.llm_429_rate, args.llm_malformed_rate, args.seed)
+        # 입장 제어(동시 호출/분당 호출 제한, 서킷 브레이커)는 기본으로 끔 -> 측정 대상이 제한기가 아니라 API 경로가 되도록
+        llm_admission.controller = llm_admission.AdmissionController(enabled=args.llm_admission)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=args.timeout)
+        target = "asgi"
+
+    runs = []
+    async with client:
+        for scenario in args.scenario.split(","):
+            weights = SCENARIOS.get(scenario) or {scenario: 1}
+            unknown = set(weights) - set(requests)
+            if unknown:
+                sys.exit(f"Unknown scenario/endpoint: {', '.join(sorted(unknown))}. Choose from {sorted(SCENARIOS)} or {ENDPOINTS}")
+
+            if args.warmup:
+                await run_level(client, requests, weights, 1, args.warmup, args.seed)
+            levels = []
+            for concurrency in args.concurrency:
+                level = await run_level(client, requests, weights, concurrency, args.duration, args.seed)
+                levels.append(level)
+                print(f"{scenario:<10} c={concurrency:<4} {level['rps']:>9.1f} req/s  "
+                      f"p50 {level['p50_ms']:>7.1f}  p95 {level['p95_ms']:>7.1f}  p99 {level['p99_ms']:>7.1f} ms  "
+                      f"errors {level['errors']}")
+            runs.append({"scenario": scenario, "weights": weights, "levels": levels})
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "target": target,
+            "python": platform.python_version(),
+            "duration_s": args.duration,
+            "seed": args.seed,
+            "llm_latency_s": None if args.base_url else args.llm_latency,
+            "llm_429_rate": None if args.base_url else args.llm_429_rate,
+            "llm_malformed_rate": None if args.base_url else args.llm_malformed_rate,
+            "unique_situations": args.unique_situations,
+        },
+        "runs": runs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FloMe API HTTP 부하 테스트")
+    parser.add_argument("--scenario", default="mixed", help=f"쉼표 구분. {sorted(SCENARIOS)} 또는 엔드포인트 이름 {ENDPOINTS}")
+    parser.add_argument("--concurrency", type=lambda s: [int(c) for c in s.split(",")], default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10.0, help="동시성 단계별 측정 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="시나리오별 워밍업 시간 (초, 결과 제외)")
+    parser.add_argument("--base-url", help="띄워둔 서버 주소 (없으면 ASGI in-process)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="스텁 LLM 응답 지연 (초, ASGI 모드)")
+    parser.add_argument("--llm-429-rate", type=float, default=0.0, help="스텁 LLM 429 비율 (ASGI 모드)")
+    parser.add_argument("--llm-malformed-rate", type=float, default=0.0, help="스텁 LLM 깨진 JSON 비율 (ASGI 모드)")
+    parser.add_argument("--llm-admission", action="store_true", help="LLM 입장 제어 켜기 (ASGI 모드, 기본 끔)")
+    parser.add_argument("--unique-situations", action="store_true", help="추천 캐시 적중 없이 LLM 경로만 측정")
+    parser.add_argument("--sample", type=int, default=200, help="요청에 쓸 매장/회원 샘플 수")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="bench-results.json")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON (회귀가 있으면 exit 1)")
+    args = parser.parse_args()
+
+    result = asyncio.run(main_async(args))
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False, sort_keys=True)
+    print(f"\nresults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            if compare(result, json.load(f)):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
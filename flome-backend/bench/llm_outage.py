@@ -0,0 +1,87 @@
+# bench/llm_outage.py
+"""
+LLM 장애(쿼터 소진) 중 /api/recommend 지연: 입장 제어(llm_admission) 켬 vs 끔.
+
+가짜 LLM 이 --llm-latency 초 뒤에 429 를 내는 상태(--failure-rate 1.0)에서
+동시 --concurrency 개 클라이언트가 --duration 초 동안 서로 다른 상황으로 요청합니다.
+(추천 캐시 / single-flight 를 타지 않도록 매 요청 다른 문구)
+
+- off: 제한 없음 -> 모든 요청이 실패하는 LLM 왕복을 기다린 뒤 대체 결과
+- on : 서킷 브레이커가 열리면 LLM 을 부르지 않고 바로 대체 결과
+
+    python -m bench.llm_outage --llm-latency 2 --duration 10 --concurrency 16
+"""
+import json
+import time
+import asyncio
+import argparse
+import itertools
+
+import httpx
+
+from app import ai_service, llm_admission, llm_provider
+from bench.http_load import percentile
+
+
+async def run(client, args):
+    counter = itertools.count()
+    latencies, sources = [], {}
+    deadline = time.perf_counter() + args.duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            source = None
+            async with client.stream("POST", "/api/recommend", params={"situation": f"생일 축하 {next(counter)}"}) as r:
+                async for line in r.aiter_lines():
+                    if line and '"type": "result"' in line:
+                        source = json.loads(line)["source"]
+            latencies.append(time.perf_counter() - started)
+            sources[source] = sources.get(source, 0) + 1
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "sources": sources,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+async def main_async(args):
+    from app.main import app
+    reports = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60) as client:
+        for mode in args.modes.split(","):
+            ai_service.llm = llm_provider.create_faulty_llm(
+                latency=f"fixed:{args.llm_latency}", rate_limit=args.failure_rate, seed=args.seed
+            )
+            llm_admission.controller = llm_admission.AdmissionController(enabled=mode == "on")
+            report = reports[mode] = await run(client, args)
+            print(f"admission {mode:<3}  {report['requests']:>5} req  "
+                  f"p50 {report['p50_ms']:>8.1f}  p95 {report['p95_ms']:>8.1f}  p99 {report['p99_ms']:>8.1f} ms  "
+                  f"sources {report['sources']}  breaker {llm_admission.controller.breaker.state}")
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM 장애 중 추천 지연 (입장 제어 on/off)")
+    parser.add_argument("--llm-latency", type=float, default=2.0, help="가짜 LLM 이 실패하기까지 걸리는 시간 (초)")
+    parser.add_argument("--failure-rate", type=float, default=1.0, help="429 비율")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--modes", default="off,on")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_out", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    reports = asyncio.run(main_async(args))
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# bench/order_concurrency.py
+"""
+POST /orders 주문 엔진 동시성 벤치마크.
+
+재고 N개짜리 상품 하나에 여러 스레드가 동시에 주문을 넣고,
+처리량(orders/sec)과 초과 판매가 없는지(판매 수량 == 재고 감소량, 재고 >= 0)를 확인합니다.
+
+    ORDER_AUTO_RESTOCK=false python -m bench.order_concurrency --threads 16 --orders 400 --stock 300
+"""
+import os
+import time
+import uuid
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# 자동 충전이 켜져 있으면 초과 판매 여부를 검증할 수 없으므로 끔
+os.environ.setdefault("ORDER_AUTO_RESTOCK", "false")
+
+from fastapi import HTTPException
+
+from app import models, schemas, order_service
+from app.database import SessionLocal, engine
+
+
+def setup(stock_quantity: int, buyers: int):
+    db = SessionLocal()
+    try:
+        tag = uuid.uuid4().hex[:8]
+        owner = models.Member(member_id=f"bench-owner-{tag}", password="pw", name="bench", contact="-", type=models.MemberType.OWNER)
+        db.add(owner)
+        store = models.Store(store_id=uuid.uuid4(), owner_id=owner.member_id, name=f"bench-{tag}", address="-")
+        product = models.Product(product_id=uuid.uuid4(), store_id=store.store_id, name="bench", price=1000, type=models.ProductType.READY_MADE)
+        stock = models.Stock(store_id=store.store_id, product_id=product.product_id, quantity=stock_quantity, status=models.StockStatus.AVAILABLE)
+        member_ids = [f"bench-user-{tag}-{i}" for i in range(buyers)]
+        db.add_all([store, product, stock])
+        db.add_all(models.Member(member_id=m, password="pw", name="bench", contact="-", money=10**9) for m in member_ids)
+        db.commit()
+        return store.store_id, product.product_id, stock.stock_id, member_ids, owner.member_id
+    finally:
+        db.close()
+
+
+def teardown(store_id, member_ids, owner_id):
+    db = SessionLocal()
+    try:
+        order_ids = db.query(models.Order.order_id).filter(models.Order.store_id == store_id)
+        for model in (models.OrderItem, models.Payment, models.AIContent):
+            db.query(model).filter(model.order_id.in_(order_ids.scalar_subquery())).delete(synchronize_session=False)
+        db.query(models.Order).filter(models.Order.store_id == store_id).delete(synchronize_session=False)
+        db.query(models.Stock).filter(models.Stock.store_id == store_id).delete(synchronize_session=False)
+        # 주문 시 같은 트랜잭션에서 쌓인 일 매출 롤업
+        for model in (models.StoreDailyProductSales, models.StoreDailySales):
+            db.query(model).filter(model.store_id == store_id).delete(synchronize_session=False)
+        db.query(models.Product).filter(models.Product.store_id == store_id).delete(synchronize_session=False)
+        db.query(models.Store).filter(models.Store.store_id == store_id).delete(synchronize_session=False)
+        db.query(models.Member).filter(models.Member.member_id.in_(member_ids + [owner_id])).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def place_one(store_id, product_id, member_id):
+    db = SessionLocal()
+    try:
+        order_service.place_order(db, schemas.OrderCreate(
+            store_id=store_id,
+            member_id=member_id,
+            items=[schemas.OrderItemCreate(product_id=product_id, quantity=1)]
+        ))
+        return "ok"
+    except HTTPException as e:
+        return f"http_{e.status_code}"
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--orders", type=int, default=400)
+    parser.add_argument("--stock", type=int, default=300)
+    parser.add_argument("--keep", action="store_true", help="벤치마크 데이터를 지우지 않음")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    store_id, product_id, stock_id, member_ids, owner_id = setup(args.stock, args.threads)
+
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            results = list(pool.map(
+                lambda i: place_one(store_id, product_id, member_ids[i % len(member_ids)]),
+                range(args.orders)
+            ))
+        elapsed = time.perf_counter() - started
+
+        db = SessionLocal()
+        try:
+            remaining = db.query(models.Stock.quantity).filter(models.Stock.stock_id == stock_id).scalar()
+            sold = db.query(models.OrderItem).join(models.Order).filter(models.Order.store_id == store_id).count()
+        finally:
+            db.close()
+
+        ok = results.count("ok")
+        print(f"orders attempted : {args.orders} ({args.threads} threads)")
+        print(f"orders placed    : {ok}")
+        print(f"rejected         : {len(results) - ok} {sorted(set(results) - {'ok'})}")
+        print(f"elapsed          : {elapsed:.2f}s -> {len(results) / elapsed:.1f} req/s, {ok / elapsed:.1f} orders/s")
+        print(f"stock            : {args.stock} -> {remaining} (sold {sold})")
+
+        assert remaining >= 0, "재고가 음수입니다 (초과 판매)"
+        assert sold == ok == args.stock - remaining, "판매 수량과 재고 감소량이 일치하지 않습니다"
+        print("OK: no oversell")
+    finally:
+        if not args.keep:
+            teardown(store_id, member_ids, owner_id)
+
+
+if __name__ == "__main__":
+    main()
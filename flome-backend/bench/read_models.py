@@ -0,0 +1,131 @@
+# bench/read_models.py
+"""
+조회 엔드포인트의 ORM 엔티티 경로 vs read-model(컬럼 projection) 경로 비교.
+
+엔드포인트마다 "쿼리 + 응답 bytes 생성" 까지를 측정합니다. (HTTP 계층 제외)
+- orm        : 기존 구현 (엔티티 로드 -> response_model 검증 / jsonable_encoder -> JSON)
+- projection : app.read_models -> serialization.ORJSONResponse
+
+지연은 매 회 새 세션으로 측정한 중앙값/p95, 메모리는 tracemalloc 최대 할당량입니다.
+대용량 시드 DB 에서 실행:
+
+    python -m app.bulk_seed --scale 0.1 --reset
+    python -m bench.read_models --repeat 30
+"""
+import json
+import time
+import argparse
+import statistics
+import tracemalloc
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+
+from app import models, schemas, read_models, serialization
+from app.database import SessionLocal
+
+
+def busiest_store(db):
+    """재고/리뷰가 가장 많은 매장 (응답이 가장 큰 경우를 측정)."""
+    return db.execute(
+        select(models.Order.store_id).join(models.Review, models.Review.order_id == models.Order.order_id)
+        .group_by(models.Order.store_id).order_by(func.count().desc()).limit(1)
+    ).scalar() or db.execute(select(models.Store.store_id).limit(1)).scalar()
+
+
+def validated_json(schema, objects) -> bytes:
+    # FastAPI 가 response_model 을 처리하는 방식 (from_attributes 검증 후 pydantic JSON)
+    adapter = TypeAdapter(List[schema])
+    return adapter.dump_json(adapter.validate_python(objects, from_attributes=True))
+
+
+def cases(store_id):
+    Stock, Flower, Product, Review, Order = models.Stock, models.Flower, models.Product, models.Review, models.Order
+    return {
+        "stocks": (
+            # response_model 없이 엔티티 그대로 반환 -> jsonable_encoder
+            lambda db: json.dumps(jsonable_encoder(
+                db.query(Stock).options(joinedload(Stock.flower)).filter(Stock.store_id == store_id).all()
+            )).encode(),
+            lambda db: serialization.ORJSONResponse(read_models.store_stocks(db, store_id)).body,
+        ),
+        "products": (
+            lambda db: validated_json(schemas.Product, db.query(Product).filter(Product.store_id == store_id).all()),
+            lambda db: serialization.ORJSONResponse(read_models.store_products(db, store_id)).body,
+        ),
+        "flowers": (
+            lambda db: validated_json(schemas.Flower, db.query(Flower).all()),
+            lambda db: serialization.ORJSONResponse(read_models.flowers(db)).body,
+        ),
+        "reviews": (
+            lambda db: validated_json(schemas.Review, db.execute(
+                select(Review).join(Order).filter(Order.store_id == store_id)
+            ).scalars().all()),
+            # 엔드포인트는 AsyncSession 이지만 같은 쿼리를 sync 세션으로 실행
+            lambda db: serialization.ORJSONResponse(
+                [read_models.ReviewRow(*row) for row in db.execute(read_models.reviews_query(store_id))]
+            ).body,
+        ),
+    }
+
+
+def run_once(render):
+    db = SessionLocal()
+    try:
+        return render(db)
+    finally:
+        db.close()
+
+
+def measure(render, repeat: int) -> dict:
+    run_once(render)  # warmup (커넥션 / 컴파일 캐시)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = run_once(render)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+
+    tracemalloc.start()
+    run_once(render)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "peak_kib": peak / 1024,
+        "bytes": len(body),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ORM 엔티티 vs read-model 조회 비교")
+    parser.add_argument("--store-id", help="기본: 리뷰가 가장 많은 매장")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--json", dest="json_out", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        store_id = args.store_id or busiest_store(db)
+    print(f"store {store_id}, {args.repeat} runs")
+    print(f"{'endpoint':<10} {'path':<11} {'median ms':>10} {'p95 ms':>8} {'peak KiB':>10} {'bytes':>9}")
+
+    results = {}
+    for name, (orm, projection) in cases(store_id).items():
+        results[name] = {"orm": measure(orm, args.repeat), "projection": measure(projection, args.repeat)}
+        for path, r in results[name].items():
+            print(f"{name:<10} {path:<11} {r['median_ms']:>10.2f} {r['p95_ms']:>8.2f} {r['peak_kib']:>10.1f} {r['bytes']:>9}")
+        before, after = results[name]["orm"], results[name]["projection"]
+        print(f"{'':<10} -> latency x{before['median_ms'] / after['median_ms']:.1f}, "
+              f"memory x{before['peak_kib'] / max(after['peak_kib'], 1e-9):.1f}")
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump({"store_id": str(store_id), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
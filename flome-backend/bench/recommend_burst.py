@@ -0,0 +1,140 @@
+# bench/recommend_burst.py
+"""
+/api/recommend 중복 요청 폭주(캠페인 발송 직후) 부하 테스트: single-flight 켬 vs 끔.
+
+버스트마다 --burst-size 개 요청이 --spread 초 안에 몰려 들어오고, 상황 문구는 --distinct 개 중 하나
+(공백/문장부호만 다른 변형 포함 -> 정규화 후 같은 키). 버스트마다 추천 캐시를 비워
+매번 캐시 miss 상태에서 시작합니다. 앱은 같은 프로세스에서 ASGI 로 직접 호출하고
+LLM 은 --llm-latency 만큼 걸리는 가짜 LLM 이고, LLM 입장 제어(llm_admission)는 --llm-admission 을 주지 않으면 끕니다.
+
+    python -m bench.recommend_burst --bursts 10 --burst-size 50 --distinct 3 --llm-latency 1.0
+
+비교 항목: 실제 LLM 호출 수, 합쳐진 비율(follower / 전체), 지연 p50/p95/max,
+그리고 같은 키 요청들이 모두 같은 결과를 받았는지.
+"""
+import json
+import time
+import random
+import asyncio
+import argparse
+
+import httpx
+
+from app import llm_admission, metrics, recommend_cache, single_flight
+from bench.http_load import stub_llm, percentile
+
+SITUATIONS = ["여자친구 생일", "부모님께 감사", "친구 졸업 축하", "동료 승진 축하", "병문안"]
+VARIANTS = ["{}", "{} ", "{}!!", " {}.", "{}?"]
+
+
+def metric_total(name: str, **labels) -> float:
+    """현재 /metrics 본문에서 name(라벨 일치) 값의 합."""
+    total = 0.0
+    for line in metrics.render().splitlines():
+        if not line.startswith(name):
+            continue
+        series, _, value = line.rpartition(" ")
+        if series.split("{")[0] != name:
+            continue
+        if all(f'{k}="{v}"' in series for k, v in labels.items()):
+            total += float(value)
+    return total
+
+
+async def request(client, situation: str):
+    started = time.perf_counter()
+    result = None
+    async with client.stream("POST", "/api/recommend", params={"situation": situation}) as response:
+        async for line in response.aiter_lines():
+            if line:
+                event = json.loads(line)
+                if event.get("type") == "result":
+                    result = event
+    return time.perf_counter() - started, result
+
+
+async def run_mode(client, enabled: bool, args):
+    single_flight.ENABLED = enabled
+    rng = random.Random(args.seed)
+    llm_before = metric_total("recommend_llm_seconds_count")
+    leaders_before = metric_total("recommend_singleflight_requests_total", role="leader")
+    followers_before = metric_total("recommend_singleflight_requests_total", role="follower")
+
+    latencies, missing, mismatched = [], 0, 0
+    for burst in range(args.bursts):
+        recommend_cache._cache.clear()
+        situations = [f"{rng.choice(SITUATIONS)} {burst}" for _ in range(args.distinct)]
+
+        async def client_request(situation):
+            await asyncio.sleep(rng.uniform(0, args.spread))
+            text = rng.choice(VARIANTS).format(situation)
+            return recommend_cache.normalize_situation(text), await request(client, text)
+
+        done = await asyncio.gather(*(client_request(rng.choice(situations)) for _ in range(args.burst_size)))
+        results_by_key = {}
+        for key, (latency, result) in done:
+            latencies.append(latency)
+            if result is None:
+                missing += 1
+                continue
+            results_by_key.setdefault(key, set()).add(json.dumps(result["data"], sort_keys=True))
+        mismatched += sum(len(results) > 1 for results in results_by_key.values())
+
+    leaders = metric_total("recommend_singleflight_requests_total", role="leader") - leaders_before
+    followers = metric_total("recommend_singleflight_requests_total", role="follower") - followers_before
+    latencies.sort()
+    return {
+        "single_flight": enabled,
+        "requests": len(latencies),
+        "llm_calls": int(metric_total("recommend_llm_seconds_count") - llm_before),
+        "coalesced_ratio": followers / (leaders + followers) if leaders + followers else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "missing_results": missing,
+        "keys_with_different_results": mismatched,
+    }
+
+
+async def main_async(args):
+    from app.main import app
+    stub_llm(args.llm_latency, 0.0, 0.0, args.seed)
+    # 입장 제어(분당 호출 제한 등)는 기본으로 끔 -> LLM 호출 수 / 지연이 single-flight 효과만 반영하도록
+    llm_admission.controller = llm_admission.AdmissionController(enabled=args.llm_admission)
+    modes = {"on": [True], "off": [False], "both": [False, True]}[args.mode]
+    reports = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=args.timeout) as client:
+        await request(client, "워밍업")  # 스냅샷 / 벡터 인덱스 로딩
+        for enabled in modes:
+            report = await run_mode(client, enabled, args)
+            reports.append(report)
+            print(f"single-flight {'on ' if enabled else 'off'}  {report['requests']} req  "
+                  f"LLM calls {report['llm_calls']:>4}  coalesced {report['coalesced_ratio']:.0%}  "
+                  f"p50 {report['p50_ms']:>7.1f}  p95 {report['p95_ms']:>7.1f}  max {report['max_ms']:>7.1f} ms  "
+                  f"missing {report['missing_results']}  inconsistent {report['keys_with_different_results']}")
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/api/recommend 중복 요청 폭주 (single-flight on/off)")
+    parser.add_argument("--bursts", type=int, default=10)
+    parser.add_argument("--burst-size", type=int, default=50)
+    parser.add_argument("--distinct", type=int, default=3, help="버스트당 서로 다른 상황 수")
+    parser.add_argument("--spread", type=float, default=0.2, help="버스트 안에서 요청이 도착하는 시간 폭 (초)")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="가짜 LLM 응답 지연 (초)")
+    parser.add_argument("--mode", choices=("on", "off", "both"), default="both")
+    parser.add_argument("--llm-admission", action="store_true", help="LLM 입장 제어 켜기 (기본 끔)")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_out", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    reports = asyncio.run(main_async(args))
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# bench/recommend_prompt.py
+"""
+추천 프롬프트 크기: 기존(full, 상위 5개 매장 전체 재고) vs 후보 선별(prefilter).
+
+상황 문장마다 실제로 보낼 프롬프트(ai_service.PROMPT_TEMPLATE)를 두 방식으로 만들어
+추정 토큰 수 / 후보 매장 수 / 선별 시간을 비교합니다. (LLM 호출 없음)
+LLM 시간은 운영 /metrics 의 recommend_llm_seconds{mode=...} 로 비교합니다.
+
+    python -m bench.recommend_prompt
+    python -m bench.recommend_prompt --situation "여자친구 생일" --situation "부모님께 감사"
+"""
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+from app import ai_service, inventory_snapshot, recommend_prompt
+from app.database import AsyncSessionLocal
+
+SITUATIONS = [
+    "여자친구 생일 선물", "부모님께 감사 인사", "친구 졸업 축하", "연인에게 프로포즈",
+    "동료 승진 축하", "병문안 가는 길", "친구와 화해하고 싶어요", "할머니 장례식 조문",
+    "빨간 꽃으로 기념일", "그냥 기분 전환",
+]
+
+
+async def build(db, situation: str, prefilter: bool):
+    recommend_prompt.PREFILTER = prefilter
+    snapshot = await inventory_snapshot.snapshot.ensure_fresh(db)
+    started = time.perf_counter()
+    inventory = await recommend_prompt.inventory_text(db, situation, snapshot)
+    elapsed = (time.perf_counter() - started) * 1000
+    prompt = ai_service.PROMPT_TEMPLATE.format(inventory=inventory, situation=situation)
+    return recommend_prompt.estimate_tokens(prompt), inventory.count("\n"), elapsed
+
+
+async def run(situations):
+    rows = []
+    async with AsyncSessionLocal() as db:
+        await build(db, situations[0], True)  # 스냅샷 / 벡터 인덱스 로딩
+        for situation in situations:
+            full = await build(db, situation, False)
+            prefilter = await build(db, situation, True)
+            rows.append({"situation": situation, "full": full, "prefilter": prefilter})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="추천 프롬프트 크기 (full vs prefilter)")
+    parser.add_argument("--situation", action="append", help="여러 번 지정 가능 (기본: 예시 10개)")
+    parser.add_argument("--json", dest="json_out", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    rows = asyncio.run(run(args.situation or SITUATIONS))
+    print(f"budget {recommend_prompt.PROMPT_INVENTORY_TOKENS} tokens, "
+          f"{recommend_prompt.PROMPT_STORE_COUNT} stores x {recommend_prompt.PROMPT_FLOWERS_PER_STORE} flowers")
+    print(f"{'situation':<24} {'full':>14} {'prefilter':>14} {'select':>9}")
+    for row in rows:
+        (full_tokens, full_stores, _), (tokens, stores, elapsed) = row["full"], row["prefilter"]
+        print(f"{row['situation']:<24} {full_tokens:>7} ({full_stores} st) {tokens:>7} ({stores} st) {elapsed:>7.2f}ms")
+    full_avg = statistics.mean(r["full"][0] for r in rows)
+    prefilter_avg = statistics.mean(r["prefilter"][0] for r in rows)
+    print(f"avg prompt tokens: full {full_avg:.0f} -> prefilter {prefilter_avg:.0f} "
+          f"({(1 - prefilter_avg / full_avg) * 100:.0f}% smaller)")
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
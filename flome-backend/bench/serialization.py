@@ -0,0 +1,130 @@
+# bench/serialization.py
+"""
+주문 목록 응답 직렬화 비용 마이크로벤치마크 (DB 없이 CPU 비용만, 주문 1,000건 기준).
+
+- orm+response_model : ORM 엔티티 -> response_model 검증(from_attributes) -> pydantic JSON (기존 /orders 경로)
+- orm+jsonable       : ORM 엔티티 -> 검증 -> jsonable_encoder -> json.dumps (구버전 FastAPI 기본 인코더 경로)
+- rows+model         : 컬럼 행 -> dict -> OrderPage.model_validate -> model_dump_json
+- rows+orjson        : 컬럼 행 -> dict -> orjson (app.serialization, 현재 /orders 경로)
+
+    python -m bench.serialization --orders 1000 --items 3 --repeat 20
+"""
+import json
+import time
+import uuid
+import argparse
+import statistics
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app import models, schemas, serialization
+
+
+def make_rows(order_count: int, items_per_order: int, seed: int = 0):
+    """ORDER_COLUMNS / ORDER_ITEM_COLUMNS 모양의 행 (read_order_page 가 받는 것과 같은 tuple)."""
+    rng = uuid.UUID(int=seed)
+    store_id, now = uuid.uuid5(rng, "store"), datetime(2026, 1, 1, tzinfo=timezone.utc)
+    products = [
+        (uuid.uuid5(rng, f"product-{i}"), store_id, f"꽃다발 {i}", 10000 + i * 1000, models.ProductType.READY_MADE)
+        for i in range(20)
+    ]
+    order_rows, item_rows = [], []
+    for i in range(order_count):
+        order_id = uuid.uuid5(rng, f"order-{i}")
+        order_rows.append((
+            order_id, store_id, f"user{i % 50}@example.com", models.OrderStatus.PAID,
+            now - timedelta(minutes=i), "문 앞에 놓아주세요",
+            "플로미 꽃집", "서울시 어딘가 123", "10:00-20:00", True, 37.5, 127.0,
+        ))
+        for j in range(items_per_order):
+            product = products[(i + j) % len(products)]
+            item_rows.append((order_id, uuid.uuid5(rng, f"item-{i}-{j}"), product[0], j + 1, product[3]) + product)
+    return order_rows, item_rows
+
+
+def make_entities(order_rows, item_rows):
+    """같은 데이터를 ORM 엔티티 그래프로 (joinedload 결과와 같은 모양, 세션 없이 transient)."""
+    store = None
+    products, orders = {}, {}
+    for (order_id, store_id, member_id, status, order_date, delivery_request,
+         name, address, hours, pickup, lat, lng) in order_rows:
+        if store is None:
+            store = models.Store(store_id=store_id, owner_id="owner@example.com", name=name, address=address,
+                                 business_hours=hours, has_pickup_box=pickup, latitude=lat, longitude=lng)
+        orders[order_id] = models.Order(order_id=order_id, store_id=store_id, member_id=member_id, status=status,
+                                        order_date=order_date, delivery_request=delivery_request, store=store)
+    for order_id, item_id, product_id, quantity, snapshot_price, *product in item_rows:
+        if product_id not in products:
+            products[product_id] = models.Product(product_id=product[0], store_id=product[1], name=product[2],
+                                                  price=product[3], type=product[4])
+        orders[order_id].items.append(models.OrderItem(item_id=item_id, order_id=order_id, product_id=product_id,
+                                                       quantity=quantity, snapshot_price=snapshot_price,
+                                                       product=products[product_id]))
+    return list(orders.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주문 목록 직렬화 비용 (주문 1,000건당)")
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=3, help="주문당 상품 수")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", dest="json_out", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    order_rows, item_rows = make_rows(args.orders, args.items)
+    entities = make_entities(order_rows, item_rows)
+    # FastAPI 가 response_model 을 검증할 때와 같이 from_attributes=True
+    page = TypeAdapter(schemas.OrderPage)
+
+    paths = {
+        "orm+response_model": lambda: page.dump_json(
+            page.validate_python({"items": entities, "next_cursor": None}, from_attributes=True)
+        ),
+        "orm+jsonable": lambda: json.dumps(jsonable_encoder(
+            page.validate_python({"items": entities, "next_cursor": None}, from_attributes=True)
+        )).encode(),
+        "rows+model": lambda: schemas.OrderPage.model_validate({
+            "items": serialization.order_dicts(order_rows, item_rows), "next_cursor": None
+        }).model_dump_json().encode(),
+        "rows+orjson": lambda: serialization.page_response(
+            serialization.order_dicts(order_rows, item_rows), None
+        ).body,
+    }
+
+    # 모든 경로가 같은 내용을 만드는지 먼저 확인 (datetime 표기 Z/+00:00 차이는 파싱 후 비교)
+    reference = schemas.OrderPage.model_validate_json(paths["orm+response_model"]())
+    for name, render in paths.items():
+        assert schemas.OrderPage.model_validate_json(render()) == reference, name
+
+    scale = 1000 / args.orders
+    results = {}
+    print(f"{args.orders} orders x {args.items} items, {args.repeat} runs (ms per 1k orders)")
+    print(f"{'path':<20} {'median':>8} {'p95':>8} {'bytes':>10}")
+    for name, render in paths.items():
+        render()  # warmup
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            body = render()
+            timings.append((time.perf_counter() - started) * 1000 * scale)
+        timings.sort()
+        results[name] = {
+            "median_ms": statistics.median(timings),
+            "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+            "bytes": len(body),
+        }
+        print(f"{name:<20} {results[name]['median_ms']:>8.2f} {results[name]['p95_ms']:>8.2f} {len(body):>10}")
+
+    baseline = results["orm+response_model"]["median_ms"]
+    for name, result in results.items():
+        print(f"  {name}: x{baseline / result['median_ms']:.1f} vs orm+response_model")
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump({"orders": args.orders, "items": args.items, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# bench/startup_time.py
+"""
+API 워커 시작 시간 벤치마크.
+
+- import: 새 프로세스에서 `import app.main` 에 걸리는 시간 (+ LangChain 이 같이 로드됐는지)
+- first request: uvicorn 프로세스를 띄운 시점부터 GET /stores 가 처음 200 을 돌려줄 때까지
+
+    python -m bench.startup_time --runs 5
+    LLM_WARMUP=true python -m bench.startup_time --runs 5    # warmup 비용 포함 비교
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+
+import httpx
+
+IMPORT_PROBE = """
+import sys, time, json
+started = time.perf_counter()
+import app.main
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "langchain_loaded": "langchain_core" in sys.modules,
+    "modules": len(sys.modules),
+}))
+"""
+
+
+def measure_import():
+    out = subprocess.check_output([sys.executable, "-W", "ignore", "-c", IMPORT_PROBE], text=True)
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_request(path: str, timeout: float) -> float:
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}{path}", timeout=1).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                pass
+            time.sleep(0.01)
+        raise RuntimeError(f"no 200 from {path} within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def summary(values):
+    return {
+        "median_ms": round(statistics.median(values) * 1000, 1),
+        "min_ms": round(min(values) * 1000, 1),
+        "max_ms": round(max(values) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 워커 import / 첫 요청까지 시간 측정")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/stores")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    first_requests = [measure_first_request(args.path, args.timeout) for _ in range(args.runs)]
+
+    result = {
+        "llm_warmup": os.getenv("LLM_WARMUP", "false"),
+        "import": summary([r["seconds"] for r in imports]),
+        "langchain_loaded_on_import": any(r["langchain_loaded"] for r in imports),
+        "modules_on_import": imports[-1]["modules"],
+        "first_request": summary(first_requests),
+    }
+    print(f"import app.main     median {result['import']['median_ms']:>8.1f} ms  "
+          f"(langchain loaded: {result['langchain_loaded_on_import']}, modules: {result['modules_on_import']})")
+    print(f"first GET {args.path:<9} median {result['first_request']['median_ms']:>8.1f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# bench/wallet_stress.py
+"""
+wallet_service 잔액 차감 스트레스 벤치마크.
+
+적은 수의 회원에게 여러 스레드가 동시에 결제(debit)를 시도하고 일부는 환불(credit)합니다.
+초당 성공 결제 수를 출력하고, 최종 잔액이 (초기 잔액 - 성공 결제 + 환불)과 정확히 같은지,
+음수가 된 잔액이 없는지 확인합니다.
+
+    python -m bench.wallet_stress --threads 32 --attempts 5000 --members 4
+"""
+import time
+import uuid
+import random
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from app import models, wallet_service
+from app.database import SessionLocal, engine
+
+PRICE = 1000
+REFUND_RATIO = 0.1
+
+
+def checkout(member_id: str, rng: random.Random):
+    db = SessionLocal()
+    try:
+        if wallet_service.debit(db, member_id, PRICE) is None:
+            db.rollback()
+            return "rejected"
+        db.commit()
+
+        if rng.random() < REFUND_RATIO:
+            wallet_service.credit(db, member_id, PRICE)
+            db.commit()
+            return "refunded"
+        return "paid"
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--attempts", type=int, default=5000)
+    parser.add_argument("--members", type=int, default=4)
+    parser.add_argument("--balance", type=int, default=1000 * PRICE)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    tag = uuid.uuid4().hex[:8]
+    member_ids = [f"bench-wallet-{tag}-{i}" for i in range(args.members)]
+
+    db = SessionLocal()
+    db.add_all(models.Member(member_id=m, password="pw", name="bench", contact="-", money=args.balance) for m in member_ids)
+    db.commit()
+    db.close()
+
+    try:
+        rngs = [random.Random(args.seed + i) for i in range(args.attempts)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            results = list(pool.map(
+                lambda i: (member_ids[i % len(member_ids)], checkout(member_ids[i % len(member_ids)], rngs[i])),
+                range(args.attempts)
+            ))
+        elapsed = time.perf_counter() - started
+
+        db = SessionLocal()
+        balances = dict(db.query(models.Member.member_id, models.Member.money).filter(models.Member.member_id.in_(member_ids)).all())
+        db.close()
+
+        succeeded = sum(1 for _, r in results if r != "rejected")
+        print(f"attempts         : {args.attempts} ({args.threads} threads, {args.members} members)")
+        print(f"checkouts        : {succeeded} ok, {args.attempts - succeeded} rejected (insufficient balance)")
+        print(f"elapsed          : {elapsed:.2f}s -> {succeeded / elapsed:.1f} checkouts/s")
+
+        for member_id in member_ids:
+            paid = sum(1 for m, r in results if m == member_id and r == "paid")
+            expected = args.balance - paid * PRICE
+            assert balances[member_id] == expected, f"{member_id}: balance {balances[member_id]} != expected {expected}"
+            assert balances[member_id] >= 0, f"{member_id}: negative balance"
+        print("OK: final balances match")
+    finally:
+        db = SessionLocal()
+        db.query(models.Member).filter(models.Member.member_id.in_(member_ids)).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""base schema (마이그레이션 도입 이전의 테이블)
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-17 23:50:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0000'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SAEnum 이 만드는 타입 이름 (models.py 의 enum 클래스 이름 소문자)
+ENUMS = {
+    "membertype": ("USER", "OWNER"),
+    "producttype": ("READY_MADE", "CUSTOM"),
+    "stockstatus": ("AVAILABLE", "SOLD_OUT", "DISCARDED"),
+    "orderstatus": ("PENDING", "PAID", "PREPARING", "PICKED_UP", "CANCELED"),
+}
+
+
+def enum(name):
+    # 타입은 upgrade 앞부분에서 checkfirst 로 따로 만듦 (create_table 이 다시 만들지 않도록)
+    return postgresql.ENUM(*ENUMS[name], name=name, create_type=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 빈 DB 에서 alembic upgrade head 로 전체 스키마를 만들 수 있도록 하는 시작점.
+    # create_all 로 이미 만들어진 DB 에서도 안전하게 (checkfirst / if_not_exists)
+    # 이후 추가된 컬럼/테이블/인덱스는 0001~ 에서 만듦
+    bind = op.get_bind()
+    for name, values in ENUMS.items():
+        postgresql.ENUM(*values, name=name).create(bind, checkfirst=True)
+
+    op.create_table(
+        "members",
+        sa.Column("member_id", sa.String(), primary_key=True),
+        sa.Column("password", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("contact", sa.String(), nullable=False),
+        sa.Column("type", enum("membertype"), nullable=False),
+        sa.Column("location_agree", sa.Boolean(), nullable=True),
+        sa.Column("money", sa.Integer(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index("ix_members_member_id", "members", ["member_id"], if_not_exists=True)
+    op.create_table(
+        "stores",
+        sa.Column("store_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("owner_id", sa.String(), sa.ForeignKey("members.member_id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("address", sa.String(), nullable=False),
+        sa.Column("business_hours", sa.String(), nullable=True),
+        sa.Column("has_pickup_box", sa.Boolean(), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "flowers",
+        sa.Column("flower_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("meaning", sa.String(), nullable=True),
+        sa.Column("color", sa.String(), nullable=True),
+        sa.Column("care_guide", sa.Text(), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "products",
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("store_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("stores.store_id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("price", sa.Integer(), nullable=False),
+        sa.Column("type", enum("producttype"), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "stocks",
+        sa.Column("stock_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("store_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("stores.store_id"), nullable=False),
+        sa.Column("flower_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("flowers.flower_id"), nullable=True),
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("products.product_id"), nullable=True),
+        sa.Column("quantity", sa.Integer(), nullable=True),
+        sa.Column("stocking_date", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("status", enum("stockstatus"), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "orders",
+        sa.Column("order_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("member_id", sa.String(), sa.ForeignKey("members.member_id"), nullable=False),
+        sa.Column("store_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("stores.store_id"), nullable=False),
+        sa.Column("order_date", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("pickup_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("status", enum("orderstatus"), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "order_items",
+        sa.Column("item_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("order_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("orders.order_id"), nullable=False),
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("products.product_id"), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("snapshot_price", sa.Integer(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "payments",
+        sa.Column("payment_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("order_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("orders.order_id"), unique=True, nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("method", sa.String(), nullable=False),
+        sa.Column("paid_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "ai_contents",
+        sa.Column("content_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("order_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("orders.order_id"), unique=True, nullable=False),
+        sa.Column("user_prompt", sa.Text(), nullable=True),
+        sa.Column("letter_content", sa.Text(), nullable=True),
+        sa.Column("recipe", sa.Text(), nullable=True),
+        sa.Column("care_guide", sa.Text(), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "reviews",
+        sa.Column("review_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("order_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("orders.order_id"), unique=True, nullable=False),
+        sa.Column("writer_id", sa.String(), sa.ForeignKey("members.member_id"), nullable=False),
+        sa.Column("rating", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("reviews", "ai_contents", "payments", "order_items", "orders",
+                  "stocks", "products", "flowers", "stores", "members"):
+        op.drop_table(table, if_exists=True)
+    bind = op.get_bind()
+    for name, values in reversed(ENUMS.items()):
+        postgresql.ENUM(*values, name=name).drop(bind, checkfirst=True)
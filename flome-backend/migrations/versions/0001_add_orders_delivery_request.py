@@ -0,0 +1,29 @@
+"""add orders.delivery_request (fix_db_column.py 대체)
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = '0000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # create_all 로 이미 만들어진 DB 에서도 안전하게 (IF NOT EXISTS)
+    op.execute("ALTER TABLE orders ADD COLUMN IF NOT EXISTS delivery_request VARCHAR")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE orders DROP COLUMN IF EXISTS delivery_request")
@@ -0,0 +1,50 @@
+"""add secondary indexes for hot access paths
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# models.py 의 __table_args__ 와 이름/정의를 맞춰둘 것
+INDEXES = [
+    ("ix_orders_member_id_order_date", "orders (member_id, order_date DESC, order_id DESC)"),
+    ("ix_orders_store_id_order_date", "orders (store_id, order_date DESC, order_id DESC)"),
+    ("ix_order_items_order_id", "order_items (order_id)"),
+    ("ix_stocks_store_id_product_id", "stocks (store_id, product_id)"),
+    ("ix_stocks_product_id", "stocks (product_id)"),
+    ("ix_stocks_flower_id", "stocks (flower_id)"),
+    ("ix_stocks_available_store_id_flower_id",
+     "stocks (store_id, flower_id) WHERE quantity > 0 AND status = 'AVAILABLE'"),
+    ("ix_products_store_id", "products (store_id)"),
+    ("ix_stores_owner_id", "stores (owner_id)"),
+    ("ix_flowers_name", "flowers (name)"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 운영 중 테이블 잠금을 피하려고 CONCURRENTLY 사용 (트랜잭션 밖에서 실행해야 함)
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+        op.execute("ANALYZE orders")
+        op.execute("ANALYZE stocks")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,50 @@
+"""add store_daily_sales / store_daily_product_sales rollup tables
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:20:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # create_all 로 이미 만들어진 DB 에서도 안전하게 (if_not_exists)
+    op.create_table(
+        "store_daily_sales",
+        sa.Column("store_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("stores.store_id"), primary_key=True),
+        sa.Column("sales_date", sa.Date(), primary_key=True),
+        sa.Column("order_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("gross_amount", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("units", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("canceled_count", sa.Integer(), nullable=False, server_default="0"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "store_daily_product_sales",
+        sa.Column("store_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("stores.store_id"), primary_key=True),
+        sa.Column("sales_date", sa.Date(), primary_key=True),
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("products.product_id"), primary_key=True),
+        sa.Column("units", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("amount", sa.Integer(), nullable=False, server_default="0"),
+        if_not_exists=True,
+    )
+    # 기존 주문 백필은 python -m app.sales_service 로 (대용량 DB 에서 마이그레이션 시간이 길어지지 않도록 분리)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("store_daily_product_sales", if_exists=True)
+    op.drop_table("store_daily_sales", if_exists=True)
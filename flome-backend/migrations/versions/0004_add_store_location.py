@@ -0,0 +1,32 @@
+"""add stores.latitude / stores.longitude
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 01:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # create_all 로 이미 만들어진 DB 에서도 안전하게 (IF NOT EXISTS)
+    # 근처 매장 검색은 워커 메모리의 격자 인덱스(app/geo_index.py)를 쓰므로 DB 인덱스는 없음
+    op.execute("ALTER TABLE stores ADD COLUMN IF NOT EXISTS latitude DOUBLE PRECISION")
+    op.execute("ALTER TABLE stores ADD COLUMN IF NOT EXISTS longitude DOUBLE PRECISION")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE stores DROP COLUMN IF EXISTS longitude")
+    op.execute("ALTER TABLE stores DROP COLUMN IF EXISTS latitude")
@@ -0,0 +1,45 @@
+"""add store_rating_summaries (매장별 리뷰 수 / 평점 합 집계)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 02:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # create_all 로 이미 만들어진 DB 에서도 안전하게 (if_not_exists)
+    # models.StoreRatingSummary 와 정의를 맞춰둘 것 (/stores, /stores/{store_id}, POST /reviews 가 사용)
+    op.create_table(
+        "store_rating_summaries",
+        sa.Column("store_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("stores.store_id"), primary_key=True),
+        sa.Column("review_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rating_sum", sa.Integer(), nullable=False, server_default="0"),
+        if_not_exists=True,
+    )
+    # 기존 리뷰로 백필 (이미 있는 매장 행은 그대로 -> 여러 번 실행해도 안전)
+    op.execute("""
+        INSERT INTO store_rating_summaries (store_id, review_count, rating_sum)
+        SELECT orders.store_id, count(reviews.review_id), coalesce(sum(reviews.rating), 0)
+        FROM reviews JOIN orders ON orders.order_id = reviews.order_id
+        GROUP BY orders.store_id
+        ON CONFLICT (store_id) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("store_rating_summaries", if_exists=True)
@@ -0,0 +1,39 @@
+"""add expression index for normalized flower name lookup
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 02:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# models.Flower 의 __table_args__ / models.flower_name_key 와 식을 글자 그대로 맞춰둘 것
+# (POST /stocks 의 공백/대소문자 무시 꽃 이름 조회가 이 인덱스를 타야 함)
+INDEXES = [
+    ("ix_flowers_name_key", "flowers (lower(replace(name, ' ', '')))"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+        op.execute("ANALYZE flowers")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,64 @@
+"""unique stock row per (store_id, product_id)
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 03:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# models.Stock 의 __table_args__ 와 이름/정의를 맞춰둘 것
+# (order_service.place_order 의 자동 재고 생성이 ON CONFLICT DO NOTHING 으로 이 인덱스를 씀)
+INDEXES = [
+    ("ux_stocks_store_id_product_id", "stocks (store_id, product_id) WHERE product_id IS NOT NULL"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 동시 첫 주문으로 이미 생긴 중복 상품 재고 행은 stock_id 가 가장 작은 행으로 수량을 합치고 삭제
+    op.execute("""
+        WITH ranked AS (
+            SELECT stock_id,
+                   row_number() OVER w AS rn,
+                   sum(coalesce(quantity, 0)) OVER (PARTITION BY store_id, product_id) AS total,
+                   count(*) OVER (PARTITION BY store_id, product_id) AS copies
+            FROM stocks
+            WHERE product_id IS NOT NULL
+            WINDOW w AS (PARTITION BY store_id, product_id ORDER BY stock_id)
+        )
+        UPDATE stocks SET quantity = ranked.total
+        FROM ranked
+        WHERE stocks.stock_id = ranked.stock_id AND ranked.rn = 1 AND ranked.copies > 1
+    """)
+    op.execute("""
+        DELETE FROM stocks
+        WHERE stock_id IN (
+            SELECT stock_id FROM (
+                SELECT stock_id, row_number() OVER (PARTITION BY store_id, product_id ORDER BY stock_id) AS rn
+                FROM stocks
+                WHERE product_id IS NOT NULL
+            ) ranked
+            WHERE rn > 1
+        )
+    """)
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES:
+            op.execute(f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,69 @@
+import uuid
+import asyncio
+
+from app import models
+from app.inventory_snapshot import InventorySnapshot
+
+AVAILABLE = models.StockStatus.AVAILABLE
+
+
+class Rows:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class ReloadSession:
+    """refresh() 의 조회 4번(매장, 상품, 꽃, 재고)에 정해진 행을 돌려주고, 재고 조회 직전에 during() 실행."""
+
+    def __init__(self, stores, products, flowers, stocks, during=None):
+        self._results = [stores, products, flowers, stocks]
+        self._during = during
+
+    async def execute(self, stmt):
+        if len(self._results) == 1 and self._during:
+            self._during()
+        return Rows(self._results.pop(0))
+
+
+def test_apply_during_reload_is_not_overwritten():
+    store_id, flower_id, old_stock, new_stock = (uuid.uuid4() for _ in range(4))
+    snapshot = InventorySnapshot()
+    stores = [(store_id, "꽃집", "서울")]
+    flowers = [(flower_id, "장미", "사랑")]
+    asyncio.run(snapshot.refresh(ReloadSession(stores, [], flowers, [(old_stock, store_id, flower_id)])))
+    assert snapshot.store_flower_ids() == {store_id: [flower_id]}
+
+    def write_during_reload():
+        # 다른 요청이 재고를 추가하고 기존 재고를 소진 (재로딩 조회는 이 쓰기 이전 상태를 읽음)
+        snapshot.apply_stock(new_stock, store_id, flower_id, 5, AVAILABLE)
+        snapshot.apply_stock(old_stock, store_id, flower_id, 0, AVAILABLE)
+
+    version = snapshot.version
+    stale = [(old_stock, store_id, flower_id)]
+    asyncio.run(snapshot.refresh(ReloadSession(stores, [], flowers, stale, during=write_during_reload)))
+
+    assert set(snapshot._stocks) == {new_stock}
+    assert snapshot.store_flower_ids() == {store_id: [flower_id]}
+    assert snapshot.version > version
+
+    # 그다음 재로딩은 기록 없이 DB 결과 그대로
+    asyncio.run(snapshot.refresh(ReloadSession(stores, [], flowers, [])))
+    assert snapshot._stocks == {}
+
+
+def test_failed_reload_stops_recording():
+    snapshot = InventorySnapshot()
+
+    class Broken:
+        async def execute(self, stmt):
+            raise RuntimeError("db down")
+
+    try:
+        asyncio.run(snapshot.refresh(Broken()))
+    except RuntimeError:
+        pass
+    snapshot.apply_store(uuid.uuid4(), "꽃집", "서울")
+    assert snapshot._journal is None
@@ -0,0 +1,54 @@
+import pytest
+from fastapi import HTTPException
+
+from app import models, schemas, order_service
+
+
+def place(db, member, store, product, quantity=2):
+    return order_service.place_order(db, schemas.OrderCreate(
+        store_id=store.store_id,
+        member_id=member.member_id,
+        items=[schemas.OrderItemCreate(product_id=product.product_id, quantity=quantity)],
+    ))
+
+
+def balance(db, member):
+    return db.query(models.Member.money).filter(models.Member.member_id == member.member_id).scalar()
+
+
+def change(db, order, status):
+    try:
+        return order_service.update_status(db, order.order_id, status)
+    finally:
+        db.commit()
+
+
+def test_cancel_refunds_once(db, shop):
+    member, store, product = shop
+    order = place(db, member, store, product)
+    assert balance(db, member) == 80_000
+
+    assert change(db, order, models.OrderStatus.CANCELED) is True
+    assert balance(db, member) == 100_000
+
+    # 취소된 주문은 PAID 로 되살릴 수 없음 -> 다시 취소해도 두 번 환불되지 않음
+    with pytest.raises(HTTPException) as error:
+        change(db, order, models.OrderStatus.PAID)
+    assert error.value.status_code == 409
+    assert change(db, order, models.OrderStatus.CANCELED) is False
+    assert balance(db, member) == 100_000
+    assert db.query(models.Order.status).filter(models.Order.order_id == order.order_id).scalar() \
+        == models.OrderStatus.CANCELED
+
+
+def test_picked_up_is_final(db, shop):
+    member, store, product = shop
+    order = place(db, member, store, product)
+    assert change(db, order, models.OrderStatus.PREPARING) is True
+    assert change(db, order, models.OrderStatus.PICKED_UP) is True
+
+    for status in (models.OrderStatus.PAID, models.OrderStatus.CANCELED):
+        with pytest.raises(HTTPException) as error:
+            change(db, order, status)
+        assert error.value.status_code == 409
+    assert balance(db, member) == 80_000
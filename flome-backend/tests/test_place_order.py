@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app import models, schemas, order_service
+from app.database import SessionLocal
+
+
+def order_request(member, store, product, quantity=1):
+    return schemas.OrderCreate(
+        store_id=store.store_id,
+        member_id=member.member_id,
+        items=[schemas.OrderItemCreate(product_id=product.product_id, quantity=quantity)],
+    )
+
+
+def test_rejects_product_of_another_store(db, shop):
+    member, store, product = shop
+    other = models.Store(owner_id=store.owner_id, name="다른 꽃집", address="부산")
+    db.add(other)
+    db.commit()
+
+    with pytest.raises(HTTPException) as error:
+        order_service.place_order(db, order_request(member, other, product))
+    assert error.value.status_code == 400
+    db.rollback()
+    assert db.query(models.Stock).filter(models.Stock.store_id == other.store_id).count() == 0
+
+
+def test_concurrent_first_orders_share_one_stock_row(db, shop):
+    member, store, product = shop
+    request = order_request(member, store, product)  # 스레드에서 fixture 세션의 객체를 건드리지 않도록 미리
+    workers = 8
+    barrier = threading.Barrier(workers)
+    errors = []
+
+    def order():
+        session = SessionLocal()
+        try:
+            barrier.wait()
+            order_service.place_order(session, request)
+        except Exception as e:  # 스레드 안 예외는 pytest 가 잡지 못하므로 모아서 확인
+            errors.append(e)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=order) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    quantities = [q for (q,) in db.query(models.Stock.quantity).filter(models.Stock.product_id == product.product_id)]
+    assert quantities == [order_service.AUTO_RESTOCK_AMOUNT - workers]
@@ -0,0 +1,54 @@
+import json
+import asyncio
+
+import orjson
+
+from app import recommend_cache
+
+
+def ndjson(event, dumps):
+    line = dumps(event)
+    return (line.decode() if isinstance(line, bytes) else line) + "\n"
+
+
+def run(situation, lines):
+    async def produce(is_abandoned):
+        for line in lines:
+            yield line
+
+    async def collect():
+        return [line async for line in recommend_cache.stream_with_cache(situation, produce)]
+
+    return asyncio.run(collect())
+
+
+def test_result_event_ignores_spacing_and_user_text():
+    result = {"type": "result", "source": "ai", "data": {"flowers": []}}
+    # ai_service 는 json.dumps ('"type": "result"'), orjson 은 공백 없이 ('"type":"result"')
+    for dumps in (json.dumps, orjson.dumps):
+        assert recommend_cache.result_event(ndjson(result, dumps)) == result
+    token = {"type": "token", "text": '{"type": "result", "source": "ai"}'}
+    assert recommend_cache.result_event(ndjson(token, json.dumps)) is None
+    assert recommend_cache.result_event("not json\n") is None
+
+
+def test_caches_ai_result_from_serializer_output():
+    recommend_cache._cache.clear()
+    result = {"type": "result", "source": "ai", "data": {"flowers": [{"name": "장미"}]}}
+    for situation, dumps in (("생일 축하", json.dumps), ("졸업 축하", orjson.dumps)):
+        lines = [
+            ndjson({"type": "progress", "message": "..."}, dumps),
+            ndjson({"type": "token", "text": '"type": "result"'}, dumps),
+            ndjson(result, dumps),
+        ]
+        assert run(situation, lines) == lines
+
+        (cached,) = run(situation, [])  # 두 번째 요청은 produce 없이 캐시 한 줄
+        assert json.loads(cached) == {**result, "source": "cache"}
+
+
+def test_does_not_cache_fallback_result():
+    recommend_cache._cache.clear()
+    fallback = ndjson({"type": "result", "source": "fallback", "data": {}}, orjson.dumps)
+    assert run("비 오는 날", [fallback]) == [fallback]
+    assert recommend_cache._cache.get(recommend_cache.make_key("비 오는 날")) is None
@@ -0,0 +1,52 @@
+import pytest
+from fastapi import HTTPException
+
+from app import models, schemas, order_service, sales_service
+
+
+def place(db, member, store, product, quantity):
+    return order_service.place_order(db, schemas.OrderCreate(
+        store_id=store.store_id,
+        member_id=member.member_id,
+        items=[schemas.OrderItemCreate(product_id=product.product_id, quantity=quantity)],
+    ))
+
+
+def rollup(db):
+    daily = sorted(db.query(
+        models.StoreDailySales.store_id, models.StoreDailySales.sales_date, models.StoreDailySales.order_count,
+        models.StoreDailySales.gross_amount, models.StoreDailySales.units, models.StoreDailySales.canceled_count,
+    ).all())
+    # 취소로 0 이 된 상품 행은 증분 갱신에만 남으므로 비교에서 제외
+    products = sorted(
+        row for row in db.query(
+            models.StoreDailyProductSales.store_id, models.StoreDailyProductSales.sales_date,
+            models.StoreDailyProductSales.product_id, models.StoreDailyProductSales.units,
+            models.StoreDailyProductSales.amount,
+        ).all()
+        if row.units or row.amount
+    )
+    return daily, products
+
+
+def test_rollup_matches_rebuild_after_status_flip(db, shop):
+    member, store, product = shop
+    kept = place(db, member, store, product, 1)
+    canceled = place(db, member, store, product, 3)
+
+    order_service.update_status(db, canceled.order_id, models.OrderStatus.CANCELED)
+    db.commit()
+    # 취소 -> PAID -> 취소 시도: 되살리기는 409, 두 번째 취소는 롤업을 다시 빼지 않음
+    with pytest.raises(HTTPException):
+        order_service.update_status(db, canceled.order_id, models.OrderStatus.PAID)
+    db.rollback()
+    order_service.update_status(db, canceled.order_id, models.OrderStatus.CANCELED)
+    order_service.update_status(db, kept.order_id, models.OrderStatus.PREPARING)
+    db.commit()
+
+    incremental = rollup(db)
+    (day,) = incremental[0]
+    assert (day.order_count, day.gross_amount, day.units, day.canceled_count) == (1, 10_000, 1, 1)
+
+    sales_service.rebuild_daily_sales(db)
+    assert rollup(db) == incremental
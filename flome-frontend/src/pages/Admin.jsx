@@ -21,6 +21,9 @@ const Admin = () => {
   const [stocks, setStocks] = useState([]);
   const [products, setProducts] = useState([]);
   const [orders, setOrders] = useState([]);
+  const [ordersCursor, setOrdersCursor] = useState(null); // 다음 페이지 커서 (없으면 마지막 페이지)
+  const [isLoadingMoreOrders, setIsLoadingMoreOrders] = useState(false);
+  const [dashboard, setDashboard] = useState(null);
   const [knownFlowers, setKnownFlowers] = useState([]);
 
   // 폼 데이터
@@ -66,10 +69,14 @@ const Admin = () => {
     }
   }, [myStore]);
 
+  useEffect(() => {
+    if (myStore && activeTab === 'dash') fetchDashboard(myStore.store_id);
+  }, [myStore, activeTab]);
+
   const fetchMyStore = async (memberId) => {
     try {
-      const response = await api.get('/stores');
-      const myOwnStore = response.data.find(store => store.owner_id === memberId);
+      const response = await api.get('/stores', { params: { owner_id: memberId } });
+      const myOwnStore = response.data.items.find(store => store.owner_id === memberId);
       
       if (myOwnStore) {
         setMyStore(myOwnStore);
@@ -109,12 +116,38 @@ const Admin = () => {
   const fetchOrders = async (storeId) => {
     try {
       const response = await api.get('/owner/orders', { params: { store_id: storeId } });
-      setOrders(response.data);
+      setOrders(response.data.items);
+      setOrdersCursor(response.data.next_cursor);
     } catch (error) {
       console.error("주문 로딩 실패:", error);
     }
   };
 
+  // 이전 주문 더 불러오기 (커서 기반 페이지네이션)
+  const loadMoreOrders = async () => {
+    if (!ordersCursor || isLoadingMoreOrders) return;
+    setIsLoadingMoreOrders(true);
+    try {
+      const response = await api.get('/owner/orders', { params: { store_id: myStore.store_id, cursor: ordersCursor } });
+      setOrders(prev => [...prev, ...response.data.items]);
+      setOrdersCursor(response.data.next_cursor);
+    } catch (error) {
+      console.error("주문 추가 로딩 실패:", error);
+    } finally {
+      setIsLoadingMoreOrders(false);
+    }
+  };
+
+  // 대시보드: 주문/매출/재고/별점 집계를 한 번에 (서버에서 SQL 집계)
+  const fetchDashboard = async (storeId) => {
+    try {
+      const response = await api.get(`/owner/stores/${storeId}/dashboard`);
+      setDashboard(response.data);
+    } catch (error) {
+      console.error("대시보드 로딩 실패:", error);
+    }
+  };
+
   const fetchKnownFlowers = async () => {
     try {
       const response = await api.get('/flowers');
@@ -124,6 +157,20 @@ const Admin = () => {
     }
   };
 
+  // 입고 폼 자동완성: 초성/입력 중인 글자/오타도 서버 검색 인덱스로 (빈 값이면 전체 목록)
+  const searchFlowers = async (q) => {
+    if (!q.trim()) {
+      fetchKnownFlowers();
+      return;
+    }
+    try {
+      const response = await api.get('/flowers/search', { params: { q, limit: 10 } });
+      setKnownFlowers(response.data);
+    } catch (error) {
+      console.error("꽃 검색 실패:", error);
+    }
+  };
+
   const handleRefresh = () => {
     if (myStore) {
       fetchStocks(myStore.store_id);
@@ -308,7 +355,7 @@ const Admin = () => {
         {/* === 3. 주문 탭 === */}
         {activeTab === 'orders' && (
           <div className="space-y-4">
-            <h2 className="font-bold text-gray-800 text-lg">주문 내역 <span className="text-blue-600 text-sm ml-1">{orders.length}</span></h2>
+            <h2 className="font-bold text-gray-800 text-lg">주문 내역 <span className="text-blue-600 text-sm ml-1">{orders.length}{ordersCursor ? '+' : ''}</span></h2>
             {orders.length === 0 && <p className="text-center text-gray-400 py-5">받은 주문이 없습니다.</p>}
             {orders.map((order) => {
                 const itemName = order.items.length > 0 ? (order.items[0].product ? order.items[0].product.name : "상품 정보 없음") : "상품 없음";
@@ -329,6 +376,15 @@ const Admin = () => {
                   </div>
                 );
             })}
+            {ordersCursor && (
+              <button
+                onClick={loadMoreOrders}
+                disabled={isLoadingMoreOrders}
+                className="w-full py-3 text-sm font-bold text-gray-500 bg-white border border-gray-200 rounded-xl hover:bg-gray-50 transition disabled:opacity-50"
+              >
+                {isLoadingMoreOrders ? "불러오는 중..." : "이전 주문 더 보기"}
+              </button>
+            )}
           </div>
         )}
         
@@ -406,7 +462,66 @@ const Admin = () => {
 
         {/* === 5. 대시보드 탭 === */}
         {activeTab === 'dash' && (
-            <div className="text-center text-gray-400 py-20">대시보드 준비 중...</div>
+            !dashboard ? (
+              <div className="flex justify-center py-20"><Loader2 className="animate-spin w-6 h-6 text-blue-600"/></div>
+            ) : (
+              <div className="space-y-4">
+                <h2 className="font-bold text-gray-800 text-lg">대시보드</h2>
+
+                <div className="grid grid-cols-2 gap-3">
+                  {[['PAID', '신규 주문'], ['PREPARING', '준비 중'], ['PICKED_UP', '거래 완료'], ['CANCELED', '취소']].map(([status, label]) => (
+                    <div key={status} className="bg-white p-4 rounded-xl shadow-sm border border-gray-100">
+                      <span className="text-xs font-bold text-gray-400 block mb-1">{label}</span>
+                      <span className="font-bold text-2xl text-gray-900">{dashboard.orders_by_status[status] || 0}</span>
+                    </div>
+                  ))}
+                </div>
+
+                <div className="bg-white p-5 rounded-xl shadow-sm border border-gray-100">
+                  <h3 className="font-bold text-gray-800 mb-3">최근 매출</h3>
+                  {dashboard.revenue_by_day.length === 0 && <p className="text-center text-gray-400 py-2">최근 매출이 없습니다.</p>}
+                  {dashboard.revenue_by_day.map((d) => (
+                    <div key={d.day} className="flex justify-between text-sm py-1">
+                      <span className="text-gray-500">{d.day} <span className="text-xs">({d.orders}건)</span></span>
+                      <span className="font-bold">{d.revenue.toLocaleString()}원</span>
+                    </div>
+                  ))}
+                </div>
+
+                <div className="bg-white p-5 rounded-xl shadow-sm border border-gray-100">
+                  <h3 className="font-bold text-gray-800 mb-3">재고 알림</h3>
+                  <div className="flex justify-between text-sm py-1"><span className="text-gray-500">꽃 재고 부족 ({dashboard.low_stock.threshold}개 이하)</span><span className="font-bold text-orange-600">{dashboard.low_stock.flowers}</span></div>
+                  <div className="flex justify-between text-sm py-1"><span className="text-gray-500">상품 재고 부족</span><span className="font-bold text-orange-600">{dashboard.low_stock.products}</span></div>
+                  <div className="flex justify-between text-sm py-1"><span className="text-gray-500">품절</span><span className="font-bold text-red-600">{dashboard.low_stock.sold_out}</span></div>
+                </div>
+
+                <div className="bg-white p-5 rounded-xl shadow-sm border border-gray-100">
+                  <h3 className="font-bold text-gray-800 mb-3">별점 ⭐ {dashboard.average_rating} <span className="text-xs text-gray-400">({dashboard.review_count}개)</span></h3>
+                  {[5, 4, 3, 2, 1].map((rating) => {
+                    const count = dashboard.rating_distribution[rating] || 0;
+                    const width = dashboard.review_count ? (count / dashboard.review_count) * 100 : 0;
+                    return (
+                      <div key={rating} className="flex items-center gap-2 text-sm py-0.5">
+                        <span className="w-4 text-gray-500">{rating}</span>
+                        <div className="flex-1 bg-gray-100 rounded-full h-2"><div className="bg-yellow-400 h-2 rounded-full" style={{ width: `${width}%` }} /></div>
+                        <span className="w-8 text-right text-gray-500">{count}</span>
+                      </div>
+                    );
+                  })}
+                </div>
+
+                <div className="bg-white p-5 rounded-xl shadow-sm border border-gray-100">
+                  <h3 className="font-bold text-gray-800 mb-3">최근 주문</h3>
+                  {dashboard.recent_orders.length === 0 && <p className="text-center text-gray-400 py-2">받은 주문이 없습니다.</p>}
+                  {dashboard.recent_orders.map((order) => (
+                    <div key={order.order_id} className="flex justify-between text-sm py-1">
+                      <span className="text-gray-500">{new Date(order.order_date).toLocaleString()} · {order.status}</span>
+                      <span className="font-bold">{(order.amount || 0).toLocaleString()}원</span>
+                    </div>
+                  ))}
+                </div>
+              </div>
+            )
         )}
 
       </div>
@@ -427,7 +542,7 @@ const Admin = () => {
               <form onSubmit={handleAddStock} className="space-y-4">
                 <div>
                   <label className="text-sm font-bold text-gray-700 block mb-1">꽃 이름</label>
-                  <input type="text" value={newStock.name} onChange={(e) => setNewStock({...newStock, name: e.target.value})} className="w-full bg-gray-50 border border-gray-200 rounded-lg p-3" placeholder="예: 노란 튤립" list="flower-options" autoFocus />
+                  <input type="text" value={newStock.name} onChange={(e) => { setNewStock({...newStock, name: e.target.value}); searchFlowers(e.target.value); }} className="w-full bg-gray-50 border border-gray-200 rounded-lg p-3" placeholder="예: 노란 튤립" list="flower-options" autoFocus />
                   <datalist id="flower-options">{knownFlowers.map((f) => <option key={f.flower_id} value={f.name} />)}</datalist>
                 </div>
                 <div className="flex gap-3">
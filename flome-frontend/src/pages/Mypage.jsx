@@ -8,6 +8,8 @@ const MyPage = () => {
   const [user, setUser] = useState(null);
   const [balance, setBalance] = useState(0);
   const [orders, setOrders] = useState([]);
+  const [ordersCursor, setOrdersCursor] = useState(null); // 다음 페이지 커서 (없으면 마지막 페이지)
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   
   // 리뷰 모달 상태
   const [isReviewModalOpen, setIsReviewModalOpen] = useState(false);
@@ -44,13 +46,29 @@ const MyPage = () => {
 
       // 2. 주문 내역 조회
       const ordersRes = await axios.get('/orders', { params: { member_id: memberId } });
-      setOrders(ordersRes.data);
+      setOrders(ordersRes.data.items);
+      setOrdersCursor(ordersRes.data.next_cursor);
     } catch (err) {
       console.error("정보 로딩 실패:", err);
       setBalance(0); 
     }
   };
 
+  // 이전 주문 더 불러오기 (커서 기반 페이지네이션)
+  const loadMoreOrders = async () => {
+    if (!ordersCursor || isLoadingMore) return;
+    setIsLoadingMore(true);
+    try {
+      const res = await axios.get('/orders', { params: { member_id: user.member_id, cursor: ordersCursor } });
+      setOrders(prev => [...prev, ...res.data.items]);
+      setOrdersCursor(res.data.next_cursor);
+    } catch (err) {
+      console.error("주문 내역 추가 로딩 실패:", err);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const handleLogout = () => {
     try {
       localStorage.removeItem('currentUser');
@@ -217,6 +235,15 @@ const MyPage = () => {
                         </div>
                     </div>
                 ))}
+                {ordersCursor && (
+                  <button
+                    onClick={loadMoreOrders}
+                    disabled={isLoadingMore}
+                    className="w-full py-3 text-sm font-bold text-gray-500 bg-gray-50 rounded-xl hover:bg-gray-100 transition disabled:opacity-50"
+                  >
+                    {isLoadingMore ? "불러오는 중..." : "이전 주문 더 보기"}
+                  </button>
+                )}
             </div>
           )}
         </div>
@@ -18,7 +18,7 @@ const ProductList = () => {
         setLoading(true);
         const response = await axios.get('/stores'); 
         console.log("백엔드 데이터:", response.data);
-        setStores(Array.isArray(response.data) ? response.data : []); 
+        setStores(Array.isArray(response.data.items) ? response.data.items : []); 
       } catch (err) {
         console.error("데이터 통신 에러:", err);
         setError("가게 정보를 불러오지 못했습니다.");